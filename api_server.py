@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 """
-Flask API server to serve LinkedIn jobs data from SQLite database
+Flask API server to serve LinkedIn jobs data from the jobs store: the SQLite database, or the
+PostgreSQL database JOBS_DATABASE_URL points at. Job reads and writes go through LinkedInJobsDB;
+the change feed, statistics counters, archive, exports and near-duplicate clusters are kept in
+the SQLite file only, and answer 501 while the store is PostgreSQL.
 """
 
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import sqlite3
 import os
 from datetime import datetime
+from contextlib import contextmanager
+from functools import wraps
 import sys
 from pathlib import Path
 import json
@@ -29,82 +34,136 @@ from ai_tailor import (
     clean_location
 )
 import db
+import browser_service
+import job_stats
+from schema import migrate
+from db_pool import get_pool
+from search_index import build_match_query
+from description_fetcher import DescriptionDrain, fill_job_description
+from near_duplicates import get_cluster, find_document_donor
+from change_feed import get_changes, latest_seq
+from job_rows import Job
+from linkedin_db import JOB_LIST_COLUMNS, LinkedInJobsDB
+import job_export
+from job_archive import get_archived_job, search_archive
+from storage import DATABASE_URL_ENV, database_url, is_postgres, redact
+
+class JobJSONProvider(DefaultJSONProvider):
+    """Serializes Job rows directly, so list endpoints never build a dict per row up front"""
+
+    def default(self, o):
+        if isinstance(o, Job):
+            return o.to_dict()
+        return super().default(o)
 
 app = Flask(__name__)
+app.json = JobJSONProvider(app)
 CORS(app)  # Enable CORS for React frontend
 
 DATABASE_PATH = 'data/linkedin_jobs.db'
+
+# JOBS_DATABASE_URL points the API at the shared PostgreSQL store instead
+JOB_STORE = database_url(None) if is_postgres(database_url(None)) else DATABASE_PATH
 OUTPUT_BASE_DIR = "job_applications"
 
+# Fetches descriptions for list-only jobs in the background when they are opened
+description_drain = DescriptionDrain(db_path=JOB_STORE)
+
+# Fields get_job returns for a stored job
+JOB_DETAIL_FIELDS = (
+    'id', 'title', 'company', 'location', 'description', 'url',
+    'search_keywords', 'search_location', 'search_date_posted',
+    'experience_level', 'job_type', 'work_model', 'scraped_at',
+    'status', 'liked', 'applied', 'disliked', 'notes', 'description_pending',
+)
+
+# get_job's columns for an archived job (the description is added by get_archived_job)
+ARCHIVED_JOB_COLUMNS = """
+    jobs.id, jobs.title, jobs.company, jobs.location, jobs.url,
+    jobs.search_keywords, jobs.search_location, jobs.search_date_posted,
+    jobs.experience_level, jobs.job_type, jobs.work_model, jobs.scraped_at,
+    jobs.status, jobs.liked, jobs.applied, jobs.disliked, jobs.notes, jobs.description_pending,
+    jobs.archived_at
+"""
+
 def get_db_connection():
-    """Create a database connection"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row  # This allows column access by name
-    return conn
+    """Borrow a pooled WAL-mode connection (rows are sqlite3.Row); close() returns it to the pool"""
+    return get_pool(DATABASE_PATH).acquire()
+
+@contextmanager
+def job_store():
+    """A connected LinkedInJobsDB for JOB_STORE (SQLite or PostgreSQL), disconnected afterwards"""
+    store = LinkedInJobsDB(JOB_STORE)
+    if not store.connect():
+        raise RuntimeError(f"Could not connect to the jobs database ({redact(JOB_STORE)})")
+    try:
+        yield store
+    finally:
+        store.disconnect()
+
+def sqlite_only(view):
+    """Answer 501 for features kept in the SQLite file while the store is PostgreSQL"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if is_postgres(JOB_STORE):
+            return jsonify({'error': f"{request.path} needs the SQLite database and is not available "
+                                     f"while {DATABASE_URL_ENV} points at PostgreSQL"}), 501
+        return view(*args, **kwargs)
+    return wrapper
+
+def ensure_job_description(job):
+    """Fetch the description of a list-only job before it is used for tailoring"""
+    if not job.get('description_pending'):
+        return True
+    print(f"🔎 Fetching pending description for Job ID: {job['id']}")
+    description = fill_job_description(job['id'], db_path=JOB_STORE)
+    if not description:
+        return False
+    job['description'] = description
+    job['description_pending'] = 0
+    return True
+
+def dimension_filters():
+    """
+    Company and location filters from the query string: company_id / location_id, or a name
+    that the store resolves to a canonical company or location (any alias), else matches as a
+    substring of the scraped text
+    """
+    filters = {}
+    for dimension in ('location', 'company'):
+        dimension_id = request.args.get(f'{dimension}_id', type=int)
+        name = request.args.get(dimension, type=str, default='')
+        if dimension_id is not None:
+            filters[f'{dimension}_id'] = dimension_id
+        if name:
+            filters[dimension] = name
+    return filters
 
 @app.route('/api/jobs', methods=['GET'])
 def get_jobs():
-    """Get all jobs with optional filtering"""
+    """Get jobs with optional filtering, one page at a time (pass next_cursor back as ?cursor=)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # Get query parameters for filtering
         limit = request.args.get('limit', type=int, default=50)
         offset = request.args.get('offset', type=int, default=0)
         search = request.args.get('search', type=str, default='')
-        location = request.args.get('location', type=str, default='')
-        company = request.args.get('company', type=str, default='')
         
-        # Build query
-        query = """
-            SELECT id, title, company, location, description, url, 
-                   search_keywords, search_location, search_date_posted,
-                   experience_level, job_type, work_model, scraped_at,
-                   status, liked, applied, disliked
-            FROM jobs 
-            WHERE 1=1
-        """
-        params = []
-        
-        if search:
-            query += " AND (title LIKE ? OR company LIKE ? OR description LIKE ?)"
-            search_param = f"%{search}%"
-            params.extend([search_param, search_param, search_param])
-        
-        if location:
-            query += " AND location LIKE ?"
-            params.append(f"%{location}%")
-        
-        if company:
-            query += " AND company LIKE ?"
-            params.append(f"%{company}%")
-        
-        query += " ORDER BY scraped_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        
-        cursor.execute(query, params)
-        jobs = cursor.fetchall()
-        
-        # Convert to list of dictionaries
-        jobs_list = []
-        for job in jobs:
-            job_dict = dict(job)
-            # Truncate description for list view
-            if job_dict['description'] and len(job_dict['description']) > 200:
-                job_dict['description_preview'] = job_dict['description'][:200] + "..."
-            else:
-                job_dict['description_preview'] = job_dict['description']
-            jobs_list.append(job_dict)
+        # Text search goes through the full-text index, ranked by relevance; the list is
+        # otherwise newest first, paged with a keyset cursor
+        with job_store() as store:
+            jobs_list, next_cursor = store.find_jobs_page(limit, request.args.get('cursor', type=str),
+                                                          search, dimension_filters(), offset)
         
-        conn.close()
         return jsonify({
             'jobs': jobs_list,
             'total': len(jobs_list),
             'limit': limit,
-            'offset': offset
+            'offset': offset,
+            'next_cursor': next_cursor
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -112,52 +171,38 @@ def get_jobs():
 def get_job(job_id):
     """Get a specific job by ID"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, title, company, location, description, url, 
-                   search_keywords, search_location, search_date_posted,
-                   experience_level, job_type, work_model, scraped_at,
-                   status, liked, applied, disliked, notes
-            FROM jobs 
-            WHERE id = ?
-        """, (job_id,))
-        
-        job = cursor.fetchone()
-        conn.close()
+        with job_store() as store:
+            job = store.get_job_by_id(job_id)
         
         if job:
-            return jsonify(dict(job))
-        else:
-            return jsonify({'error': 'Job not found'}), 404
+            # List-only stubs get their description fetched in the background
+            if job['description_pending']:
+                description_drain.enqueue(job_id)
+            return jsonify({field: job[field] for field in JOB_DETAIL_FIELDS})
+        
+        # Jobs moved out by job_archive.py still resolve (read-only) from the archive database
+        if not is_postgres(JOB_STORE):
+            archived = get_archived_job(DATABASE_PATH, job_id, ARCHIVED_JOB_COLUMNS)
+            if archived:
+                return jsonify(archived)
+        return jsonify({'error': 'Job not found'}), 404
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def toggle_flag(job_id, flag):
+    """Flip one of a job's flags and answer with its new value"""
+    with job_store() as store:
+        value = store.toggle_job_flag(job_id, flag)
+    if value is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({flag: value})
+
 @app.route('/api/jobs/<int:job_id>/toggle-like', methods=['POST'])
 def toggle_job_like(job_id):
     """Toggle the liked status of a job"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get current liked status
-        cursor.execute("SELECT liked FROM jobs WHERE id = ?", (job_id,))
-        job = cursor.fetchone()
-        
-        if not job:
-            conn.close()
-            return jsonify({'error': 'Job not found'}), 404
-        
-        # Toggle liked status
-        new_liked = 0 if job['liked'] else 1
-        cursor.execute("UPDATE jobs SET liked = ? WHERE id = ?", (new_liked, job_id))
-        conn.commit()
-        conn.close()
-        
-        return jsonify({'liked': bool(new_liked)})
-        
+        return toggle_flag(job_id, 'liked')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -165,24 +210,7 @@ def toggle_job_like(job_id):
 def toggle_job_applied(job_id):
     """Toggle the applied status of a job"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Get current applied status
-        cursor.execute("SELECT applied FROM jobs WHERE id = ?", (job_id,))
-        job = cursor.fetchone()
-
-        if not job:
-            conn.close()
-            return jsonify({'error': 'Job not found'}), 404
-
-        # Toggle applied status
-        new_applied = 0 if job['applied'] else 1
-        cursor.execute("UPDATE jobs SET applied = ? WHERE id = ?", (new_applied, job_id))
-        conn.commit()
-        conn.close()
-
-        return jsonify({'applied': bool(new_applied)})
+        return toggle_flag(job_id, 'applied')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -190,24 +218,7 @@ def toggle_job_applied(job_id):
 def toggle_job_dislike(job_id):
     """Toggle the disliked status of a job"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Get current disliked status
-        cursor.execute("SELECT disliked FROM jobs WHERE id = ?", (job_id,))
-        job = cursor.fetchone()
-
-        if not job:
-            conn.close()
-            return jsonify({'error': 'Job not found'}), 404
-
-        # Toggle disliked status
-        new_disliked = 0 if job['disliked'] else 1
-        cursor.execute("UPDATE jobs SET disliked = ? WHERE id = ?", (new_disliked, job_id))
-        conn.commit()
-        conn.close()
-
-        return jsonify({'disliked': bool(new_disliked)})
+        return toggle_flag(job_id, 'disliked')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -215,92 +226,115 @@ def toggle_job_dislike(job_id):
 def mark_job_applied(job_id):
     """Mark a job as applied"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("UPDATE jobs SET applied = 1 WHERE id = ?", (job_id,))
-        conn.commit()
-        conn.close()
+        with job_store() as store:
+            if not store.mark_applied(job_id):
+                return jsonify({'error': 'Failed to mark job as applied'}), 500
         
         return jsonify({'success': True})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/changes', methods=['GET'])
+@sqlite_only
+def get_job_changes():
+    """
+    Jobs inserted, updated or deleted since a change seq, for incremental sync. Without since,
+    only the current seq is returned: fetch /api/jobs once, then poll with since=<seq>.
+    """
+    try:
+        since = request.args.get('since', type=int)
+        limit = min(request.args.get('limit', type=int, default=500), 5000)
+        if since is not None and since < 0:
+            return jsonify({'error': 'since must be a change seq (>= 0)'}), 400
+        
+        conn = get_db_connection()
+        try:
+            if since is None:
+                return jsonify({'next_since': latest_seq(conn), 'changed': [], 'deleted': [],
+                                'has_more': False, 'reset': False})
+            changes = get_changes(conn, since, JOB_LIST_COLUMNS, limit)
+        finally:
+            conn.close()
+        
+        return jsonify(changes)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/stats', methods=['GET'])
+@sqlite_only
 def get_stats():
-    """Get job statistics"""
+    """Get job statistics (read from the trigger-maintained counter tables)"""
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Total jobs
-        cursor.execute("SELECT COUNT(*) as total FROM jobs")
-        total_jobs = cursor.fetchone()['total']
-        
-        # Jobs by status
-        cursor.execute("SELECT status, COUNT(*) as count FROM jobs GROUP BY status")
-        status_counts = dict(cursor.fetchall())
-        
-        # Top companies
-        cursor.execute("""
-            SELECT company, COUNT(*) as count 
-            FROM jobs 
-            GROUP BY company 
-            ORDER BY count DESC 
-            LIMIT 10
-        """)
-        top_companies = [dict(row) for row in cursor.fetchall()]
-        
-        # Top locations
-        cursor.execute("""
-            SELECT location, COUNT(*) as count 
-            FROM jobs 
-            WHERE location IS NOT NULL AND location != 'Location not specified'
-            GROUP BY location 
-            ORDER BY count DESC 
-            LIMIT 10
-        """)
-        top_locations = [dict(row) for row in cursor.fetchall()]
-        
-        # Recent jobs (last 7 days)
-        cursor.execute("""
-            SELECT COUNT(*) as count 
-            FROM jobs 
-            WHERE scraped_at >= datetime('now', '-7 days')
-        """)
-        recent_jobs = cursor.fetchone()['count']
-        
-        # Applied jobs count
-        cursor.execute("SELECT COUNT(*) as count FROM jobs WHERE applied = 1")
-        applied_jobs = cursor.fetchone()['count']
-        
-        # Liked jobs count
-        cursor.execute("SELECT COUNT(*) as count FROM jobs WHERE liked = 1")
-        liked_jobs = cursor.fetchone()['count']
-        
+        stats = job_stats.get_stats(conn)
         conn.close()
         
         return jsonify({
-            'total_jobs': total_jobs,
-            'status_counts': status_counts,
-            'top_companies': top_companies,
-            'top_locations': top_locations,
-            'recent_jobs': recent_jobs,
-            'applied_jobs': applied_jobs,
-            'liked_jobs': liked_jobs
+            'total_jobs': stats['total_jobs'],
+            'status_counts': stats['status_counts'],
+            'top_companies': stats['top_companies'],
+            'top_locations': stats['top_locations'],
+            'recent_jobs': stats['recent_jobs'],
+            'applied_jobs': stats['flag_counts']['applied'],
+            'liked_jobs': stats['flag_counts']['liked'],
+            'flag_counts': stats['flag_counts'],
+            'search_counts': stats['search_counts'],
+            'latest_scrape': stats['latest_scrape']
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/export', methods=['POST'])
+@sqlite_only
+def export_jobs():
+    """
+    Append jobs added since the last export to the partitioned Parquet/Arrow files under
+    data/exports (?format=parquet|arrow, ?full=true to rewrite, ?descriptions=false to omit them)
+    """
+    try:
+        fmt = request.args.get('format', type=str, default='parquet')
+        full = request.args.get('full', type=str, default='false').lower() == 'true'
+        descriptions = request.args.get('descriptions', type=str, default='true').lower() != 'false'
+        
+        with get_pool(DATABASE_PATH).connection() as conn:
+            summary = job_export.export_jobs(conn, fmt, full=full, include_descriptions=descriptions)
+        
+        return jsonify(summary)
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 501
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/export/jobs.arrow', methods=['GET'])
+@sqlite_only
+def stream_jobs_arrow():
+    """
+    Stream jobs with id > since_id as an Arrow IPC stream, one compressed record batch per
+    chunk, e.g. pyarrow.ipc.open_stream(urlopen(url)).read_pandas()
+    """
+    if job_export.pyarrow is None:
+        return jsonify({'error': 'pyarrow is required for columnar exports (pip install pyarrow)'}), 501
+    since_id = request.args.get('since_id', type=int, default=0)
+    descriptions = request.args.get('descriptions', type=str, default='true').lower() != 'false'
+    
+    def generate():
+        # Runs after the view returns, so the connection is taken (and given back) here
+        with get_pool(DATABASE_PATH).connection() as conn:
+            yield from job_export.arrow_stream(conn, since_id, descriptions)
+    
+    return Response(generate(), mimetype='application/vnd.apache.arrow.stream',
+                    headers={'Content-Disposition': 'attachment; filename=jobs.arrow'})
+
 @app.route('/api/search', methods=['GET'])
 def search_jobs():
-    """Search jobs with advanced filters"""
+    """Search jobs with advanced filters, one page at a time (pass next_cursor back as ?cursor=)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # Get search parameters
         keywords = request.args.get('keywords', type=str, default='')
         location = request.args.get('location', type=str, default='')
@@ -311,63 +345,26 @@ def search_jobs():
         limit = request.args.get('limit', type=int, default=50)
         offset = request.args.get('offset', type=int, default=0)
         
-        # Build query
-        query = """
-            SELECT id, title, company, location, description, url, 
-                   search_keywords, search_location, search_date_posted,
-                   experience_level, job_type, work_model, scraped_at,
-                   status, liked, applied, disliked
-            FROM jobs 
-            WHERE 1=1
-        """
-        params = []
-        
-        if keywords:
-            query += " AND (title LIKE ? OR description LIKE ? OR search_keywords LIKE ?)"
-            keywords_param = f"%{keywords}%"
-            params.extend([keywords_param, keywords_param, keywords_param])
-        
-        if location:
-            query += " AND location LIKE ?"
-            params.append(f"%{location}%")
-        
-        if company:
-            query += " AND company LIKE ?"
-            params.append(f"%{company}%")
+        filters = dimension_filters()
         
         if experience_level and experience_level != 'All':
-            query += " AND experience_level = ?"
-            params.append(experience_level)
+            filters['experience_level'] = experience_level
         
         if job_type and job_type != 'All':
-            query += " AND job_type = ?"
-            params.append(job_type)
+            filters['job_type'] = job_type
         
         if work_model and work_model != 'All':
-            query += " AND work_model = ?"
-            params.append(work_model)
-        
-        query += " ORDER BY scraped_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        
-        cursor.execute(query, params)
-        jobs = cursor.fetchall()
-        
-        # Convert to list of dictionaries
-        jobs_list = []
-        for job in jobs:
-            job_dict = dict(job)
-            # Truncate description for list view
-            if job_dict['description'] and len(job_dict['description']) > 200:
-                job_dict['description_preview'] = job_dict['description'][:200] + "..."
-            else:
-                job_dict['description_preview'] = job_dict['description']
-            jobs_list.append(job_dict)
+            filters['work_model'] = work_model
+        
+        # Keywords go through the full-text index, ranked by relevance
+        with job_store() as store:
+            jobs_list, next_cursor = store.find_jobs_page(limit, request.args.get('cursor', type=str),
+                                                          keywords, filters, offset)
         
-        conn.close()
         return jsonify({
             'jobs': jobs_list,
             'total': len(jobs_list),
+            'next_cursor': next_cursor,
             'filters': {
                 'keywords': keywords,
                 'location': location,
@@ -378,9 +375,79 @@ def search_jobs():
             }
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/archive/search', methods=['GET'])
+@sqlite_only
+def search_archived_jobs():
+    """Full-text search over archived jobs (those archived as searchable), best match first"""
+    try:
+        keywords = request.args.get('keywords', type=str, default='')
+        limit = min(request.args.get('limit', type=int, default=50), 500)
+        match = build_match_query(keywords)
+        if match is None:
+            return jsonify({'error': 'keywords is required'}), 400
+        
+        jobs_list = search_archive(DATABASE_PATH, match, JOB_LIST_COLUMNS + ", jobs.archived_at", limit)
+        return jsonify({'jobs': jobs_list, 'total': len(jobs_list)})
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/browser/metrics', methods=['GET'])
+def get_browser_metrics():
+    """Shared browser service state and context-lease metrics for this server"""
+    try:
+        return jsonify(browser_service.get_metrics())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/descriptions/fetch-pending', methods=['POST'])
+def fetch_pending_descriptions():
+    """Queue every list-only job that is still missing its description"""
+    try:
+        limit = request.args.get('limit', type=int, default=None)
+        queued = description_drain.enqueue_pending(limit)
+        return jsonify({'queued': queued})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<int:job_id>/duplicates', methods=['GET'])
+@sqlite_only
+def get_job_duplicates(job_id):
+    """Get the near-duplicate postings clustered with a job"""
+    try:
+        conn = get_db_connection()
+        members = get_cluster(conn, job_id)
+        conn.close()
+        return jsonify({'job_id': job_id, 'duplicates': members})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def reusable_document(job_id, document_column):
+    """
+    Documents of a near-duplicate posting the caller asked to reuse, via a JSON body of
+    {"reuse_duplicate": true} (most similar member with one) or {"reuse_from": <job id>}.
+    Returns (donor job id, parsed document) or (None, None).
+    """
+    options = request.get_json(silent=True) or {}
+    if not options.get('reuse_duplicate') and not options.get('reuse_from'):
+        return None, None
+    if is_postgres(JOB_STORE):
+        raise RuntimeError(f"Near-duplicate clusters are kept in the SQLite database; documents cannot be "
+                           f"reused while {DATABASE_URL_ENV} points at PostgreSQL")
+    conn = get_db_connection()
+    try:
+        donor = find_document_donor(conn, job_id, document_column, options.get('reuse_from'))
+    finally:
+        conn.close()
+    if not donor:
+        return None, None
+    return donor['id'], json.loads(donor[document_column])
+
 @app.route('/api/jobs/<int:job_id>/generate-resume', methods=['POST'])
 def generate_resume(job_id):
     """Generate only the resume for a specific job."""
@@ -390,10 +457,18 @@ def generate_resume(job_id):
         if not job:
             return jsonify({"error": "Job not found"}), 404
         
+        if not ensure_job_description(job):
+            return jsonify({"error": "Job description is not available yet"}), 502
+        
         print(f"🔄 Generating resume for Job ID: {job_id} - {job['title']} at {job['company']}")
         
-        # Generate resume with AI
-        tailored_resume = generate_tailored_resume(job)
+        # Reuse a near-duplicate posting's resume when asked, instead of generating another
+        reused_from, tailored_resume = reusable_document(job_id, 'resume_json')
+        if reused_from:
+            print(f"♻️ Reusing resume from near-duplicate Job ID: {reused_from}")
+        else:
+            # Generate resume with AI
+            tailored_resume = generate_tailored_resume(job)
         
         if not tailored_resume:
             return jsonify({"error": "Failed to generate resume"}), 500
@@ -432,6 +507,7 @@ def generate_resume(job_id):
         return jsonify({
             "message": "Resume generated successfully",
             "resume_json": tailored_resume,
+            "reused_from": reused_from,
             "html_path": str(resume_html_filepath),
             "pdf_path": str(resume_pdf_filepath)
         })
@@ -449,6 +525,9 @@ def generate_cover_letter(job_id):
         if not job:
             return jsonify({"error": "Job not found"}), 404
         
+        if not ensure_job_description(job):
+            return jsonify({"error": "Job description is not available yet"}), 502
+        
         # Clean the location
         job['location'] = clean_location(job.get('location', ''))
         
@@ -472,8 +551,12 @@ def generate_cover_letter(job_id):
         except Exception as e:
             return jsonify({"error": f"Failed to load tailored resume: {e}"}), 500
         
-        # Generate cover letter with AI using the actual tailored resume
-        tailored_cover_letter = generate_tailored_cover_letter(job, tailored_resume)
+        reused_from, tailored_cover_letter = reusable_document(job_id, 'cover_letter_json')
+        if reused_from:
+            print(f"♻️ Reusing cover letter from near-duplicate Job ID: {reused_from}")
+        else:
+            # Generate cover letter with AI using the actual tailored resume
+            tailored_cover_letter = generate_tailored_cover_letter(job, tailored_resume)
         
         if not tailored_cover_letter:
             return jsonify({"error": "Failed to generate cover letter"}), 500
@@ -512,6 +595,7 @@ def generate_cover_letter(job_id):
         return jsonify({
             "message": "Cover letter generated successfully",
             "cover_letter_json": tailored_cover_letter,
+            "reused_from": reused_from,
             "html_path": str(cover_letter_html_filepath),
             "pdf_path": str(cover_letter_pdf_filepath)
         })
@@ -671,24 +755,34 @@ def serve_combined_html(job_id):
 
 @app.route('/api/jobs/<int:job_id>/update-location', methods=['POST'])
 def update_job_location(job_id):
-    data = request.get_json()
-    new_location = data.get('location', '')
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE jobs SET location = ? WHERE id = ?", (new_location, job_id))
-    conn.commit()
-    conn.close()
-    return jsonify({'success': True, 'location': new_location})
+    try:
+        data = request.get_json()
+        new_location = data.get('location', '')
+        with job_store() as store:
+            if not store.update_job_location(job_id, new_location):
+                return jsonify({'error': 'Job not found'}), 404
+        return jsonify({'success': True, 'location': new_location})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
     # Check if database exists
-    if not os.path.exists(DATABASE_PATH):
+    if not is_postgres(JOB_STORE) and not os.path.exists(DATABASE_PATH):
         print(f"Database not found at {DATABASE_PATH}")
         print("Please run the LinkedIn scraper first to create the database.")
         exit(1)
     
+    # Bring older databases up to the current schema
+    if is_postgres(JOB_STORE):
+        with job_store() as store:
+            store.create_tables()
+    else:
+        conn = get_db_connection()
+        migrate(conn)
+        conn.close()
+    
     print(f"Starting API server...")
-    print(f"Database: {DATABASE_PATH}")
+    print(f"Database: {redact(JOB_STORE)}")
     print(f"API will be available at: http://localhost:5000")
     print(f"React frontend should connect to: http://localhost:3000")
     
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Database migration runner
+Brings data/linkedin_jobs.db up to the latest schema version defined in src/schema.py.
+"""
+
+import sqlite3
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from schema import LATEST_VERSION, MIGRATIONS, get_schema_version, migrate
+
+def run_migrations(db_path='data/linkedin_jobs.db'):
+    """Apply all pending migrations"""
+    if not os.path.exists(db_path):
+        print(f"❌ Database not found at {db_path}")
+        return False
+    
+    try:
+        conn = sqlite3.connect(db_path)
+        current = get_schema_version(conn)
+        print(f"ℹ️  Current schema version: {current} (latest: {LATEST_VERSION})")
+        
+        pending = [(version, description) for version, description, _ in MIGRATIONS if version > current]
+        if not pending:
+            print("ℹ️  Schema is up to date")
+            conn.close()
+            return True
+        
+        for version, description in pending:
+            print(f"🔧 Pending migration {version}: {description}")
+        
+        version = migrate(conn)
+        conn.close()
+        print(f"🎉 Schema migrated to version {version}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error running migrations: {e}")
+        return False
+
+if __name__ == "__main__":
+    db_path = sys.argv[1] if len(sys.argv) > 1 else 'data/linkedin_jobs.db'
+    print(f"🔧 Running migrations on {db_path}")
+    success = run_migrations(db_path)
+    if success:
+        print("✅ Migration completed successfully")
+    else:
+        print("❌ Migration failed")
@@ -6,7 +6,14 @@ Shows the structure and contents of the LinkedIn jobs database.
 
 import sqlite3
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from schema import migrate
+from job_stats import get_stats
 
 def verify_database_schema():
     """Verify and display the database schema"""
@@ -73,23 +80,19 @@ def verify_database_schema():
         print("\n📈 DATABASE STATISTICS:")
         print("-" * 30)
         
-        # Total jobs
-        cursor.execute("SELECT COUNT(*) FROM jobs")
-        total_jobs = cursor.fetchone()[0]
-        print(f"Total jobs: {total_jobs}")
+        # Counters maintained by triggers (src/job_stats.py), no table scans
+        migrate(conn)
+        stats = get_stats(conn)
+        print(f"Total jobs: {stats['total_jobs']}")
         
         # Jobs by status
-        cursor.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
-        status_counts = cursor.fetchall()
-        if status_counts:
+        if stats['status_counts']:
             print("Jobs by status:")
-            for status, count in status_counts:
+            for status, count in stats['status_counts'].items():
                 print(f"   • {status}: {count}")
         
         # Recent jobs
-        cursor.execute("SELECT COUNT(*) FROM jobs WHERE scraped_at >= datetime('now', '-7 days')")
-        recent_jobs = cursor.fetchone()[0]
-        print(f"Jobs scraped in last 7 days: {recent_jobs}")
+        print(f"Jobs scraped in last 7 days: {stats['recent_jobs']}")
         
         # Search history
         cursor.execute("SELECT COUNT(*) FROM search_history")
@@ -15,6 +15,12 @@ except ImportError:
     # If running as a standalone script, db might not be available
     db = None
 
+# The shared browser service renders PDFs when it is running; wkhtmltopdf is the fallback
+try:
+    import browser_service
+except ImportError:
+    browser_service = None
+
 # --- Configuration ---
 MASTER_RESUME_PATH = "mydetails/master_resume.json"
 MASTER_COVER_LETTER_PATH = "mydetails/master_coverletter.json"
@@ -349,12 +355,20 @@ def generate_html_from_json(json_filepath: Path, html_filepath: Path, document_t
 
 def generate_pdf_from_html(html_filepath: Path, pdf_filepath: Path):
     """
-    Generate a PDF file from an HTML file using wkhtmltopdf with 0.5 inch margins.
+    Generate a PDF file from an HTML file with 0.5 inch margins, using the shared browser
+    service when it is running and wkhtmltopdf otherwise.
     
     Args:
         html_filepath: Path to the HTML file
         pdf_filepath: Path where the PDF should be saved
     """
+    if browser_service is not None and browser_service.is_running():
+        print("📄 Generating PDF from HTML using the shared browser...")
+        if browser_service.render_pdf(html_filepath, pdf_filepath):
+            print(f"✅ Successfully generated PDF: {pdf_filepath}")
+            return True
+        print("⚠️  Shared browser could not render the PDF, falling back to wkhtmltopdf")
+    
     print(f"📄 Generating PDF from HTML using wkhtmltopdf...")
     
     # wkhtmltopdf command with 0.5 inch margins
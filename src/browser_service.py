@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Shared Browser Service
+Keeps one long-lived Chromium running with a CDP endpoint so scraper runs and PDF rendering
+can lease a fresh browser context from it instead of launching a new browser every time.
+
+Usage:
+    python browser_service.py start [--headful] [--port 9222]
+    python browser_service.py status
+    python browser_service.py stop
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from playwright.sync_api import sync_playwright
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+SERVICE_STATE_PATH = os.path.join(DATA_DIR, 'browser_service.json')
+SERVICE_PROFILE_DIR = os.path.join(DATA_DIR, 'browser_service_profile')
+DEFAULT_PORT = 9222
+
+# Per-process lease metrics; launch-time savings compare a CDP connect against a cold launch
+_metrics_lock = threading.Lock()
+_metrics: Dict[str, Any] = {
+    "leases": 0,
+    "service_leases": 0,
+    "local_launches": 0,
+    "connect_seconds": 0.0,
+    "launch_seconds": 0.0,
+    "lease_seconds": 0.0,
+    "launch_seconds_saved": 0.0,
+}
+
+def _record(**increments):
+    with _metrics_lock:
+        for key, value in increments.items():
+            _metrics[key] += value
+
+def get_metrics() -> Dict[str, Any]:
+    """Lease metrics for this process plus the running service's state"""
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    leases = metrics["leases"] or 1
+    metrics["avg_lease_seconds"] = round(metrics["lease_seconds"] / leases, 3)
+    if metrics["service_leases"]:
+        metrics["avg_connect_seconds"] = round(metrics["connect_seconds"] / metrics["service_leases"], 3)
+    if metrics["local_launches"]:
+        metrics["avg_launch_seconds"] = round(metrics["launch_seconds"] / metrics["local_launches"], 3)
+    metrics["service"] = read_service_state()
+    return metrics
+
+def read_service_state() -> Optional[Dict[str, Any]]:
+    """The running service's endpoint and launch info, or None if it is not running"""
+    try:
+        with open(SERVICE_STATE_PATH, "r", encoding='utf-8') as f:
+            state = json.load(f)
+    except Exception:
+        return None
+    try:
+        os.kill(state["pid"], 0)
+    except (OSError, KeyError):
+        return None
+    return state
+
+def is_running() -> bool:
+    return read_service_state() is not None
+
+def _wait_for_endpoint(port: int, timeout: float = 15.0) -> str:
+    """Poll the DevTools HTTP endpoint until Chromium reports its websocket URL"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1) as response:
+                return json.load(response)["webSocketDebuggerUrl"]
+        except Exception:
+            time.sleep(0.1)
+    raise TimeoutError(f"Chromium did not open a DevTools endpoint on port {port}")
+
+def start_service(port: int = DEFAULT_PORT, headless: bool = True) -> Dict[str, Any]:
+    """Launch the shared Chromium and record its CDP endpoint. Returns the service state."""
+    state = read_service_state()
+    if state:
+        print(f"[BROWSER SERVICE] Already running (pid {state['pid']}) at {state['endpoint']}")
+        return state
+
+    with sync_playwright() as p:
+        executable = p.chromium.executable_path
+
+    args = [
+        executable,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={SERVICE_PROFILE_DIR}",
+        "--no-first-run",
+        "--no-default-browser-check",
+    ]
+    if headless:
+        args.append("--headless=new")
+
+    started = time.perf_counter()
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    endpoint = _wait_for_endpoint(port)
+    launch_seconds = time.perf_counter() - started
+
+    state = {
+        "pid": process.pid,
+        "port": port,
+        "endpoint": f"http://127.0.0.1:{port}",
+        "websocket": endpoint,
+        "headless": headless,
+        "launch_seconds": round(launch_seconds, 3),
+        "started_at": time.time(),
+    }
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(SERVICE_STATE_PATH, "w", encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    print(f"[BROWSER SERVICE] Started Chromium (pid {process.pid}) in {launch_seconds:.2f}s at {state['endpoint']}")
+    return state
+
+def stop_service() -> bool:
+    """Stop the shared Chromium if it is running"""
+    state = read_service_state()
+    if not state:
+        print("[BROWSER SERVICE] Not running")
+        return False
+    os.kill(state["pid"], signal.SIGTERM)
+    try:
+        os.remove(SERVICE_STATE_PATH)
+    except OSError:
+        pass
+    print(f"[BROWSER SERVICE] Stopped Chromium (pid {state['pid']})")
+    return True
+
+@contextmanager
+def lease_context(p, headless: bool = True, slow_mo: int = 0,
+                  new_context: Optional[Callable[[Any], Any]] = None, **context_options):
+    """
+    Lease a browser context, from the shared service when one is running in the requested
+    mode, otherwise from a freshly launched browser.
+
+    Args:
+        p: The active sync_playwright() instance
+        headless: Browser mode the caller needs (a headful service cannot serve headless callers and vice versa)
+        slow_mo: Milliseconds to slow each Playwright operation down by
+        new_context: Optional callable(browser) -> context (e.g. SessionManager.new_context)
+        context_options: Passed to browser.new_context() when new_context is not given
+    """
+    state = read_service_state()
+    started = time.perf_counter()
+    browser = None
+    from_service = False
+
+    if state and state.get("headless") == headless:
+        try:
+            browser = p.chromium.connect_over_cdp(state["endpoint"], slow_mo=slow_mo)
+            connect_seconds = time.perf_counter() - started
+            from_service = True
+            _record(service_leases=1, connect_seconds=connect_seconds,
+                    launch_seconds_saved=max(state.get("launch_seconds", 0) - connect_seconds, 0))
+            print(f"[BROWSER SERVICE] Connected to shared browser in {connect_seconds:.2f}s")
+        except Exception as e:
+            print(f"[BROWSER SERVICE] Could not connect to shared browser, launching one: {e}")
+
+    if browser is None:
+        browser = p.chromium.launch(headless=headless, slow_mo=slow_mo)
+        _record(local_launches=1, launch_seconds=time.perf_counter() - started)
+
+    leased_at = time.perf_counter()
+    context = new_context(browser) if new_context else browser.new_context(**context_options)
+    try:
+        yield context
+    finally:
+        _record(leases=1, lease_seconds=time.perf_counter() - leased_at)
+        try:
+            context.close()
+        except Exception:
+            pass
+        # For a CDP connection this only disconnects; the shared browser keeps running
+        try:
+            browser.close()
+        except Exception:
+            pass
+        if not from_service:
+            print("[BROWSER SERVICE] Closed locally launched browser")
+
+def render_pdf(html_filepath: Path, pdf_filepath: Path) -> bool:
+    """Render an HTML file to a Letter PDF (0.5 inch margins) in a context leased from the service"""
+    try:
+        with sync_playwright() as p:
+            with lease_context(p, headless=True) as context:
+                page = context.new_page()
+                page.goto(Path(html_filepath).resolve().as_uri(), wait_until="load")
+                page.pdf(
+                    path=str(Path(pdf_filepath).resolve()),
+                    format="Letter",
+                    margin={"top": "0.5in", "bottom": "0in", "left": "0.5in", "right": "0.5in"},
+                    print_background=True
+                )
+        return Path(pdf_filepath).exists()
+    except Exception as e:
+        print(f"❌ Error rendering PDF with shared browser: {e}")
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared Chromium service for the scraper and PDF rendering")
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--headful", action="store_true", help="Run with a visible window (needed for manual LinkedIn login)")
+    args = parser.parse_args()
+
+    if args.command == "start":
+        start_service(args.port, headless=not args.headful)
+    elif args.command == "stop":
+        stop_service()
+    else:
+        state = read_service_state()
+        print(json.dumps(state, indent=2) if state else "[BROWSER SERVICE] Not running")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Change Feed Module
+Append-only log of job inserts, updates and deletes (job_changes, written by triggers on jobs,
+see schema migration 10). Clients keep the seq of the last change they applied and ask only for
+what changed since, instead of re-fetching the whole job list.
+
+Usage:
+    python change_feed.py prune [--days 30] [db_path]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from typing import Any, Dict
+
+from job_rows import fetch_jobs
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+# Columns a client can see in the job list; an update touching only other columns (e.g. the
+# company/location keys or file paths) is not logged
+CHANGE_COLUMNS = [
+    'title', 'company', 'location', 'description_preview', 'url',
+    'search_keywords', 'search_location', 'search_date_posted',
+    'experience_level', 'job_type', 'work_model', 'scraped_at',
+    'status', 'liked', 'applied', 'disliked', 'notes', 'description_pending',
+    'resume_created', 'cover_letter_created',
+]
+
+DEFAULT_RETENTION_DAYS = 30
+
+def trigger_definitions() -> Dict[str, tuple]:
+    """Triggers logging every change to jobs, as {name: (event, when, statement)}"""
+    changed = " OR ".join(f"old.{column} IS NOT new.{column}" for column in CHANGE_COLUMNS)
+    return {
+        'jobs_changes_after_insert': ("AFTER INSERT ON jobs", None,
+                                      "INSERT INTO job_changes (job_id, op) VALUES (new.id, 'insert');"),
+        'jobs_changes_after_update': (f"AFTER UPDATE OF {', '.join(CHANGE_COLUMNS)} ON jobs", changed,
+                                      "INSERT INTO job_changes (job_id, op) VALUES (new.id, 'update');"),
+        'jobs_changes_after_delete': ("AFTER DELETE ON jobs", None,
+                                      "INSERT INTO job_changes (job_id, op) VALUES (old.id, 'delete');"),
+    }
+
+def latest_seq(conn: sqlite3.Connection) -> int:
+    """seq of the newest change ever logged (0 for none); never goes backwards, even after pruning"""
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'job_changes'").fetchone()
+    return row[0] if row else 0
+
+def get_changes(conn: sqlite3.Connection, since: int, columns: str = "jobs.*", limit: int = 500) -> Dict[str, Any]:
+    """
+    Jobs changed after seq since, oldest change first and at most limit log entries per call.
+
+    Returns:
+        changed: current rows of jobs inserted or updated (columns must start with jobs.id)
+        deleted: ids of jobs deleted
+        next_since: seq to pass as since on the next call
+        has_more: more changes are waiting
+        reset: changes after since were pruned from the log (or since is from another database);
+               the client must re-fetch everything
+    """
+    oldest = conn.execute("SELECT MIN(seq) FROM job_changes").fetchone()[0]
+    latest = latest_seq(conn)
+    if since > latest or (since < latest and (oldest is None or since < oldest - 1)):
+        return {'changed': [], 'deleted': [], 'next_since': latest, 'has_more': False, 'reset': True}
+
+    entries = conn.execute(
+        "SELECT seq, job_id, op FROM job_changes WHERE seq > ? ORDER BY seq LIMIT ?", (since, limit + 1)
+    ).fetchall()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Several changes to one job collapse into its current state
+    last_op: Dict[int, str] = {}
+    for _, job_id, op in entries:
+        last_op.pop(job_id, None)
+        last_op[job_id] = op
+    live_ids = [job_id for job_id, op in last_op.items() if op != 'delete']
+    rows: Dict[int, Any] = {}
+    if live_ids:
+        jobs = fetch_jobs(conn, f"SELECT {columns} FROM jobs WHERE jobs.id IN ({','.join('?' * len(live_ids))})",
+                          live_ids)
+        rows = {job[0]: job for job in jobs}
+    return {
+        'changed': [rows[job_id] for job_id in live_ids if job_id in rows],
+        # A job updated in this batch may already be gone; its delete entry is further on
+        'deleted': [job_id for job_id, op in last_op.items() if op == 'delete' or job_id not in rows],
+        'next_since': entries[-1][0] if entries else since,
+        'has_more': has_more,
+        'reset': False,
+    }
+
+def prune_changes(conn: sqlite3.Connection, days: int = DEFAULT_RETENTION_DAYS) -> int:
+    """Drop log entries older than days. Clients further behind get reset=True."""
+    cursor = conn.execute("DELETE FROM job_changes WHERE changed_at < datetime('now', ?)", (f"-{days} days",))
+    conn.commit()
+    return cursor.rowcount
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from schema import migrate
+
+    parser = argparse.ArgumentParser(description="Job change feed maintenance")
+    parser.add_argument("command", choices=["prune"])
+    parser.add_argument("db_path", nargs="?", default=os.path.join(DATA_DIR, 'linkedin_jobs.db'))
+    parser.add_argument("--days", type=int, default=DEFAULT_RETENTION_DAYS)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db_path)
+    migrate(conn)
+    pruned = prune_changes(conn, args.days)
+    print(f"[CHANGES] Pruned {pruned} change(s) older than {args.days} days; latest seq is {latest_seq(conn)}")
+    conn.close()
@@ -7,7 +7,7 @@ Provides simple database functions for job document generation
 from linkedin_db import LinkedInJobsDB
 
 def _get_db():
-    """Get a new database connection for each request"""
+    """Get a database handle backed by the shared connection pool"""
     db = LinkedInJobsDB()
     db.connect()
     return db
@@ -50,4 +50,12 @@ def update_job_cover_letter_file_path(job_id: int, cover_letter_file_path: str)
     try:
         return db.update_job_cover_letter_file_path(job_id, cover_letter_file_path)
     finally:
-        db.disconnect() 
\ No newline at end of file
+        db.disconnect() 
+
+def update_job_description(job_id: int, description: str) -> bool:
+    """Store a lazily fetched description for a job"""
+    db = _get_db()
+    try:
+        return db.update_job_description(job_id, description)
+    finally:
+        db.disconnect()
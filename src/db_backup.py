@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Database Snapshot Module
+Consistent copies of the live database taken with SQLite's online backup API while the scraper
+and API keep running. Pages are copied a small step at a time with a pause in between, so a
+writer never waits on the backup for longer than one step. A write from another connection
+makes SQLite restart the copy; after a few restarts the rest is copied in a single step, which
+in WAL mode holds only a read snapshot and still does not block writers.
+
+Snapshots are written as data/backups/linkedin_jobs-YYYYmmdd-HHMMSS-ffffff.db, optionally gzip
+or zstd compressed, checked with PRAGMA quick_check, and rotated so only the newest --keep remain.
+
+Usage:
+    python db_backup.py snapshot [--compress gzip|zstd] [--keep 24] [db_path]
+    python db_backup.py schedule [--every 3600] [--compress gzip|zstd] [--keep 24] [db_path]
+"""
+
+import argparse
+import glob
+import gzip
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+BACKUP_DIR = os.path.join(DATA_DIR, 'backups')
+
+STEP_PAGES = 256              # pages copied per step (1 MB with 4 KB pages)
+STEP_PAUSE = 0.005            # seconds between steps, for writers to get the lock
+MAX_RESTARTS = 3              # restarts caused by concurrent writes before copying in one step
+DEFAULT_KEEP = 24             # snapshots kept (a day of hourly backups)
+DEFAULT_INTERVAL = 3600
+COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+class _BackupRestarted(Exception):
+    pass
+
+def _copy(source: sqlite3.Connection, target: sqlite3.Connection, pages: int, pause: float) -> Dict[str, int]:
+    """One backup attempt; raises _BackupRestarted once writers have restarted it MAX_RESTARTS times"""
+    progress = {'steps': 0, 'restarts': 0, 'pages': 0, 'remaining': None}
+
+    def on_step(status, remaining, total):
+        progress['steps'] += 1
+        progress['pages'] = total
+        if progress['remaining'] is not None and remaining > progress['remaining']:
+            progress['restarts'] += 1
+            if pages > 0 and progress['restarts'] >= MAX_RESTARTS:
+                raise _BackupRestarted()
+        progress['remaining'] = remaining
+        if remaining and pause:
+            time.sleep(pause)
+
+    source.backup(target, pages=pages, progress=on_step, sleep=0.05)
+    return progress
+
+def _compress(path: str, compression: str) -> str:
+    """Compress a finished snapshot next to itself and remove the plain copy"""
+    compressed_path = path + COMPRESSIONS[compression]
+    with open(path, 'rb') as source:
+        if compression == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("zstandard is required for --compress zstd (pip install zstandard)")
+            with open(compressed_path + '.tmp', 'wb') as target:
+                zstandard.ZstdCompressor(level=3, threads=-1).copy_stream(source, target)
+        else:
+            with gzip.open(compressed_path + '.tmp', 'wb', compresslevel=6) as target:
+                shutil.copyfileobj(source, target, 1 << 20)
+    os.replace(compressed_path + '.tmp', compressed_path)
+    os.remove(path)
+    return compressed_path
+
+def snapshot(db_path: str, backup_dir: str = BACKUP_DIR, compression: Optional[str] = None,
+             keep: Optional[int] = DEFAULT_KEEP, pages: int = STEP_PAGES, pause: float = STEP_PAUSE,
+             verify: bool = True) -> Dict[str, Any]:
+    """
+    Take a consistent snapshot of db_path into backup_dir and rotate old ones.
+    Returns the snapshot path with size, duration and throughput figures.
+    """
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}' (expected one of: {', '.join(COMPRESSIONS)})")
+    os.makedirs(backup_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    # Microseconds, so snapshots taken within the same second do not replace each other
+    path = os.path.join(backup_dir, f"{stem}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.db")
+    temp_path = path + '.tmp'
+
+    started = time.perf_counter()
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(temp_path)
+    try:
+        source.execute("PRAGMA busy_timeout = 5000")
+        try:
+            progress = _copy(source, target, pages, pause)
+        except _BackupRestarted:
+            print(f"[BACKUP] Copy restarted {MAX_RESTARTS} times by concurrent writes; finishing in one step")
+            progress = _copy(source, target, -1, 0)
+            progress['restarts'] += MAX_RESTARTS
+        # A standalone file: no -wal next to the snapshot
+        target.execute("PRAGMA journal_mode = DELETE")
+        check = target.execute("PRAGMA quick_check").fetchone()[0] if verify else 'skipped'
+    except Exception:
+        target.close()
+        os.remove(temp_path)
+        raise
+    finally:
+        target.close()
+        source.close()
+    if check not in ('ok', 'skipped'):
+        os.remove(temp_path)
+        raise RuntimeError(f"Snapshot failed quick_check: {check}")
+    os.replace(temp_path, path)
+    copied = time.perf_counter() - started
+
+    size = os.path.getsize(path)
+    if compression:
+        path = _compress(path, compression)
+    elapsed = time.perf_counter() - started
+    removed = rotate(backup_dir, stem, keep) if keep else []
+    return {
+        'path': path,
+        'pages': progress['pages'],
+        'steps': progress['steps'],
+        'restarts': progress['restarts'],
+        'database_bytes': size,
+        'snapshot_bytes': os.path.getsize(path),
+        'copy_seconds': round(copied, 3),
+        'seconds': round(elapsed, 3),
+        'mb_per_second': round(size / 1024 / 1024 / copied, 1) if copied else None,
+        'quick_check': check,
+        'rotated': removed,
+    }
+
+def list_snapshots(backup_dir: str, stem: str) -> List[str]:
+    """
+    Snapshots of one database, oldest first: by the timestamp in the name (the compression
+    extension does not count), then by modification time
+    """
+    paths = glob.glob(os.path.join(backup_dir, f"{stem}-*.db")) + [
+        path for extension in COMPRESSIONS.values()
+        for path in glob.glob(os.path.join(backup_dir, f"{stem}-*.db{extension}"))
+    ]
+
+    def taken_at(path: str):
+        name = os.path.basename(path)
+        # Names from before microseconds were added sort first within their second
+        return name[len(stem) + 1:name.rindex('.db')], os.path.getmtime(path)
+
+    return sorted(paths, key=taken_at)
+
+def rotate(backup_dir: str, stem: str, keep: int) -> List[str]:
+    """Delete all but the newest keep snapshots. Returns the deleted paths."""
+    snapshots = list_snapshots(backup_dir, stem)
+    removed = snapshots[:-keep] if len(snapshots) > keep else []
+    for path in removed:
+        os.remove(path)
+    return removed
+
+def _report(result: Dict[str, Any]):
+    print(f"[BACKUP] {result['path']}")
+    print(f"[BACKUP] {result['pages']} pages ({result['database_bytes'] / 1024 / 1024:.1f} MB) copied in "
+          f"{result['copy_seconds']:.2f}s ({result['mb_per_second']} MB/s, {result['steps']} step(s), "
+          f"{result['restarts']} restart(s)); total {result['seconds']:.2f}s, "
+          f"snapshot {result['snapshot_bytes'] / 1024 / 1024:.1f} MB, quick_check {result['quick_check']}")
+    if result['rotated']:
+        print(f"[BACKUP] Rotated out {len(result['rotated'])} old snapshot(s)")
+
+def run_schedule(db_path: str, interval: int = DEFAULT_INTERVAL, **options):
+    """Take a snapshot every interval seconds until interrupted; a failed snapshot is retried next time"""
+    print(f"[BACKUP] Snapshotting {db_path} every {interval}s (Ctrl+C to stop)")
+    while True:
+        started = time.monotonic()
+        try:
+            _report(snapshot(db_path, **options))
+        except Exception as e:
+            print(f"[BACKUP ERROR] Snapshot failed: {e}")
+        time.sleep(max(0, interval - (time.monotonic() - started)))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Online snapshots of the jobs database")
+    parser.add_argument("command", choices=["snapshot", "schedule"])
+    parser.add_argument("db_path", nargs="?", default=os.path.join(DATA_DIR, 'linkedin_jobs.db'))
+    parser.add_argument("--output", default=BACKUP_DIR, help="snapshot directory")
+    parser.add_argument("--compress", choices=list(COMPRESSIONS), default=None)
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP, help="snapshots to keep (0 keeps all)")
+    parser.add_argument("--every", type=int, default=DEFAULT_INTERVAL, help="seconds between scheduled snapshots")
+    parser.add_argument("--pages", type=int, default=STEP_PAGES, help="pages copied per step")
+    parser.add_argument("--no-verify", action="store_true", help="skip PRAGMA quick_check on the snapshot")
+    args = parser.parse_intermixed_args()
+
+    if not os.path.exists(args.db_path):
+        print(f"[BACKUP ERROR] {args.db_path} does not exist")
+        sys.exit(1)
+    options = dict(backup_dir=args.output, compression=args.compress, keep=args.keep,
+                   pages=args.pages, verify=not args.no_verify)
+    if args.command == 'schedule':
+        try:
+            run_schedule(args.db_path, args.every, **options)
+        except KeyboardInterrupt:
+            print("\n[BACKUP] Stopped")
+    else:
+        _report(snapshot(args.db_path, **options))
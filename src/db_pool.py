@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Database Connection Manager
+One thread-safe SQLite connection pool per database file, shared by the scraper, the API server
+and the AI tailor helpers. Every connection runs in WAL mode so readers never block the writer.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from description_codec import register_functions
+from schema import migrate
+from search_index import sync_search_index
+
+# Applied to every new connection
+CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",       # readers and one writer run concurrently
+    "PRAGMA synchronous = NORMAL",     # safe with WAL; fsync only at checkpoints
+    "PRAGMA busy_timeout = 5000",      # wait up to 5s for a lock instead of failing
+    "PRAGMA cache_size = -20000",      # ~20 MB page cache per connection
+    "PRAGMA temp_store = MEMORY",
+]
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply the shared pragmas and SQL functions to a connection"""
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return register_functions(conn)
+
+class PooledConnection:
+    """
+    Proxy for a pooled sqlite3 connection. Behaves like the connection it wraps, except that
+    close() hands it back to the pool instead of closing it.
+    """
+
+    def __init__(self, pool: "ConnectionPool", conn: sqlite3.Connection):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a connection returned to the pool.")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(object.__getattribute__(self, "_conn"), name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is not None:
+            object.__setattr__(self, "_conn", None)
+            object.__getattribute__(self, "_pool").release(conn)
+
+class ConnectionPool:
+    """Thread-safe pool of configured connections to one database file"""
+
+    def __init__(self, db_path: str, max_idle: int = 8):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._migrated = False
+
+    def _new_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Column access by name; still indexable and iterable
+        configure_connection(conn)
+        if not self._migrated:
+            migrate(conn)
+            # Index jobs queued by a migration or written by another SQLite client
+            if sync_search_index(conn):
+                conn.commit()
+            self._migrated = True
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Take an idle connection (or open a new one). close() returns it to the pool."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._new_connection()
+        return PooledConnection(self, conn)
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection, rolling back anything its user left uncommitted"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Borrow a connection and run the with-block in one transaction (commit or roll back)"""
+        conn = self.acquire()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path: Optional[str] = None) -> ConnectionPool:
+    """The process-wide pool for a database file (data/linkedin_jobs.db by default)"""
+    if db_path is None:
+        db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'linkedin_jobs.db')
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(key)
+        return _pools[key]
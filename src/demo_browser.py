@@ -53,8 +53,13 @@ def demo_browser():
     # 5. List all jobs (summary)
     print("\n5. ALL JOBS SUMMARY:")
     print("-" * 40)
-    all_jobs = browser.get_all_jobs()
-    browser.display_job_list(all_jobs)
+    # Streamed, so a large store is printed as it is read instead of loaded first
+    print("-" * 120)
+    count = 0
+    for job in browser.iter_all_jobs():
+        browser.display_job_row(job)
+        count += 1
+    print(f"{count} job(s) in total")
     
     print("\n=== Demo Complete ===")
     print("Run 'python job_browser.py' for interactive browsing!")
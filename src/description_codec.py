@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Description Compression Module
+zstd compression of job descriptions with a dictionary trained on the database's own corpus
+(EEO statements, benefits and about-us sections repeat across thousands of postings).
+Compression is transparent: every pooled connection gets two SQL functions,
+
+    compress_description(text)  -> zstd BLOB with the newest dictionary (text unchanged without one)
+    description_text(value)     -> plain text for a compressed BLOB, any other value unchanged
+
+and job_details.description is only ever written and read through them. Dictionaries live in
+the description_dictionaries table (schema migration 8) and are never deleted, so rows written
+with an older dictionary stay readable. Requires the optional zstandard package; without it
+descriptions are stored as plain text.
+
+Usage:
+    python description_codec.py stats [db_path]
+    python description_codec.py train [db_path]      # retrain the dictionary, recompress, VACUUM
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from search_index import sync_search_index
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+DICTIONARY_SIZE = 112640          # zstd's default; capped at a tenth of a small corpus
+COMPRESSION_LEVEL = 9
+MIN_TRAINING_SAMPLES = 100        # zstd cannot train a useful dictionary from fewer
+MAX_TRAINING_SAMPLES = 20000
+
+class DescriptionCodec:
+    """Per-connection compressor state; dictionaries are loaded from the database on first use"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.compressor = None            # for the newest dictionary, created on first write
+        self.decompressors: Dict[int, Any] = {}
+
+    def _dictionary(self, dictionary_id: Optional[int] = None):
+        query = "SELECT id, dictionary FROM description_dictionaries"
+        if dictionary_id is None:
+            row = self.conn.execute(query + " ORDER BY id DESC LIMIT 1").fetchone()
+        else:
+            row = self.conn.execute(query + " WHERE id = ?", (dictionary_id,)).fetchone()
+        if row is None:
+            return None
+        return zstandard.ZstdCompressionDict(bytes(row[1]), dict_type=zstandard.DICT_TYPE_FULLDICT)
+
+    def compress(self, text: Optional[str]):
+        if not text or zstandard is None:
+            return text
+        if self.compressor is None:
+            dictionary = self._dictionary()
+            if dictionary is None:
+                return text
+            self.compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, dict_data=dictionary)
+        return self.compressor.compress(text.encode('utf-8'))
+
+    def decompress(self, value):
+        if not isinstance(value, bytes):
+            return value
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read compressed descriptions (pip install zstandard)")
+        # The frame header names the dictionary it was written with
+        dictionary_id = zstandard.get_frame_parameters(value).dict_id
+        decompressor = self.decompressors.get(dictionary_id)
+        if decompressor is None:
+            dictionary = self._dictionary(dictionary_id) if dictionary_id else None
+            decompressor = zstandard.ZstdDecompressor(dict_data=dictionary) if dictionary else zstandard.ZstdDecompressor()
+            self.decompressors[dictionary_id] = decompressor
+        return decompressor.decompress(value).decode('utf-8')
+
+def register_functions(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Install compress_description() and description_text() on a connection"""
+    codec = DescriptionCodec(conn)
+    conn.create_function("compress_description", 1, codec.compress)
+    conn.create_function("description_text", 1, codec.decompress, deterministic=True)
+    return conn
+
+def get_storage_stats(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Stored vs plain-text size of all descriptions, and the database file size"""
+    stored, plain, compressed, total = conn.execute('''
+        SELECT COALESCE(SUM(length(CAST(description AS BLOB))), 0),
+               COALESCE(SUM(length(CAST(description_text(description) AS BLOB))), 0),
+               COALESCE(SUM(typeof(description) = 'blob'), 0),
+               COUNT(*)
+        FROM job_details WHERE description IS NOT NULL
+    ''').fetchone()
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    return {
+        'descriptions': total,
+        'compressed': compressed,
+        'plain_bytes': plain,
+        'stored_bytes': stored,
+        'ratio': round(plain / stored, 2) if stored else None,
+        'database_bytes': page_size * page_count,
+    }
+
+def train(conn: sqlite3.Connection) -> Optional[int]:
+    """
+    Train a dictionary on the stored descriptions and recompress every description with it,
+    in one transaction. Returns the new dictionary id, or None when there is too little text.
+    """
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to compress descriptions (pip install zstandard)")
+    samples = [row[0].encode('utf-8') for row in conn.execute(f'''
+        SELECT description_text(description) FROM job_details
+        WHERE description IS NOT NULL AND description != ''
+        ORDER BY job_id DESC LIMIT {MAX_TRAINING_SAMPLES}
+    ''')]
+    if len(samples) < MIN_TRAINING_SAMPLES:
+        print(f"[COMPRESS] Need at least {MIN_TRAINING_SAMPLES} descriptions to train a dictionary, found {len(samples)}")
+        return None
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        dictionary_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM description_dictionaries").fetchone()[0]
+        size = min(DICTIONARY_SIZE, sum(len(sample) for sample in samples) // 10)
+        dictionary = zstandard.train_dictionary(size, samples, dict_id=dictionary_id, level=COMPRESSION_LEVEL)
+        conn.execute(
+            "INSERT INTO description_dictionaries (id, dictionary, sample_count) VALUES (?, ?, ?)",
+            (dictionary_id, dictionary.as_bytes(), len(samples))
+        )
+        # A fresh codec picks up the new dictionary. Every rewritten row is queued for the search
+        # index; the sync finds its text unchanged and leaves the index and signatures alone.
+        register_functions(conn)
+        conn.execute('''
+            UPDATE job_details SET description = compress_description(description_text(description))
+            WHERE description IS NOT NULL AND description != ''
+        ''')
+        sync_search_index(conn)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return dictionary_id
+
+def _print_stats(stats: Dict[str, Any]):
+    print(f"[COMPRESS] {stats['compressed']}/{stats['descriptions']} descriptions compressed: "
+          f"{stats['plain_bytes'] / 1024:.0f} KB of text stored in {stats['stored_bytes'] / 1024:.0f} KB"
+          + (f" ({stats['ratio']}x)" if stats['ratio'] else ""))
+    print(f"[COMPRESS] Database size: {stats['database_bytes'] / 1024 / 1024:.2f} MB")
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from schema import migrate
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('stats', 'train'):
+        print(__doc__)
+        sys.exit(1)
+
+    db_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(DATA_DIR, 'linkedin_jobs.db')
+    conn = register_functions(sqlite3.connect(db_path))
+    migrate(conn)
+
+    if sys.argv[1] == 'train':
+        before = get_storage_stats(conn)
+        started = time.perf_counter()
+        conn.isolation_level = None
+        dictionary_id = train(conn)
+        if dictionary_id is not None:
+            conn.execute("VACUUM")
+            after = get_storage_stats(conn)
+            print(f"[COMPRESS] Trained dictionary {dictionary_id} and recompressed "
+                  f"{after['compressed']} descriptions in {time.perf_counter() - started:.2f}s")
+            print(f"[COMPRESS] Saved {(before['database_bytes'] - after['database_bytes']) / 1024 / 1024:.2f} MB "
+                  f"({before['database_bytes'] / 1024 / 1024:.2f} MB -> {after['database_bytes'] / 1024 / 1024:.2f} MB)")
+    _print_stats(get_storage_stats(conn))
+    conn.close()
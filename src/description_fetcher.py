@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Lazy Description Fetcher
+Fills in descriptions for jobs stored by the scraper's list-only mode, either on demand
+(a job opened in the API or queued for tailoring) or as a background drain.
+"""
+
+import argparse
+import os
+import queue
+import threading
+from typing import Dict, List, Optional
+
+from playwright.sync_api import sync_playwright
+
+from linkedin_db import LinkedInJobsDB, DATA_DIR
+from linkedin_scaper import extract_description, human_wait, DESCRIPTION_SELECTORS
+from session_manager import SessionManager
+from browser_service import lease_context
+
+def fetch_descriptions(jobs: List[Dict], cookie_file: Optional[str] = None, db_path: Optional[str] = None,
+                       headless: bool = True) -> Dict[int, str]:
+    """
+    Open each job's page in a single browser session and store its description.
+
+    Args:
+        jobs: Dicts with at least 'id' and 'url'
+        cookie_file: LinkedIn cookies to load (defaults to data/cookies.json)
+        db_path: Database to update (defaults to data/linkedin_jobs.db)
+        headless: Run the browser without a window
+
+    Returns:
+        Mapping of job id to the fetched description for every job that was filled in
+    """
+    if cookie_file is None:
+        cookie_file = os.path.join(DATA_DIR, "cookies.json")
+    jobs = [job for job in jobs if job.get('url')]
+    if not jobs:
+        return {}
+
+    db = LinkedInJobsDB(db_path)
+    if not db.connect():
+        return {}
+
+    fetched = {}
+    try:
+        session = SessionManager(cookie_file)
+        with sync_playwright() as p, lease_context(p, headless=headless, new_context=session.new_context) as context:
+            page = context.new_page()
+            for index, job in enumerate(jobs):
+                print(f"[FETCH] ({index + 1}/{len(jobs)}) Fetching description for job {job['id']}: {job['url']}")
+                try:
+                    page.goto(job['url'], timeout=20000)
+                    if index == 0 and not session.verify_page(page):
+                        print("[FETCH] Not logged in; run the scraper to log in first")
+                        break
+                    page.wait_for_selector(", ".join(DESCRIPTION_SELECTORS), timeout=10000)
+                    description = extract_description(page)
+                except Exception as e:
+                    print(f"[FETCH] Failed to load job {job['id']}: {e}")
+                    continue
+                if not description:
+                    print(f"[FETCH] No description found for job {job['id']}, leaving it pending")
+                    continue
+                if db.update_job_description(job['id'], description):
+                    fetched[job['id']] = description
+                if index + 1 < len(jobs):
+                    human_wait(1, 2)
+    finally:
+        db.disconnect()
+
+    print(f"[FETCH] Filled {len(fetched)}/{len(jobs)} pending description(s)")
+    return fetched
+
+def fill_job_description(job_id: int, cookie_file: Optional[str] = None, db_path: Optional[str] = None) -> Optional[str]:
+    """Fetch the description for one job right now (e.g. before tailoring). Returns it, or None."""
+    db = LinkedInJobsDB(db_path)
+    if not db.connect():
+        return None
+    try:
+        job = db.get_job_by_id(job_id)
+    finally:
+        db.disconnect()
+    if not job:
+        return None
+    if not job.get('description_pending'):
+        return job.get('description')
+    return fetch_descriptions([job], cookie_file, db_path).get(job_id)
+
+def fill_pending_descriptions(limit: Optional[int] = None, cookie_file: Optional[str] = None,
+                              db_path: Optional[str] = None, headless: bool = True) -> int:
+    """Drain pending descriptions, newest jobs first. Returns the number filled in."""
+    db = LinkedInJobsDB(db_path)
+    if not db.connect():
+        return 0
+    try:
+        jobs = db.get_jobs_pending_description(limit)
+    finally:
+        db.disconnect()
+    print(f"[FETCH] {len(jobs)} job(s) pending a description")
+    return len(fetch_descriptions(jobs, cookie_file, db_path, headless))
+
+class DescriptionDrain:
+    """Background worker that fetches queued job descriptions in batches, one browser per batch"""
+
+    def __init__(self, cookie_file: Optional[str] = None, db_path: Optional[str] = None, batch_size: int = 20):
+        self.cookie_file = cookie_file
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.queue: "queue.Queue[int]" = queue.Queue()
+        self.queued = set()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def enqueue(self, job_id: int) -> bool:
+        """Queue a job for fetching. Returns False if it is already queued."""
+        with self.lock:
+            if job_id in self.queued:
+                return False
+            self.queued.add(job_id)
+        self.queue.put(job_id)
+        self.start()
+        return True
+
+    def enqueue_pending(self, limit: Optional[int] = None) -> int:
+        """Queue every job still waiting for its description. Returns the number newly queued."""
+        db = LinkedInJobsDB(self.db_path)
+        if not db.connect():
+            return 0
+        try:
+            return sum(1 for job in db.iter_jobs_pending_description(limit) if self.enqueue(job['id']))
+        finally:
+            db.disconnect()
+
+    def start(self):
+        """Start the worker thread if it is not already running"""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="description-drain", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            job_ids = [self.queue.get()]
+            while len(job_ids) < self.batch_size:
+                try:
+                    job_ids.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            db = LinkedInJobsDB(self.db_path)
+            jobs = []
+            if db.connect():
+                try:
+                    jobs = [job for job in (db.get_job_by_id(job_id) for job_id in job_ids)
+                            if job and job.get('description_pending')]
+                finally:
+                    db.disconnect()
+
+            try:
+                fetch_descriptions(jobs, self.cookie_file, self.db_path)
+            except Exception as e:
+                print(f"[FETCH] Background drain failed: {e}")
+            finally:
+                with self.lock:
+                    self.queued.difference_update(job_ids)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch descriptions for jobs stored in list-only mode")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of jobs to fetch")
+    parser.add_argument("--cookies", default=None, help="Cookie file (default: data/cookies.json)")
+    parser.add_argument("--headful", action="store_true", help="Show the browser window")
+    args = parser.parse_args()
+
+    fill_pending_descriptions(args.limit, args.cookies, headless=not args.headful)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Company and Location Dimensions Module
+Canonical companies and locations (schema migration 9), referenced from jobs.company_id and
+jobs.location_id. Every spelling seen is recorded in an alias table, so "Shopify",
+"Shopify Inc." and "shopify" resolve to one row, and manual aliases can merge variants that
+normalization cannot ("Facebook" -> "Meta"). The free-text jobs.company and jobs.location
+columns keep the name as scraped.
+
+Usage:
+    python dimensions.py list company|location [db_path]
+    python dimensions.py alias company|location "<variant>" "<canonical name>" [db_path]
+"""
+
+import os
+import re
+import sqlite3
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from job_triage import normalize_company, normalize_text
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+# dimension -> (table, alias table, jobs column)
+DIMENSIONS = {
+    'company': ('companies', 'company_aliases', 'company_id'),
+    'location': ('locations', 'location_aliases', 'location_id'),
+}
+
+# Placeholders the scraper stores when a card has no location
+EMPTY_LOCATIONS = {'', 'location not specified'}
+
+def location_key(location: Optional[str]) -> str:
+    """Normalized location: lowercase, punctuation dropped ("New York, NY" == "new york ny")"""
+    name = normalize_text(location)
+    if name in EMPTY_LOCATIONS:
+        return ''
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", name)).strip()
+
+def dimension_key(dimension: str, name: Optional[str]) -> str:
+    """The canonical key a name is grouped under ('' when there is nothing to group)"""
+    if dimension == 'company':
+        return normalize_company(name) or normalize_text(name)
+    return location_key(name)
+
+def find_id(cursor, dimension: str, name: Optional[str]) -> Optional[int]:
+    """The id a name resolves to, without creating anything"""
+    table, alias_table, _ = DIMENSIONS[dimension]
+    alias = normalize_text(name)
+    if not alias:
+        return None
+    key = dimension_key(dimension, name)
+    # The exact spelling first, then any alias recorded for its normalized key (merged rows)
+    for value in (alias, key):
+        cursor.execute(f"SELECT {dimension}_id FROM {alias_table} WHERE alias = ?", (value,))
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+    if not key:
+        return None
+    cursor.execute(f"SELECT id FROM {table} WHERE key = ?", (key,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def resolve_id(cursor, dimension: str, name: Optional[str],
+               cache: Optional[Dict[Tuple[str, str], Optional[int]]] = None) -> Optional[int]:
+    """
+    The id for a company or location name, creating the canonical row and recording the
+    spelling as an alias when they are new. Runs inside the caller's transaction; pass a dict
+    as cache to skip repeated lookups within a batch.
+    """
+    alias = normalize_text(name)
+    if cache is not None and (dimension, alias) in cache:
+        return cache[(dimension, alias)]
+    table, alias_table, _ = DIMENSIONS[dimension]
+    dimension_id = find_id(cursor, dimension, name)
+    key = dimension_key(dimension, name)
+    if dimension_id is None and key:
+        cursor.execute(f"INSERT INTO {table} (name, key) VALUES (?, ?)", (name.strip(), key))
+        dimension_id = cursor.lastrowid
+    if dimension_id is not None:
+        cursor.execute(f"INSERT OR IGNORE INTO {alias_table} (alias, {dimension}_id) VALUES (?, ?)",
+                       (alias, dimension_id))
+    if cache is not None:
+        cache[(dimension, alias)] = dimension_id
+    return dimension_id
+
+def backfill(cursor) -> int:
+    """Set company_id and location_id on every job missing them. Returns jobs updated."""
+    cache: Dict[Tuple[str, str], Optional[int]] = {}
+    cursor.execute("SELECT id, company, location FROM jobs WHERE company_id IS NULL OR location_id IS NULL")
+    rows = cursor.fetchall()
+    for job_id, company, location in rows:
+        cursor.execute(
+            "UPDATE jobs SET company_id = ?, location_id = ? WHERE id = ?",
+            (resolve_id(cursor, 'company', company, cache), resolve_id(cursor, 'location', location, cache), job_id)
+        )
+    return len(rows)
+
+def add_alias(conn: sqlite3.Connection, dimension: str, alias: str, canonical_name: str) -> int:
+    """
+    Map a spelling onto the row for canonical_name (created if needed). When the spelling
+    already had a row of its own, that row is merged in: its jobs and aliases move over.
+    Returns the canonical id.
+    """
+    table, alias_table, column = DIMENSIONS[dimension]
+    cursor = conn.cursor()
+    target = resolve_id(cursor, dimension, canonical_name)
+    if target is None:
+        raise ValueError(f"'{canonical_name}' is not a valid {dimension} name")
+    source = find_id(cursor, dimension, alias)
+    aliases = {normalize_text(alias), dimension_key(dimension, alias)}
+    if source is not None and source != target:
+        cursor.execute(f"UPDATE jobs SET {column} = ? WHERE {column} = ?", (target, source))
+        cursor.execute(f"UPDATE {alias_table} SET {dimension}_id = ? WHERE {dimension}_id = ?", (target, source))
+        # Other spellings of the merged row must keep finding the target once it is gone
+        cursor.execute(f"SELECT key FROM {table} WHERE id = ?", (source,))
+        aliases.add(cursor.fetchone()[0])
+        cursor.execute(f"DELETE FROM {table} WHERE id = ?", (source,))
+    cursor.executemany(f"INSERT OR REPLACE INTO {alias_table} (alias, {dimension}_id) VALUES (?, ?)",
+                       [(value, target) for value in aliases if value])
+    conn.commit()
+    return target
+
+def list_dimension(conn: sqlite3.Connection, dimension: str) -> List[Dict]:
+    """Every canonical row with its aliases and job count, most jobs first"""
+    table, alias_table, column = DIMENSIONS[dimension]
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT {table}.id, {table}.name,
+               (SELECT group_concat(alias, ' | ') FROM {alias_table} WHERE {dimension}_id = {table}.id),
+               (SELECT COUNT(*) FROM jobs WHERE {column} = {table}.id) AS jobs
+        FROM {table} ORDER BY jobs DESC, {table}.name
+    ''')
+    return [{'id': row[0], 'name': row[1], 'aliases': row[2], 'jobs': row[3]} for row in cursor.fetchall()]
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from schema import migrate
+
+    args = sys.argv[1:]
+    if len(args) < 2 or args[0] not in ('list', 'alias') or args[1] not in DIMENSIONS or (args[0] == 'alias' and len(args) < 4):
+        print(__doc__)
+        sys.exit(1)
+
+    default_db = os.path.join(DATA_DIR, 'linkedin_jobs.db')
+    db_path = (args[4] if len(args) > 4 else default_db) if args[0] == 'alias' else (args[2] if len(args) > 2 else default_db)
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+
+    if args[0] == 'alias':
+        dimension_id = add_alias(conn, args[1], args[2], args[3])
+        print(f"[DIMENSIONS] '{args[2]}' now resolves to {args[1]} {dimension_id} ('{args[3]}')")
+    else:
+        for row in list_dimension(conn, args[1]):
+            print(f"  {row['id']:5d}  {row['jobs']:5d} job(s)  {row['name']}  [{row['aliases']}]")
+    conn.close()
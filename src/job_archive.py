@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Job Archive Module
+Moves stale jobs (old, never liked, applied to or tailored for) out of the live database into
+an archive database next to it (data/linkedin_jobs_archive.db), attached for the move, so list
+queries, statistics, the search index and backups only carry jobs still in play. The archive
+keeps the job rows with their descriptions, documents and status history; jobs archived as
+searchable also go into the archive's own full-text index.
+
+After archiving, the freed pages are handed back to the filesystem with an incremental VACUUM
+(the first run switches the database to auto_vacuum=INCREMENTAL with one full VACUUM) and the
+query planner statistics are refreshed with ANALYZE.
+
+Archived jobs leave the live tables through the normal delete triggers, so the statistics
+counters drop them and the change feed reports them as deleted. A posting scraped again after
+it was archived comes back as a new job.
+
+Usage:
+    python job_archive.py archive [--days 90] [--not-searchable] [--no-compact] [db_path]
+    python job_archive.py compact [db_path]
+    python job_archive.py stats [db_path]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from description_codec import register_functions
+from job_rows import Job, fetch_jobs
+from search_index import FTS_RANK, sync_search_index
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+DEFAULT_ARCHIVE_DAYS = 90
+BATCH_SIZE = 1000
+
+# Tables moved to the archive, as (table, column holding the job id); every one of them is
+# created in the archive from the live table's columns
+ARCHIVED_TABLES = [
+    ('jobs', 'id'),
+    ('job_details', 'job_id'),
+    ('job_documents', 'job_id'),
+    ('job_status_history', 'job_id'),
+]
+
+# Jobs worth keeping live regardless of age
+STALE_CONDITION = '''
+    jobs.scraped_at < datetime('now', ?)
+    AND jobs.liked IS NOT 1 AND jobs.applied IS NOT 1
+    AND jobs.resume_created IS NOT 1 AND jobs.cover_letter_created IS NOT 1
+    AND NOT EXISTS (SELECT 1 FROM main.job_documents WHERE job_documents.job_id = jobs.id)
+'''
+
+def archive_path(db_path: str) -> str:
+    """data/linkedin_jobs.db -> data/linkedin_jobs_archive.db"""
+    return os.path.splitext(db_path)[0] + '_archive.db'
+
+def _table_columns(conn: sqlite3.Connection, schema: str, table: str) -> List[tuple]:
+    """(name, declared type, primary key position) per column"""
+    return [(row[1], row[2], row[5]) for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+def _ensure_archive_schema(conn: sqlite3.Connection):
+    """
+    Create the archive tables from the live ones, and add any column a later schema
+    migration gave the live table. Constraints, triggers and defaults are not copied.
+    """
+    for table, job_column in ARCHIVED_TABLES:
+        live = _table_columns(conn, 'main', table)
+        archived = {column[0] for column in _table_columns(conn, 'archive', table)}
+        if not archived:
+            definitions = [f"{name} {kind} PRIMARY KEY" if primary_key else f"{name} {kind}"
+                           for name, kind, primary_key in live]
+            if table == 'jobs':
+                definitions += ["archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP", "searchable BOOLEAN DEFAULT 0"]
+            conn.execute(f"CREATE TABLE archive.{table} ({', '.join(definitions)})")
+            if job_column != 'id' and not any(primary_key for name, _, primary_key in live if name == job_column):
+                conn.execute(f"CREATE INDEX archive.idx_{table}_{job_column} ON {table} ({job_column})")
+            continue
+        for name, kind, _ in live:
+            if name not in archived:
+                conn.execute(f"ALTER TABLE archive.{table} ADD COLUMN {name} {kind}")
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS archive.jobs_fts USING fts5(
+            title, company, location, description,
+            content='', tokenize='porter unicode61 remove_diacritics 2'
+        )
+    ''')
+    # Compressed descriptions need their dictionaries to be readable from the archive alone
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive.description_dictionaries (
+            id INTEGER PRIMARY KEY, dictionary BLOB NOT NULL, sample_count INTEGER, trained_at TIMESTAMP
+        )
+    ''')
+
+def attach_archive(conn: sqlite3.Connection, db_path: str):
+    """Attach (creating if needed) the archive database as schema 'archive'"""
+    conn.execute("ATTACH DATABASE ? AS archive", (archive_path(db_path),))
+    conn.execute("PRAGMA archive.journal_mode = WAL")
+    _ensure_archive_schema(conn)
+
+def archive_stale_jobs(conn: sqlite3.Connection, db_path: str, days: int = DEFAULT_ARCHIVE_DAYS,
+                       searchable: bool = True, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Move jobs scraped more than days ago that were never liked, applied to or tailored for
+    into the archive, batch_size jobs per transaction (conn is in autocommit meanwhile, and
+    back to its own isolation level afterwards). Returns the number of jobs moved.
+
+    The live database is in WAL mode, where a transaction spanning attached databases is atomic
+    per database only: a crash between the two commits can leave a batch in both, and the next
+    run moves it again (live rows always win on lookup).
+    """
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    moved = 0
+    try:
+        attach_archive(conn, db_path)
+        try:
+            while True:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    ids = [row[0] for row in conn.execute(
+                        f"SELECT id FROM main.jobs WHERE {STALE_CONDITION} ORDER BY id LIMIT ?",
+                        (f"-{days} days", batch_size)
+                    )]
+                    if not ids:
+                        conn.execute("COMMIT")
+                        break
+                    _move_batch(conn, ids, searchable)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                moved += len(ids)
+                print(f"[ARCHIVE] Moved {moved} job(s)...")
+        finally:
+            conn.execute("DETACH DATABASE archive")
+    finally:
+        conn.isolation_level = isolation_level
+    return moved
+
+def _move_batch(conn: sqlite3.Connection, ids: List[int], searchable: bool):
+    placeholders = ','.join('?' * len(ids))
+    conn.execute('''
+        INSERT OR IGNORE INTO archive.description_dictionaries (id, dictionary, sample_count, trained_at)
+        SELECT id, dictionary, sample_count, trained_at FROM main.description_dictionaries
+    ''')
+    # Rows left behind by an interrupted run are replaced; their index entries already exist
+    indexed = {row[0] for row in conn.execute(
+        f"SELECT id FROM archive.jobs WHERE searchable = 1 AND id IN ({placeholders})", ids
+    )}
+    for table, job_column in ARCHIVED_TABLES:
+        columns = ', '.join(column[0] for column in _table_columns(conn, 'main', table))
+        conn.execute(
+            f"INSERT OR REPLACE INTO archive.{table} ({columns}) "
+            f"SELECT {columns} FROM main.{table} WHERE {job_column} IN ({placeholders})", ids
+        )
+    pending = [job_id for job_id in ids if job_id not in indexed] if searchable else []
+    if pending:
+        conn.execute(f'''
+            INSERT INTO archive.jobs_fts (rowid, title, company, location, description)
+            SELECT jobs.id, jobs.title, jobs.company, jobs.location, description_text(job_details.description)
+            FROM main.jobs LEFT JOIN main.job_details ON job_details.job_id = jobs.id
+            WHERE jobs.id IN ({','.join('?' * len(pending))})
+        ''', pending)
+    searchable_ids = list(indexed) + pending
+    if searchable_ids:
+        conn.execute(f"UPDATE archive.jobs SET searchable = 1 WHERE id IN ({','.join('?' * len(searchable_ids))})",
+                     searchable_ids)
+    conn.execute(f"DELETE FROM main.job_status_history WHERE job_id IN ({placeholders})", ids)
+    # The jobs delete triggers clear details, documents, signatures and counters, and queue the
+    # search index entries for removal
+    conn.execute(f"DELETE FROM main.jobs WHERE id IN ({placeholders})", ids)
+    sync_search_index(conn)
+
+def database_size(conn: sqlite3.Connection) -> Dict[str, int]:
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return {
+        'bytes': page_size * conn.execute("PRAGMA page_count").fetchone()[0],
+        'free_bytes': page_size * conn.execute("PRAGMA freelist_count").fetchone()[0],
+    }
+
+def compact(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    Return free pages to the filesystem and refresh the planner statistics.
+    Must run outside a transaction. Returns the database size before and after, in bytes.
+    """
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        before = database_size(conn)['bytes']
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            # auto_vacuum only changes with a full VACUUM; after this one, incremental is enough
+            print("[ARCHIVE] Switching to auto_vacuum=INCREMENTAL (one full VACUUM)...")
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            # execute() steps a statement without result columns once, freeing a single page;
+            # executescript runs it to completion
+            conn.executescript("PRAGMA incremental_vacuum;")
+        conn.execute("ANALYZE")
+        # Freed pages only leave the file once the WAL is checkpointed into it
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {'before': before, 'after': database_size(conn)['bytes']}
+    finally:
+        conn.isolation_level = isolation_level
+
+def _open_archive(db_path: str) -> Optional[sqlite3.Connection]:
+    path = archive_path(db_path)
+    if not os.path.exists(path):
+        return None
+    conn = register_functions(sqlite3.connect(f"file:{path}?mode=ro", uri=True))
+    conn.execute("PRAGMA busy_timeout = 5000")
+    return conn
+
+def get_archived_job(db_path: str, job_id: int, columns: str = "jobs.*") -> Optional[Job]:
+    """An archived job with its description, or None when it was never archived"""
+    conn = _open_archive(db_path)
+    if conn is None:
+        return None
+    try:
+        jobs = fetch_jobs(conn, f'''
+            SELECT {columns}, description_text(job_details.description) AS description
+            FROM jobs LEFT JOIN job_details ON job_details.job_id = jobs.id
+            WHERE jobs.id = ?
+        ''', (job_id,))
+    finally:
+        conn.close()
+    return jobs[0] if jobs else None
+
+def search_archive(db_path: str, match: str, columns: str = "jobs.*", limit: int = 50) -> List[Job]:
+    """Archived searchable jobs matching an FTS5 expression (search_index.build_match_query), best first"""
+    conn = _open_archive(db_path)
+    if conn is None:
+        return []
+    try:
+        return fetch_jobs(conn, f'''
+            SELECT {columns} FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+            WHERE jobs_fts MATCH ? ORDER BY {FTS_RANK} LIMIT ?
+        ''', (match, limit))
+    finally:
+        conn.close()
+
+def get_archive_stats(conn: sqlite3.Connection, db_path: str) -> Dict[str, Any]:
+    """Live vs archived job counts and file sizes"""
+    stats = {
+        'live_jobs': conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0],
+        'live_bytes': database_size(conn)['bytes'],
+        'archived_jobs': 0,
+        'searchable_jobs': 0,
+        'archive_bytes': 0,
+    }
+    archive = _open_archive(db_path)
+    if archive is not None:
+        try:
+            if archive.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs'").fetchone():
+                stats['archived_jobs'], stats['searchable_jobs'] = archive.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(searchable), 0) FROM jobs"
+                ).fetchone()
+            stats['archive_bytes'] = database_size(archive)['bytes']
+        finally:
+            archive.close()
+    return stats
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from schema import migrate
+
+    parser = argparse.ArgumentParser(description="Archive stale jobs and compact the database")
+    parser.add_argument("command", choices=["archive", "compact", "stats"])
+    parser.add_argument("db_path", nargs="?", default=os.path.join(DATA_DIR, 'linkedin_jobs.db'))
+    parser.add_argument("--days", type=int, default=DEFAULT_ARCHIVE_DAYS, help="archive jobs scraped longer ago")
+    parser.add_argument("--not-searchable", action="store_true", help="leave archived jobs out of the archive search index")
+    parser.add_argument("--no-compact", action="store_true", help="skip VACUUM and ANALYZE after archiving")
+    args = parser.parse_intermixed_args()
+
+    conn = register_functions(sqlite3.connect(args.db_path))
+    conn.execute("PRAGMA busy_timeout = 5000")
+    migrate(conn)
+
+    if args.command == 'archive':
+        started = time.perf_counter()
+        moved = archive_stale_jobs(conn, args.db_path, args.days, not args.not_searchable)
+        print(f"[ARCHIVE] Archived {moved} job(s) scraped more than {args.days} days ago "
+              f"in {time.perf_counter() - started:.2f}s -> {archive_path(args.db_path)}")
+    if args.command == 'compact' or (args.command == 'archive' and not args.no_compact):
+        sizes = compact(conn)
+        print(f"[ARCHIVE] Compacted: {sizes['before'] / 1024 / 1024:.2f} MB -> {sizes['after'] / 1024 / 1024:.2f} MB")
+
+    stats = get_archive_stats(conn, args.db_path)
+    print(f"[ARCHIVE] Live: {stats['live_jobs']} job(s), {stats['live_bytes'] / 1024 / 1024:.2f} MB; "
+          f"archived: {stats['archived_jobs']} job(s) ({stats['searchable_jobs']} searchable), "
+          f"{stats['archive_bytes'] / 1024 / 1024:.2f} MB")
+    conn.close()
@@ -4,105 +4,101 @@ LinkedIn Job Browser - Console Interface
 Interactive console application to browse and manage scraped LinkedIn jobs.
 """
 
-import sqlite3
 import os
 import sys
 from datetime import datetime
 
+from linkedin_db import LinkedInJobsDB
+from storage import is_postgres, database_url
+
 DB_PATH = '/home/monsoon/Desktop/LinkedIn Scraper FRFR/data/linkedin_jobs.db'
 
 class JobBrowser:
     def __init__(self, db_path=DB_PATH):
-        self.db_path = db_path
+        # JOBS_DATABASE_URL points the browser at the shared PostgreSQL store instead
+        self.db_path = database_url(None) if is_postgres(database_url(None)) else db_path
         self.current_job_id = None
         self.total_jobs = 0
         
     def connect_db(self):
-        """Connect to the SQLite database"""
+        """Open the jobs store (SQLite file or PostgreSQL)"""
         try:
-            if not os.path.exists(self.db_path):
+            if not is_postgres(self.db_path) and not os.path.exists(self.db_path):
                 print(f"[ERROR] Database file '{self.db_path}' not found!")
                 print("Please run the scraper first to create the database.")
                 return None
                 
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # This allows column access by name
-            return conn
+            db = LinkedInJobsDB(self.db_path)
+            return db if db.connect() else None
         except Exception as e:
             print(f"[ERROR] Failed to connect to database: {e}")
             return None
     
     def get_total_jobs(self):
         """Get total number of jobs in database"""
-        conn = self.connect_db()
-        if not conn:
+        db = self.connect_db()
+        if not db:
             return 0
             
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM jobs")
-            count = cursor.fetchone()[0]
-            conn.close()
-            return count
-        except Exception as e:
-            print(f"[ERROR] Failed to get job count: {e}")
-            conn.close()
-            return 0
+            return db.get_statistics().get('total_jobs', 0)
+        finally:
+            db.disconnect()
     
     def get_job(self, job_id):
         """Get a specific job by ID"""
-        conn = self.connect_db()
-        if not conn:
+        db = self.connect_db()
+        if not db:
             return None
             
         try:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-            job = cursor.fetchone()
-            conn.close()
-            return job
-        except Exception as e:
-            print(f"[ERROR] Failed to get job {job_id}: {e}")
-            conn.close()
-            return None
+            return db.get_job_by_id(job_id)
+        finally:
+            db.disconnect()
     
     def get_all_jobs(self, limit=None):
-        """Get all jobs with optional limit"""
-        conn = self.connect_db()
-        if not conn:
+        """Get all jobs with optional limit, newest first"""
+        db = self.connect_db()
+        if not db:
             return []
             
         try:
-            cursor = conn.cursor()
-            if limit:
-                cursor.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
-            else:
-                cursor.execute("SELECT * FROM jobs ORDER BY id DESC")
-            jobs = cursor.fetchall()
-            conn.close()
-            return jobs
-        except Exception as e:
-            print(f"[ERROR] Failed to get jobs: {e}")
-            conn.close()
-            return []
+            return db.get_jobs(limit=limit)
+        finally:
+            db.disconnect()
+    
+    def iter_all_jobs(self, limit=None):
+        """Yield jobs newest first as the store reads them, without holding the whole list"""
+        db = self.connect_db()
+        if not db:
+            return
+            
+        try:
+            yield from db.iter_jobs(limit=limit)
+        finally:
+            db.disconnect()
+    
+    def get_jobs_page(self, limit=25, cursor=None):
+        """Get one page of jobs, newest first, and the cursor for the next page (None at the end)"""
+        db = self.connect_db()
+        if not db:
+            return [], None
+            
+        try:
+            return db.get_jobs_page(limit, cursor)
+        finally:
+            db.disconnect()
     
     def search_jobs(self, query, field='title'):
-        """Search jobs by field"""
-        conn = self.connect_db()
-        if not conn:
+        """Search jobs by field (indexed fields best matches first)"""
+        db = self.connect_db()
+        if not db:
             return []
             
         try:
-            cursor = conn.cursor()
-            search_query = f"SELECT * FROM jobs WHERE {field} LIKE ? ORDER BY id DESC"
-            cursor.execute(search_query, (f'%{query}%',))
-            jobs = cursor.fetchall()
-            conn.close()
-            return jobs
-        except Exception as e:
-            print(f"[ERROR] Failed to search jobs: {e}")
-            conn.close()
-            return []
+            return db.search_jobs(query, field=field)
+        finally:
+            db.disconnect()
     
     def display_job(self, job):
         """Display a single job in a formatted way"""
@@ -170,15 +166,19 @@ class JobBrowser:
         print("-" * 120)
         
         for job in jobs:
-            # Basic job info
-            print(f"ID: {job['id']:3d} | {job['title'][:40]:<40} | {job['company'][:20]:<20} | {job['location'][:15]:<15}")
-            
-            # Show search info if available
-            if show_details and 'search_keywords' in job and job['search_keywords']:
-                print(f"     Search: '{job['search_keywords']}' in {job.get('search_location', 'Unknown')} ({job.get('search_date_posted', 'Any Time')})")
-                print(f"     URL: {job['url']}")
-                print(f"     Scraped: {job['scraped_at']}")
-                print("-" * 120)
+            self.display_job_row(job, show_details)
+    
+    def display_job_row(self, job, show_details=False):
+        """Display one line of a job list"""
+        # Basic job info
+        print(f"ID: {job['id']:3d} | {job['title'][:40]:<40} | {job['company'][:20]:<20} | {job['location'][:15]:<15}")
+        
+        # Show search info if available
+        if show_details and 'search_keywords' in job and job['search_keywords']:
+            print(f"     Search: '{job['search_keywords']}' in {job.get('search_location', 'Unknown')} ({job.get('search_date_posted', 'Any Time')})")
+            print(f"     URL: {job['url']}")
+            print(f"     Scraped: {job['scraped_at']}")
+            print("-" * 120)
     
     def browse_jobs(self):
         """Interactive job browser"""
@@ -277,13 +277,17 @@ class JobBrowser:
         else:
             print(f"No jobs found matching '{query}' in {field}.")
     
-    def list_all_jobs(self):
-        """List all jobs in the database"""
-        jobs = self.get_all_jobs()
-        if jobs:
-            self.display_job_list(jobs, show_details=True)
-        else:
+    def list_all_jobs(self, page_size=25):
+        """List all jobs in the database, one page at a time"""
+        jobs, cursor = self.get_jobs_page(page_size)
+        if not jobs:
             print("No jobs found in database.")
+            return
+        while True:
+            self.display_job_list(jobs, show_details=True)
+            if not cursor or input("\nShow more? (y/n): ").strip().lower() != 'y':
+                break
+            jobs, cursor = self.get_jobs_page(page_size, cursor)
     
     def list_recent_jobs(self):
         """List recent jobs (last 10)"""
@@ -296,62 +300,42 @@ class JobBrowser:
     
     def show_statistics(self):
         """Show database statistics including search information"""
-        conn = self.connect_db()
-        if not conn:
+        db = self.connect_db()
+        if not db:
             return
             
         try:
-            cursor = conn.cursor()
-            
-            # Basic stats
-            cursor.execute("SELECT COUNT(*) FROM jobs")
-            total_jobs = cursor.fetchone()[0]
-            
-            # Search statistics
-            cursor.execute("SELECT DISTINCT search_keywords FROM jobs WHERE search_keywords IS NOT NULL")
-            keywords = [row[0] for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT DISTINCT search_location FROM jobs WHERE search_location IS NOT NULL")
-            locations = [row[0] for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT DISTINCT search_date_posted FROM jobs WHERE search_date_posted IS NOT NULL")
-            date_filters = [row[0] for row in cursor.fetchall()]
+            stats = db.get_statistics()
+            if not stats:
+                return
+            search_counts = stats['search_counts']
             
             print("\n=== Database Statistics ===")
-            print(f"Total jobs: {total_jobs}")
+            print(f"Total jobs: {stats['total_jobs']}")
             
-            if keywords:
+            if search_counts['search_keywords']:
                 print(f"\nSearch Keywords Used:")
-                for keyword in keywords:
-                    cursor.execute("SELECT COUNT(*) FROM jobs WHERE search_keywords = ?", (keyword,))
-                    count = cursor.fetchone()[0]
+                for keyword, count in search_counts['search_keywords'].items():
                     print(f"  '{keyword}': {count} jobs")
             
-            if locations:
+            if search_counts['search_location']:
                 print(f"\nSearch Locations Used:")
-                for location in locations:
-                    cursor.execute("SELECT COUNT(*) FROM jobs WHERE search_location = ?", (location,))
-                    count = cursor.fetchone()[0]
+                for location, count in search_counts['search_location'].items():
                     print(f"  '{location}': {count} jobs")
             
-            if date_filters:
+            if search_counts['search_date_posted']:
                 print(f"\nDate Filters Used:")
-                for date_filter in date_filters:
-                    cursor.execute("SELECT COUNT(*) FROM jobs WHERE search_date_posted = ?", (date_filter,))
-                    count = cursor.fetchone()[0]
+                for date_filter, count in search_counts['search_date_posted'].items():
                     print(f"  '{date_filter}': {count} jobs")
             
             # Recent activity
-            cursor.execute("SELECT scraped_at FROM jobs ORDER BY scraped_at DESC LIMIT 1")
-            latest = cursor.fetchone()
-            if latest:
-                print(f"\nLatest scrape: {latest[0]}")
-            
-            conn.close()
+            if stats['latest_scrape']:
+                print(f"\nLatest scrape: {stats['latest_scrape']}")
             
         except Exception as e:
             print(f"[ERROR] Failed to get statistics: {e}")
-            conn.close()
+        finally:
+            db.disconnect()
 
 def main():
     """Main function"""
@@ -361,7 +345,7 @@ def main():
     browser = JobBrowser()
     
     # Check if database exists
-    if not os.path.exists(DB_PATH):
+    if not is_postgres(browser.db_path) and not os.path.exists(browser.db_path):
         print("Database not found. Please run the scraper first to create the database.")
         return
     
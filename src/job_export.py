@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Columnar Export Module
+Exports the jobs table to Parquet or Arrow IPC files for analytics (pandas, DuckDB, Polars),
+so aggregate queries read compressed, typed columns instead of scanning the live database.
+Rows are read in id-ordered chunks, each its own short read transaction, so the scraper and
+the API keep writing while an export runs. Files are partitioned by scrape date:
+
+    data/exports/<format>/scraped_date=2024-05-01/part-0000000001-0000010000.parquet
+
+Exports are incremental: the last exported job id is kept in _export_state.json next to the
+files, and the next run only appends newer jobs. Later edits to exported jobs (likes, status,
+notes) are not picked up; run with --full to rewrite the export from scratch. Requires the
+optional pyarrow package.
+
+Usage:
+    python job_export.py [--format parquet|arrow] [--full] [--no-descriptions] [db_path]
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+EXPORT_DIR = os.path.join(DATA_DIR, 'exports')
+
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+STATE_FILE = '_export_state.json'
+CHUNK_SIZE = 10000
+COMPRESSION = 'zstd'
+
+# Exported columns in file order, as (column, arrow type); flags become booleans and
+# scraped_at a timestamp instead of SQLite's loosely typed values
+EXPORT_COLUMNS = [
+    ('id', 'int64'),
+    ('title', 'string'),
+    ('company', 'string'),
+    ('company_id', 'int64'),
+    ('location', 'string'),
+    ('location_id', 'int64'),
+    ('url', 'string'),
+    ('search_keywords', 'string'),
+    ('search_location', 'string'),
+    ('search_date_posted', 'string'),
+    ('search_experience_level', 'string'),
+    ('search_job_type', 'string'),
+    ('search_work_model', 'string'),
+    ('scraped_at', 'timestamp'),
+    ('status', 'string'),
+    ('liked', 'bool'),
+    ('applied', 'bool'),
+    ('disliked', 'bool'),
+    ('resume_created', 'bool'),
+    ('cover_letter_created', 'bool'),
+    ('description_pending', 'bool'),
+    ('salary_min', 'float64'),
+    ('salary_max', 'float64'),
+    ('salary_currency', 'string'),
+    ('job_type', 'string'),
+    ('experience_level', 'string'),
+    ('work_model', 'string'),
+    ('notes', 'string'),
+    ('fingerprint', 'string'),
+]
+DESCRIPTION_COLUMN = ('description', 'string')
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise RuntimeError("pyarrow is required for columnar exports (pip install pyarrow)")
+
+def export_columns(include_descriptions: bool = True) -> List[Tuple[str, str]]:
+    return EXPORT_COLUMNS + ([DESCRIPTION_COLUMN] if include_descriptions else [])
+
+def arrow_schema(include_descriptions: bool = True):
+    """The pyarrow schema every export file is written with"""
+    _require_pyarrow()
+    types = {
+        'int64': pyarrow.int64(),
+        'float64': pyarrow.float64(),
+        'bool': pyarrow.bool_(),
+        'string': pyarrow.string(),
+        'timestamp': pyarrow.timestamp('s'),
+    }
+    return pyarrow.schema([(name, types[kind]) for name, kind in export_columns(include_descriptions)])
+
+def _select_sql(include_descriptions: bool) -> str:
+    selected = []
+    for name, kind in EXPORT_COLUMNS:
+        if kind == 'timestamp':
+            selected.append(f"datetime(jobs.{name}) AS {name}")
+        else:
+            selected.append(f"jobs.{name}")
+    joins = ""
+    if include_descriptions:
+        selected.append("description_text(job_details.description) AS description")
+        joins = "LEFT JOIN job_details ON job_details.job_id = jobs.id"
+    return f'''
+        SELECT {', '.join(selected)} FROM jobs {joins}
+        WHERE jobs.id > ? ORDER BY jobs.id LIMIT ?
+    '''
+
+def iter_chunks(conn: sqlite3.Connection, since_id: int = 0, chunk_size: int = CHUNK_SIZE,
+                include_descriptions: bool = True) -> Iterator[List[tuple]]:
+    """Jobs with id > since_id as lists of tuples in EXPORT_COLUMNS order, chunk_size rows at a time"""
+    sql = _select_sql(include_descriptions)
+    last_id = since_id
+    while True:
+        cursor = conn.cursor()
+        cursor.row_factory = None  # plain tuples; the pool's connections default to sqlite3.Row
+        rows = cursor.execute(sql, (last_id, chunk_size)).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+        if len(rows) < chunk_size:
+            return
+
+def to_record_batch(rows: List[tuple], schema):
+    """Column-wise conversion of SQLite rows into a typed record batch"""
+    arrays = []
+    for position, field in enumerate(schema):
+        values = [row[position] for row in rows]
+        if pyarrow.types.is_boolean(field.type):
+            arrays.append(pyarrow.array(values, type=pyarrow.int64()).cast(pyarrow.bool_()))
+        elif pyarrow.types.is_timestamp(field.type):
+            arrays.append(pyarrow.array(values, type=pyarrow.string()).cast(field.type))
+        elif pyarrow.types.is_string(field.type):
+            arrays.append(pyarrow.array([None if value is None else str(value) for value in values],
+                                        type=field.type))
+        else:
+            arrays.append(pyarrow.array(values, type=field.type))
+    return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+def _write_file(path: str, batch, fmt: str):
+    """Write one partition file atomically (readers never see a half-written file)"""
+    temp_path = path + '.tmp'
+    if fmt == 'parquet':
+        pyarrow.parquet.write_table(pyarrow.Table.from_batches([batch]), temp_path, compression=COMPRESSION)
+    else:
+        options = pyarrow.ipc.IpcWriteOptions(compression=COMPRESSION)
+        with pyarrow.ipc.new_file(temp_path, batch.schema, options=options) as writer:
+            writer.write_batch(batch)
+    os.replace(temp_path, path)
+
+def load_state(export_dir: str) -> Dict[str, Any]:
+    path = os.path.join(export_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {'last_id': 0}
+    with open(path) as f:
+        return json.load(f)
+
+def _save_state(export_dir: str, state: Dict[str, Any]):
+    path = os.path.join(export_dir, STATE_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+def export_jobs(conn: sqlite3.Connection, fmt: str = 'parquet', export_root: str = EXPORT_DIR,
+                full: bool = False, include_descriptions: bool = True,
+                chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Append jobs added since the last export to the partitioned files under export_root/<fmt>.
+    With full, the existing export is deleted and everything is written again. The state is
+    saved after every chunk, so an interrupted export resumes where it stopped.
+    Returns a summary (rows, files written, last id).
+    """
+    _require_pyarrow()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of: {', '.join(FORMATS)})")
+    export_dir = os.path.join(export_root, fmt)
+    if full and os.path.isdir(export_dir):
+        shutil.rmtree(export_dir)
+    os.makedirs(export_dir, exist_ok=True)
+
+    state = load_state(export_dir)
+    if state.get('last_id') and state.get('descriptions', True) != include_descriptions:
+        raise ValueError("The existing export was written with a different column set; rerun with full=True")
+    schema = arrow_schema(include_descriptions)
+    date_position = schema.get_field_index('scraped_at')
+    rows_written, files = 0, []
+
+    for rows in iter_chunks(conn, state['last_id'], chunk_size, include_descriptions):
+        # Rows arrive in id order; ids and scrape dates rise together, so a chunk usually
+        # lands in one or two partitions
+        by_date = sorted(rows, key=lambda row: (row[date_position] or '')[:10])
+        for scraped_date, group in groupby(by_date, key=lambda row: (row[date_position] or '')[:10]):
+            group = list(group)
+            partition = os.path.join(export_dir, f"scraped_date={scraped_date or 'unknown'}")
+            os.makedirs(partition, exist_ok=True)
+            path = os.path.join(partition, f"part-{group[0][0]:010d}-{group[-1][0]:010d}{FORMATS[fmt]}")
+            _write_file(path, to_record_batch(group, schema), fmt)
+            files.append(os.path.relpath(path, export_root))
+        rows_written += len(rows)
+        state = {'last_id': rows[-1][0], 'descriptions': include_descriptions,
+                 'exported_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+        _save_state(export_dir, state)
+
+    return {'format': fmt, 'path': export_dir, 'rows': rows_written, 'files': files, 'last_id': state['last_id']}
+
+def arrow_stream(conn: sqlite3.Connection, since_id: int = 0, include_descriptions: bool = True,
+                 chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    The jobs with id > since_id as an Arrow IPC stream, yielded one record batch at a time,
+    so an HTTP response can send a large table without building it in memory
+    (pyarrow.ipc.open_stream / pandas read it back).
+    """
+    _require_pyarrow()
+    schema = arrow_schema(include_descriptions)
+    sink = io.BytesIO()
+    options = pyarrow.ipc.IpcWriteOptions(compression=COMPRESSION)
+    writer = pyarrow.ipc.new_stream(sink, schema, options=options)
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    for rows in iter_chunks(conn, since_id, chunk_size, include_descriptions):
+        writer.write_batch(to_record_batch(rows, schema))
+        yield drain()
+    writer.close()
+    yield drain()
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from schema import migrate
+    from description_codec import register_functions
+
+    parser = argparse.ArgumentParser(description="Export jobs to partitioned Parquet/Arrow files")
+    parser.add_argument("db_path", nargs="?", default=os.path.join(DATA_DIR, 'linkedin_jobs.db'))
+    parser.add_argument("--format", choices=list(FORMATS), default='parquet')
+    parser.add_argument("--full", action="store_true", help="rewrite the export instead of appending new jobs")
+    parser.add_argument("--no-descriptions", action="store_true", help="leave out the description column")
+    parser.add_argument("--output", default=EXPORT_DIR, help="export root directory")
+    args = parser.parse_args()
+
+    conn = register_functions(sqlite3.connect(args.db_path))
+    migrate(conn)
+    started = time.perf_counter()
+    summary = export_jobs(conn, args.format, args.output, args.full, not args.no_descriptions)
+    conn.close()
+
+    if summary['rows']:
+        print(f"[EXPORT] Wrote {summary['rows']} job(s) to {len(summary['files'])} {args.format} file(s) "
+              f"in {time.perf_counter() - started:.2f}s; last exported id {summary['last_id']}")
+    else:
+        print(f"[EXPORT] Nothing new since job {summary['last_id']}")
+    print(f"[EXPORT] {summary['path']}")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Job Fingerprint Module
+Canonical identity for a job posting, stored in jobs.fingerprint (uniquely indexed) so every
+duplicate check is a single index probe regardless of which URL the job was scraped from.
+"""
+
+import hashlib
+import re
+import urllib.parse
+from typing import Optional
+
+from job_triage import normalize_company, normalize_text
+
+# /jobs/view/3812345678/ or /jobs/view/senior-engineer-at-acme-3812345678
+JOB_VIEW_ID_PATTERN = re.compile(r"/jobs/view/(?:[^/?#]*-)?(\d{6,})")
+
+def extract_linkedin_job_id(url: Optional[str]) -> Optional[str]:
+    """The LinkedIn job id in a URL, from currentJobId (search pages) or a /jobs/view/ path"""
+    if not url:
+        return None
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+    for job_id in query.get('currentJobId', []):
+        if job_id.isdigit():
+            return job_id
+    match = JOB_VIEW_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+def canonical_job_url(url: Optional[str]) -> Optional[str]:
+    """The tracking-free /jobs/view/<id>/ URL for a LinkedIn job, or the URL unchanged"""
+    job_id = extract_linkedin_job_id(url)
+    return f"https://www.linkedin.com/jobs/view/{job_id}/" if job_id else url
+
+def job_fingerprint(title: Optional[str], company: Optional[str], location: Optional[str] = None,
+                    url: Optional[str] = None) -> str:
+    """
+    'li:<job id>' when the URL carries a LinkedIn job id, otherwise 'h:' plus a hash of the
+    normalized title, company and location.
+    """
+    job_id = extract_linkedin_job_id(url)
+    if job_id:
+        return f"li:{job_id}"
+    key = "|".join((normalize_text(title), normalize_company(company), normalize_text(location)))
+    return "h:" + hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
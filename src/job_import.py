@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Bulk Job Import Module
+Loads the scraper's old data/linkedin_jobs.json and linkedin_jobs.csv outputs (from past runs or
+other copies of the database) into the jobs table. Files are streamed record by record, plain
+or gzip-compressed, and written through LinkedInJobsDB.save_jobs in large transactions, so
+imported rows get the same canonical URLs, fingerprint dedup and company/location resolution
+as freshly scraped ones. Near-duplicate clustering (MinHash) is the slow part of saving a
+job, so it is left for afterwards (near_duplicates.py index) unless --index-duplicates is given.
+
+Accepted files: JSON arrays (the scraper's format), JSON Lines, and CSV with a header row,
+each optionally gzipped. Directories are searched for *.json, *.jsonl, *.ndjson and *.csv
+(plus .gz) files.
+
+Usage:
+    python job_import.py <file or directory>... [--db db_path or URL] [--batch-size 5000] [--index-duplicates]
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from linkedin_db import LinkedInJobsDB, _chunked
+from storage import database_url, is_postgres, redact
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+BATCH_SIZE = 5000             # rows per transaction
+READ_SIZE = 1 << 20           # characters read from a JSON file at a time
+MAX_RECORD_SIZE = 64 << 20    # a JSON value this long is taken as a malformed file
+IMPORT_EXTENSIONS = ('.json', '.jsonl', '.ndjson', '.csv')
+
+# Fields save_jobs reads; anything else in an old record is ignored
+IMPORT_FIELDS = (
+    'title', 'company', 'location', 'description', 'url',
+    'search_keywords', 'search_location', 'search_date_posted',
+    'search_experience_level', 'search_job_type', 'search_work_model',
+    'experience_level', 'job_type', 'work_model', 'description_pending',
+)
+TRUE_VALUES = {'1', 'true', 'yes'}
+
+_WHITESPACE = re.compile(r'\s*')
+
+def open_text(path: str) -> TextIO:
+    """Open a file for reading as UTF-8 text, decompressing it if it is gzipped"""
+    with open(path, 'rb') as f:
+        gzipped = f.read(2) == b'\x1f\x8b'
+    if gzipped:
+        return gzip.open(path, 'rt', encoding='utf-8-sig', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+def _format(path: str) -> str:
+    name = path[:-3] if path.lower().endswith('.gz') else path
+    return 'csv' if name.lower().endswith('.csv') else 'json'
+
+def iter_json_records(stream: TextIO, read_size: int = READ_SIZE) -> Iterator[Any]:
+    """
+    Yield the values of a JSON array, or of a sequence of JSON values (JSON Lines), one at
+    a time while reading the file in read_size pieces; only the current piece is in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+    in_array = None
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        data = stream.read(read_size)
+        if not data:
+            eof = True
+            return False
+        buffer = buffer[position:] + data
+        position = 0
+        return True
+
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position >= len(buffer):
+            if eof or not fill():
+                return
+            continue
+        if in_array is None:
+            in_array = buffer[position] == '['
+            if in_array:
+                position += 1
+            continue
+        if in_array and buffer[position] in ',]':
+            position += 1
+            continue
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Most likely the value runs past the end of what has been read so far
+            if eof or len(buffer) - position > MAX_RECORD_SIZE or not fill():
+                raise
+            continue
+        if not eof and isinstance(value, (int, float)) and (end == len(buffer) or buffer[end] in '.eE'):
+            # A number cut off mid-digits ("12" of "123", "3" of "3.5") also decodes; read on first
+            fill()
+            continue
+        position = end
+        yield value
+
+def iter_csv_records(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield the rows of a CSV file with a header row"""
+    # Full descriptions can exceed csv's default 128 KB field limit
+    csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+    yield from csv.DictReader(stream)
+
+def normalize_record(record: Any) -> Optional[Dict[str, Any]]:
+    """
+    The fields save_jobs reads from one old record: strings stripped, empty strings (CSV's
+    missing values) as None, description_pending as 0/1. None for anything that is not an object.
+    """
+    if not isinstance(record, dict):
+        return None
+    job = {}
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            value = value.strip() or None
+        if value is not None:
+            job[field] = value
+    pending = job.get('description_pending')
+    if pending is not None:
+        job['description_pending'] = 1 if str(pending).strip().lower() in TRUE_VALUES else 0
+    return job
+
+def iter_file_records(path: str) -> Iterator[Optional[Dict[str, Any]]]:
+    """Normalized records of one JSON or CSV file (None for records that are not objects)"""
+    with open_text(path) as stream:
+        records = iter_csv_records(stream) if _format(path) == 'csv' else iter_json_records(stream)
+        for record in records:
+            yield normalize_record(record)
+
+def find_files(paths: List[str]) -> List[str]:
+    """Expand directories into the importable files they contain"""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for root, _, names in os.walk(path):
+            for name in sorted(names):
+                lowered = name.lower()
+                if lowered.endswith('.gz'):
+                    lowered = lowered[:-3]
+                if lowered.endswith(IMPORT_EXTENSIONS):
+                    files.append(os.path.join(root, name))
+    return files
+
+def import_file(db: LinkedInJobsDB, path: str, batch_size: int = BATCH_SIZE,
+                index_duplicates: bool = False) -> Dict[str, int]:
+    """
+    Import one file, batch_size rows per transaction. Batches already committed stay in
+    the database if the file turns out to be malformed further on.
+    Returns counts of inserted, updated, duplicate and invalid rows.
+    """
+    counts = {'inserted': 0, 'updated': 0, 'duplicate': 0, 'invalid': 0}
+    for batch in _chunked(iter_file_records(path), batch_size):
+        invalid = sum(1 for job in batch if job is None)
+        counts['invalid'] += invalid
+        if invalid:
+            batch = [job for job in batch if job is not None]
+        for outcome, _ in db.save_jobs(batch, index_duplicates=index_duplicates):
+            counts[outcome] += 1
+    return counts
+
+def import_files(paths: List[str], db_path: Optional[str] = None, batch_size: int = BATCH_SIZE,
+                 index_duplicates: bool = False) -> Dict[str, int]:
+    """Import every file under paths into the database. Returns the combined counts."""
+    db = LinkedInJobsDB(db_path)
+    if not db.connect():
+        raise RuntimeError(f"Could not open {redact(db.db_path)}")
+    totals = {'inserted': 0, 'updated': 0, 'duplicate': 0, 'invalid': 0, 'files': 0, 'failed_files': 0}
+    try:
+        db.create_tables()
+        for path in find_files(paths):
+            started = time.perf_counter()
+            print(f"[IMPORT] {path}")
+            try:
+                counts = import_file(db, path, batch_size, index_duplicates)
+            except (OSError, ValueError, csv.Error) as e:
+                # json.JSONDecodeError and UnicodeDecodeError are ValueErrors
+                print(f"[IMPORT ERROR] {path}: {e}")
+                totals['failed_files'] += 1
+                continue
+            elapsed = time.perf_counter() - started
+            rows = sum(counts.values())
+            print(f"[IMPORT] {rows} row(s) in {elapsed:.1f}s ({rows / elapsed * 60 if elapsed else 0:,.0f}/min): "
+                  f"{counts['inserted']} inserted, {counts['updated']} updated, "
+                  f"{counts['duplicate']} duplicate, {counts['invalid']} invalid")
+            for outcome, count in counts.items():
+                totals[outcome] += count
+            totals['files'] += 1
+    finally:
+        db.disconnect()
+    return totals
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import old scraper JSON/CSV outputs into the jobs database")
+    parser.add_argument("paths", nargs="+", help="files (optionally .gz) or directories to import")
+    parser.add_argument("--db", default=None,
+                        help="SQLite file or postgresql:// URL (default: JOBS_DATABASE_URL or data/linkedin_jobs.db)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per transaction")
+    parser.add_argument("--index-duplicates", action="store_true",
+                        help="cluster near-duplicate postings during the import (much slower)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    totals = import_files(args.paths, args.db, args.batch_size, args.index_duplicates)
+    print(f"\n[IMPORT] {totals['files']} file(s) in {time.perf_counter() - started:.1f}s: "
+          f"{totals['inserted']} inserted, {totals['updated']} updated, "
+          f"{totals['duplicate']} duplicate, {totals['invalid']} invalid"
+          + (f", {totals['failed_files']} file(s) failed" if totals['failed_files'] else ""))
+    # Near-duplicate clustering only exists in the SQLite store
+    if totals['inserted'] + totals['updated'] and not args.index_duplicates and not is_postgres(database_url(args.db)):
+        print("[IMPORT] Run 'python src/near_duplicates.py index' to cluster the imported postings")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Job Row Module
+Compact row type for bulk job reads. A Job holds the tuple SQLite returned plus a column index
+shared by every row of the query, instead of a dict per row, and converts to a dict only when
+it is serialized (to_dict, or the API's JSON provider).
+"""
+
+import sqlite3
+from typing import Any, Dict, Iterator, List, Sequence
+
+def column_index(description: Sequence[Sequence[Any]]) -> Dict[str, int]:
+    """Column name -> position for a cursor.description"""
+    return {column[0]: position for position, column in enumerate(description)}
+
+class Job:
+    """
+    One row of a job query. Reads like the dicts it replaces (job['title'], job.get('url'),
+    'notes' in job, dict(job)) and also by attribute (job.title). Assigning to an existing
+    column copies the values once; new keys are not supported.
+    """
+
+    __slots__ = ('_index', '_values')
+
+    def __init__(self, index: Dict[str, int], values: Sequence[Any]):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._values[key]
+        return self._values[self._index[key]]
+
+    def __setitem__(self, key: str, value: Any):
+        if not isinstance(self._values, list):
+            self._values = list(self._values)
+        self._values[self._index[key]] = value
+
+    def __getattr__(self, name: str):
+        try:
+            return self._values[self._index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Job):
+            return self.to_dict() == other.to_dict()
+        return isinstance(other, dict) and self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"Job({self.to_dict()!r})"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._index.get(key)
+        return default if position is None else self._values[position]
+
+    def keys(self):
+        return self._index.keys()
+
+    def values(self) -> List[Any]:
+        return list(self._values)
+
+    def items(self):
+        return zip(self._index, self._values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._index, self._values))
+
+def fetch_jobs(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> List[Job]:
+    """Run a query and return its rows as Jobs (one column index for the whole result)"""
+    cursor = conn.cursor()
+    cursor.row_factory = None  # plain tuples; the pool's connections default to sqlite3.Row
+    cursor.execute(sql, params)
+    index = column_index(cursor.description)
+    return [Job(index, row) for row in cursor.fetchall()]
+
+def stream_jobs(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> Iterator[Job]:
+    """fetch_jobs as a generator: rows are read from SQLite as they are consumed"""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    index = column_index(cursor.description)
+    for row in cursor:
+        yield Job(index, row)
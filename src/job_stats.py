@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Job Statistics Module
+Counter tables (job_stats, job_daily_counts) kept current by triggers on jobs, see schema
+migration 6. Every statistic is read from a handful of counter rows instead of COUNT/GROUP BY
+scans over the whole jobs table.
+
+Usage:
+    python job_stats.py show [db_path]
+    python job_stats.py rebuild [db_path]      # recount from scratch if the counters ever drift
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+# Columns counted per distinct value (dimension name = column name)
+VALUE_DIMENSIONS = ['status', 'company', 'location', 'search_keywords', 'search_location', 'search_date_posted']
+
+# Company and location foreign keys (see dimensions.py), counted per id
+KEY_DIMENSIONS = ['company_id', 'location_id']
+
+# Boolean columns counted under the 'flag' dimension when set
+FLAG_COLUMNS = ['liked', 'applied', 'disliked', 'resume_created', 'cover_letter_created', 'description_pending']
+
+# Columns whose update moves a job between counters
+TRACKED_COLUMNS = VALUE_DIMENSIONS + KEY_DIMENSIONS + FLAG_COLUMNS + ['scraped_at']
+
+_UPSERT = "ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count"
+
+def trigger_statements(row: str, sign: int, changed_only: bool = False,
+                       dimensions: Optional[List[str]] = None) -> List[str]:
+    """
+    Counter updates for one side of a row change: row is 'new' or 'old', sign is +1 or -1.
+    With changed_only, columns whose value did not change are left alone (UPDATE triggers).
+    dimensions defaults to every value and key dimension.
+    """
+    statements = []
+    if not changed_only:
+        statements.append(f"INSERT INTO job_stats (dimension, value, count) VALUES ('total', '', {sign}) {_UPSERT};")
+
+    def changed(column):
+        return f" AND old.{column} IS NOT new.{column}" if changed_only else ""
+
+    for column in dimensions or VALUE_DIMENSIONS + KEY_DIMENSIONS:
+        statements.append(
+            f"INSERT INTO job_stats (dimension, value, count) SELECT '{column}', {row}.{column}, {sign} "
+            f"WHERE {row}.{column} IS NOT NULL{changed(column)} {_UPSERT};"
+        )
+    for column in FLAG_COLUMNS:
+        statements.append(
+            f"INSERT INTO job_stats (dimension, value, count) SELECT 'flag', '{column}', {sign} "
+            f"WHERE {row}.{column} = 1{changed(column)} {_UPSERT};"
+        )
+    statements.append(
+        f"INSERT INTO job_daily_counts (day, count) SELECT date({row}.scraped_at), {sign} "
+        f"WHERE {row}.scraped_at IS NOT NULL{changed('scraped_at')} "
+        f"ON CONFLICT (day) DO UPDATE SET count = count + excluded.count;"
+    )
+    return statements
+
+def rebuild_stats(conn: sqlite3.Connection, dimensions: Optional[List[str]] = None):
+    """Recount every counter from the jobs table (inside the caller's transaction)"""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM job_stats")
+    cursor.execute("DELETE FROM job_daily_counts")
+    cursor.execute("INSERT INTO job_stats (dimension, value, count) SELECT 'total', '', COUNT(*) FROM jobs")
+    for column in dimensions or VALUE_DIMENSIONS + KEY_DIMENSIONS:
+        cursor.execute(f'''
+            INSERT INTO job_stats (dimension, value, count)
+            SELECT '{column}', {column}, COUNT(*) FROM jobs WHERE {column} IS NOT NULL GROUP BY {column}
+        ''')
+    cursor.execute(f'''
+        INSERT INTO job_stats (dimension, value, count)
+        SELECT 'flag', flag, count FROM (
+            {" UNION ALL ".join(f"SELECT '{column}' AS flag, SUM({column} = 1) AS count FROM jobs" for column in FLAG_COLUMNS)}
+        ) WHERE count IS NOT NULL
+    ''')
+    cursor.execute('''
+        INSERT INTO job_daily_counts (day, count)
+        SELECT date(scraped_at), COUNT(*) FROM jobs WHERE scraped_at IS NOT NULL GROUP BY date(scraped_at)
+    ''')
+
+def _counts(cursor, dimension: str, limit: Optional[int] = None, exclude: List[str] = ()) -> List[Dict[str, Any]]:
+    query = "SELECT value, count FROM job_stats WHERE dimension = ? AND count > 0"
+    params: List[Any] = [dimension]
+    if exclude:
+        query += f" AND value NOT IN ({','.join('?' * len(exclude))})"
+        params.extend(exclude)
+    query += " ORDER BY count DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    cursor.execute(query, params)
+    return [{'value': value, 'count': count} for value, count in cursor.fetchall()]
+
+def _top_keys(cursor, dimension: str, table: str, limit: int) -> List[Dict[str, Any]]:
+    cursor.execute(f'''
+        SELECT {table}.id, {table}.name, job_stats.count FROM job_stats
+        JOIN {table} ON {table}.id = CAST(job_stats.value AS INTEGER)
+        WHERE job_stats.dimension = ? AND job_stats.count > 0
+        ORDER BY job_stats.count DESC LIMIT ?
+    ''', (dimension, limit))
+    return [{'id': row[0], 'name': row[1], 'count': row[2]} for row in cursor.fetchall()]
+
+def get_stats(conn: sqlite3.Connection, top: int = 10) -> Dict[str, Any]:
+    """
+    All job statistics from the counter tables: totals, status and flag counts, top canonical
+    companies and locations, jobs per search filter value, and jobs scraped in the last 7 days.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT count FROM job_stats WHERE dimension = 'total' AND value = ''")
+    row = cursor.fetchone()
+    flags = {item['value']: item['count'] for item in _counts(cursor, 'flag')}
+    cursor.execute("SELECT COALESCE(SUM(count), 0) FROM job_daily_counts WHERE day >= date('now', '-7 days')")
+    recent_jobs = cursor.fetchone()[0]
+    cursor.execute("SELECT MAX(scraped_at) FROM jobs")
+    latest_scrape = cursor.fetchone()[0]
+    return {
+        'total_jobs': row[0] if row else 0,
+        'status_counts': {item['value']: item['count'] for item in _counts(cursor, 'status')},
+        'flag_counts': {column: flags.get(column, 0) for column in FLAG_COLUMNS},
+        'top_companies': [{'company': item['name'], 'company_id': item['id'], 'count': item['count']}
+                          for item in _top_keys(cursor, 'company_id', 'companies', top)],
+        'top_locations': [{'location': item['name'], 'location_id': item['id'], 'count': item['count']}
+                          for item in _top_keys(cursor, 'location_id', 'locations', top)],
+        'search_counts': {column: {item['value']: item['count'] for item in _counts(cursor, column)}
+                          for column in ('search_keywords', 'search_location', 'search_date_posted')},
+        'recent_jobs': recent_jobs,
+        'latest_scrape': latest_scrape,
+    }
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from schema import migrate
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('show', 'rebuild'):
+        print(__doc__)
+        sys.exit(1)
+
+    db_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(DATA_DIR, 'linkedin_jobs.db')
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+
+    if sys.argv[1] == 'rebuild':
+        rebuild_stats(conn)
+        conn.commit()
+        print("[STATS] Rebuilt statistics counters")
+    print(json.dumps(get_stats(conn), indent=2))
+    conn.close()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Job Card Triage Module
+Scores and filters job cards from the search results list before any of them are clicked,
+so the click budget is spent on the most relevant postings.
+"""
+
+import json
+import os
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRIAGE_RULES_PATH = os.path.join(PROJECT_ROOT, 'mydetails', 'triage_rules.json')
+MASTER_RESUME_PATH = os.path.join(PROJECT_ROOT, 'mydetails', 'master_resume.json')
+
+# Used when mydetails/triage_rules.json does not exist
+DEFAULT_TRIAGE_RULES = {
+    "company_blocklist": [],
+    "exclude_title_keywords": [],
+    "include_title_keywords": [],
+    "allowed_seniority": [],
+}
+
+# Title keywords that identify a seniority level, checked in order
+SENIORITY_KEYWORDS = [
+    ("intern", ["intern", "internship", "co-op", "coop", "student"]),
+    ("executive", ["vp", "vice president", "chief", "cto", "ceo", "head of"]),
+    ("director", ["director"]),
+    ("manager", ["manager", "management"]),
+    ("principal", ["principal", "distinguished"]),
+    ("staff", ["staff"]),
+    ("lead", ["lead", "tech lead"]),
+    ("senior", ["senior", "sr", "sr.", "iii", "iv"]),
+    ("junior", ["junior", "jr", "jr.", "entry level", "entry-level", "new grad", "graduate"]),
+]
+
+# Collects the text of every card in a single round-trip, falling back to the card's text lines
+CARD_TEXT_JS = """
+els => els.map(card => {
+    const text = (selectors) => {
+        for (const selector of selectors) {
+            const el = card.querySelector(selector);
+            if (el && el.innerText.trim()) return el.innerText.trim().split('\\n')[0];
+        }
+        return null;
+    };
+    const lines = card.innerText.split('\\n').map(line => line.trim()).filter(Boolean);
+    return {
+        title: text(['.job-card-list__title', 'a.job-card-container__link strong',
+                     '.job-card-container__link', '.base-search-card__title']) || lines[0] || '',
+        company: text(['.artdeco-entity-lockup__subtitle', '.job-card-container__primary-description',
+                       '.job-card-container__company-name', '.base-search-card__subtitle']) || lines[1] || '',
+        location: text(['.job-card-container__metadata-item', '.artdeco-entity-lockup__caption',
+                        '.job-search-card__location']) || lines[2] || '',
+        job_id: card.getAttribute('data-occludable-job-id') || card.getAttribute('data-job-id')
+            || (card.querySelector('[data-job-id]') || {getAttribute: () => null}).getAttribute('data-job-id'),
+    };
+})
+"""
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so rules match regardless of formatting"""
+    return re.sub(r"\s+", " ", (text or "")).strip().lower()
+
+def normalize_company(company: Optional[str]) -> str:
+    """Normalize a company name for blocklist comparison (drops punctuation and legal suffixes)"""
+    name = normalize_text(company)
+    name = re.sub(r"[^\w\s&]", "", name)
+    name = re.sub(r"\b(inc|ltd|llc|corp|corporation|co|limited|plc)\b", "", name)
+    return re.sub(r"\s+", " ", name).strip()
+
+class AhoCorasick:
+    """Multi-pattern keyword matcher that finds every pattern in a single pass over the text"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        for pattern in patterns:
+            pattern = normalize_text(pattern)
+            if pattern:
+                self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str):
+        state = 0
+        for char in pattern:
+            if char not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][char] = len(self.goto) - 1
+            state = self.goto[state][char]
+        if pattern not in self.output[state]:
+            self.output[state].append(pattern)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find_all(self, text: str, whole_words: bool = True) -> List[str]:
+        """Return the distinct patterns found in text, optionally only on word boundaries"""
+        text = normalize_text(text)
+        found = []
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for pattern in self.output[state]:
+                if pattern in found:
+                    continue
+                start = end - len(pattern) + 1
+                if whole_words:
+                    before = text[start - 1] if start > 0 else " "
+                    after = text[end + 1] if end + 1 < len(text) else " "
+                    if before.isalnum() or after.isalnum():
+                        continue
+                found.append(pattern)
+        return found
+
+def detect_seniority(title: Optional[str]) -> Optional[str]:
+    """Infer the seniority level from a job title, or None when the title gives no hint"""
+    words = normalize_text(title)
+    for level, keywords in SENIORITY_KEYWORDS:
+        for keyword in keywords:
+            if re.search(r"(?<![\w.])" + re.escape(keyword) + r"(?![\w])", words):
+                return level
+    return None
+
+def load_resume_skills(resume_path: str = MASTER_RESUME_PATH) -> List[str]:
+    """Load the skill keywords from the master resume"""
+    try:
+        with open(resume_path, 'r', encoding='utf-8') as f:
+            resume = json.load(f)
+    except Exception as e:
+        print(f"[TRIAGE] Could not load skills from {resume_path}: {e}")
+        return []
+    skills = []
+    for group in resume.get('skills', []):
+        for keyword in group.get('keywords', []):
+            if keyword not in skills:
+                skills.append(keyword)
+    return skills
+
+class TriageRules:
+    """Compiled include/exclude rules and relevance scoring for job cards"""
+
+    def __init__(self, rules: Optional[Dict[str, Any]] = None, skills: Optional[List[str]] = None):
+        rules = {**DEFAULT_TRIAGE_RULES, **(rules or {})}
+        self.company_blocklist = {normalize_company(c) for c in rules["company_blocklist"] if c}
+        self.exclude_matcher = AhoCorasick(rules["exclude_title_keywords"])
+        self.include_matcher = AhoCorasick(rules["include_title_keywords"])
+        self.has_include_rules = any(normalize_text(k) for k in rules["include_title_keywords"])
+        self.allowed_seniority = {normalize_text(s) for s in rules["allowed_seniority"] if s}
+        self.skills_matcher = AhoCorasick(skills if skills is not None else load_resume_skills())
+
+    def evaluate(self, card: Dict[str, Any]) -> Tuple[bool, float, str]:
+        """Return (accepted, score, reason) for a single card"""
+        title = card.get('title') or ''
+        company = card.get('company') or ''
+
+        if normalize_company(company) in self.company_blocklist:
+            return False, 0.0, f"blocked company '{company}'"
+
+        excluded = self.exclude_matcher.find_all(title)
+        if excluded:
+            return False, 0.0, f"excluded title keyword '{excluded[0]}'"
+
+        included = self.include_matcher.find_all(title)
+        if self.has_include_rules and not included:
+            return False, 0.0, "no include keyword in title"
+
+        seniority = detect_seniority(title)
+        if self.allowed_seniority and seniority and seniority not in self.allowed_seniority:
+            return False, 0.0, f"seniority '{seniority}' not allowed"
+
+        skills = self.skills_matcher.find_all(f"{title} {card.get('location') or ''}")
+        score = 3.0 * len(included) + 2.0 * len(skills)
+        if seniority is None or seniority in self.allowed_seniority:
+            score += 1.0
+        reason = f"skills={skills}" if skills else "no skill match"
+        return True, score, reason
+
+    def rank_cards(self, cards: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, float]], List[Tuple[int, str]]]:
+        """
+        Triage a page of cards.
+
+        Returns (accepted, rejected) where accepted is a list of (card index, score) sorted by
+        descending score (ties keep page order) and rejected is a list of (card index, reason).
+        """
+        accepted = []
+        rejected = []
+        for index, card in enumerate(cards):
+            ok, score, reason = self.evaluate(card)
+            if ok:
+                accepted.append((index, score))
+            else:
+                rejected.append((index, reason))
+        accepted.sort(key=lambda item: (-item[1], item[0]))
+        return accepted, rejected
+
+def load_triage_rules(rules_path: str = TRIAGE_RULES_PATH, skills: Optional[List[str]] = None) -> TriageRules:
+    """Load triage rules from mydetails/triage_rules.json (if present) and compile them"""
+    rules = {}
+    if os.path.exists(rules_path):
+        try:
+            with open(rules_path, 'r', encoding='utf-8') as f:
+                rules = json.load(f)
+            print(f"[TRIAGE] Loaded rules from {rules_path}")
+        except Exception as e:
+            print(f"[TRIAGE] Failed to load rules from {rules_path}: {e}")
+    return TriageRules(rules, skills)
+
+def read_cards(page, selector: str) -> List[Dict[str, Any]]:
+    """Read title, company and location for every card matching selector in one round-trip"""
+    try:
+        return page.eval_on_selector_all(selector, CARD_TEXT_JS)
+    except Exception as e:
+        print(f"[TRIAGE] Could not read card text: {e}")
+        return []
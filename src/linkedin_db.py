@@ -2,30 +2,153 @@
 """
 LinkedIn Jobs Database Module
 Handles all database operations for the LinkedIn job scraper.
+
+LinkedInJobsDB stores jobs in the local SQLite database. When JOBS_DATABASE_URL (or the
+db_path passed in) is a postgresql:// URL, constructing it returns a pg_store.PostgresJobsDB
+instead, with the same methods (see storage.py).
 """
 
-import sqlite3
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
+
+from schema import migrate
+from db_pool import get_pool
+from search_index import add_snippets, build_match_query, sync_search_index, FTS_COLUMNS, FTS_RANK
+from job_fingerprint import job_fingerprint, canonical_job_url
+from near_duplicates import index_jobs
+from pagination import decode_cursor, encode_cursor, keyset_query, split_page
+from job_stats import get_stats
+from dimensions import find_id, resolve_id
+from job_rows import Job, fetch_jobs, stream_jobs
+from storage import EXACT_FILTERS, JOB_FLAGS, LIST_FILTERS, JobStore, database_url, is_postgres
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
 
-class LinkedInJobsDB:
+# Insert a job, or refresh the stored row with the same fingerprint. The WHERE makes an
+# unchanged row a no-op (rowcount 0), which save_jobs reports as a duplicate.
+UPSERT_JOB_SQL = '''
+    INSERT INTO jobs (
+        title, company, location, company_id, location_id, url, fingerprint,
+        search_keywords, search_location, search_date_posted,
+        search_experience_level, search_job_type, search_work_model,
+        description_pending
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (fingerprint) DO UPDATE SET
+        title = excluded.title,
+        company = excluded.company,
+        location = COALESCE(excluded.location, jobs.location),
+        company_id = excluded.company_id,
+        location_id = CASE WHEN excluded.location IS NULL THEN jobs.location_id ELSE excluded.location_id END,
+        description_pending = MIN(jobs.description_pending, excluded.description_pending)
+    WHERE jobs.title IS NOT excluded.title
+       OR jobs.company IS NOT excluded.company
+       OR (excluded.location IS NOT NULL AND jobs.location IS NOT excluded.location)
+       OR jobs.description_pending > excluded.description_pending
+'''
+
+# Descriptions and generated documents live in their own tables (schema migration 7) so the
+# jobs row stays narrow for list queries; they are only read when one job is opened.
+# Descriptions are stored compressed, see description_codec.
+UPSERT_DESCRIPTION_SQL = '''
+    INSERT INTO job_details (job_id, description) VALUES (?, compress_description(?))
+    ON CONFLICT (job_id) DO UPDATE SET description = excluded.description
+    WHERE description_text(job_details.description) IS NOT description_text(excluded.description)
+'''
+
+UPSERT_DOCUMENT_SQL = '''
+    INSERT INTO job_documents (job_id, {column}) VALUES (?, ?)
+    ON CONFLICT (job_id) DO UPDATE SET {column} = excluded.{column}
+'''
+
+# One job with its cold columns, for detail views and tailoring
+JOB_DETAIL_QUERY = '''
+    SELECT jobs.*, description_text(job_details.description) AS description, job_documents.resume_json, job_documents.cover_letter_json
+    FROM jobs
+    LEFT JOIN job_details ON job_details.job_id = jobs.id
+    LEFT JOIN job_documents ON job_documents.job_id = jobs.id
+    WHERE jobs.id = ?
+'''
+
+# Columns of the API's job list (find_jobs_page); qualified because text matches join jobs_fts
+JOB_LIST_COLUMNS = """
+    jobs.id, jobs.title, jobs.company, jobs.location, jobs.description_preview, jobs.url,
+    jobs.search_keywords, jobs.search_location, jobs.search_date_posted,
+    jobs.experience_level, jobs.job_type, jobs.work_model, jobs.scraped_at,
+    jobs.status, jobs.liked, jobs.applied, jobs.disliked, jobs.description_pending
+"""
+
+# Scraper run criteria, as stored in search_history and grouped by the yield report
+SEARCH_COLUMNS = ('keywords', 'location', 'date_posted', 'experience_level', 'job_type', 'work_model')
+
+# Record that a search saw a stored job; the job is new for the search when it was stored
+# after the search started. A repeat sighting within one search keeps the first.
+RECORD_HIT_SQL = '''
+    INSERT INTO job_search_hits (search_id, job_id, page, position, is_new)
+    SELECT search_history.id, jobs.id, ?, ?, jobs.scraped_at >= search_history.search_date
+    FROM jobs JOIN search_history ON search_history.id = ?
+    WHERE jobs.id = ?
+    ON CONFLICT (search_id, job_id) DO NOTHING
+'''
+
+# Cards without a job id cannot be linked, so jobs_found is at least the number of hits
+FINISH_SEARCH_SQL = '''
+    UPDATE search_history SET
+        jobs_found = MAX(?, (SELECT COUNT(*) FROM job_search_hits WHERE search_id = search_history.id)),
+        jobs_scraped = (SELECT COUNT(*) FROM job_search_hits WHERE search_id = search_history.id AND is_new = 1),
+        finished_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+SEARCH_YIELD_SQL = f'''
+    SELECT {', '.join(SEARCH_COLUMNS)}, COUNT(*) AS runs,
+           SUM(jobs_found) AS jobs_found, SUM(jobs_scraped) AS new_jobs, MAX(search_date) AS last_run
+    FROM search_history
+    WHERE finished_at IS NOT NULL {{since}}
+    GROUP BY {', '.join(SEARCH_COLUMNS)}
+'''
+
+def _search_yield_rows(cursor) -> List[Dict[str, Any]]:
+    """Rows of SEARCH_YIELD_SQL as dicts with the share of new jobs, lowest yield first"""
+    columns = [column[0] for column in cursor.description]
+    rows = []
+    for values in cursor.fetchall():
+        row = dict(zip(columns, values))
+        row['last_run'] = str(row['last_run']) if row['last_run'] is not None else None
+        row['yield'] = row['new_jobs'] / row['jobs_found'] if row['jobs_found'] else 0.0
+        rows.append(row)
+    return sorted(rows, key=lambda row: (row['yield'], row['new_jobs']))
+
+def _chunked(items: Iterable[Any], size: int):
+    """Yield lists of up to size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class LinkedInJobsDB(JobStore):
     """Database manager for LinkedIn jobs"""
     
+    def __new__(cls, db_path: Optional[str] = None):
+        url = database_url(db_path)
+        if cls is LinkedInJobsDB and is_postgres(url):
+            from pg_store import PostgresJobsDB
+            return PostgresJobsDB(url)
+        return super().__new__(cls)
+    
     def __init__(self, db_path: Optional[str] = None):
-        if db_path is None:
-            db_path = os.path.join(DATA_DIR, 'linkedin_jobs.db')
-        self.db_path: str = db_path
+        self.db_path: str = database_url(db_path)
         self.conn = None
         self.cursor = None
     
     def connect(self) -> bool:
-        """Connect to the database"""
+        """Take a connection from the shared pool for this database"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = get_pool(self.db_path).acquire()
             self.cursor = self.conn.cursor()
             return True
         except Exception as e:
@@ -33,103 +156,36 @@ class LinkedInJobsDB:
             return False
     
     def disconnect(self):
-        """Disconnect from the database"""
+        """Return the connection to the pool"""
         if self.conn:
             self.conn.close()
             self.conn = None
             self.cursor = None
     
     def create_tables(self):
-        """Create the database tables if they don't exist"""
+        """Create the database tables if they don't exist, and apply pending migrations"""
         if self.cursor is None or self.conn is None:
             raise RuntimeError("Database connection not established. Call connect() first.")
         try:
-            # Main jobs table
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS jobs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    company TEXT NOT NULL,
-                    location TEXT,
-                    description TEXT,
-                    url TEXT UNIQUE,
-                    search_keywords TEXT,
-                    search_location TEXT,
-                    search_date_posted TEXT,
-                    search_experience_level TEXT,
-                    search_job_type TEXT,
-                    search_work_model TEXT,
-                    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    status TEXT DEFAULT 'new',
-                    liked BOOLEAN DEFAULT 0,
-                    resume_created BOOLEAN DEFAULT 0,
-                    cover_letter_created BOOLEAN DEFAULT 0,
-                    applied BOOLEAN DEFAULT 0,
-                    notes TEXT,
-                    salary_min REAL,
-                    salary_max REAL,
-                    salary_currency TEXT,
-                    job_type TEXT,
-                    experience_level TEXT,
-                    work_model TEXT
-                )
-            ''')
-            
-            # Job status history table
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS job_status_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    job_id INTEGER,
-                    status TEXT,
-                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    notes TEXT,
-                    FOREIGN KEY (job_id) REFERENCES jobs (id)
-                )
-            ''')
-            
-            # Search history table
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS search_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    keywords TEXT,
-                    location TEXT,
-                    date_posted TEXT,
-                    experience_level TEXT,
-                    job_type TEXT,
-                    work_model TEXT,
-                    jobs_found INTEGER,
-                    jobs_scraped INTEGER,
-                    search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            self.conn.commit()
-            print("[DB] Database tables created successfully")
+            version = migrate(self.conn)
+            print(f"[DB] Database tables created successfully (schema version {version})")
             return True
             
         except Exception as e:
             print(f"[DB ERROR] Failed to create tables: {e}")
             return False
     
-    def job_exists(self, url: Optional[str], title: Optional[str] = None, company: Optional[str] = None) -> bool:
-        """Check if a job already exists in the database"""
+    def job_exists(self, url: Optional[str], title: Optional[str] = None, company: Optional[str] = None,
+                   location: Optional[str] = None) -> bool:
+        """Check if a job already exists in the database (one probe of the fingerprint index)"""
         if self.cursor is None:
             raise RuntimeError("Database connection not established. Call connect() first.")
         try:
-            # Check by URL first (most reliable)
-            if url is not None:
-                self.cursor.execute("SELECT id FROM jobs WHERE url = ?", (url,))
-            if self.cursor.fetchone():
-                return True
-            # If no URL match, check by title + company combination
-            if title is not None and company is not None:
-                self.cursor.execute(
-                    "SELECT id FROM jobs WHERE title = ? AND company = ?", 
-                    (title, company)
-                )
-                if self.cursor.fetchone():
-                    return True
-            return False
+            self.cursor.execute(
+                "SELECT id FROM jobs WHERE fingerprint = ?",
+                (job_fingerprint(title, company, location, url),)
+            )
+            return self.cursor.fetchone() is not None
         except Exception as e:
             print(f"[DB ERROR] Error checking if job exists: {e}")
             return False
@@ -140,30 +196,41 @@ class LinkedInJobsDB:
             raise RuntimeError("Database connection not established. Call connect() first.")
         try:
             # Check if job already exists
-            if self.job_exists(job_data.get('url'), job_data.get('title'), job_data.get('company')):
+            if self.job_exists(job_data.get('url'), job_data.get('title'), job_data.get('company'),
+                               job_data.get('location')):
                 print(f"[DB] Job already exists: {job_data.get('title')} at {job_data.get('company')}")
                 return False
             
             # Insert new job
             self.cursor.execute('''
                 INSERT INTO jobs (
-                    title, company, location, description, url,
+                    title, company, location, company_id, location_id, url, fingerprint,
                     search_keywords, search_location, search_date_posted,
-                    search_experience_level, search_job_type, search_work_model
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    search_experience_level, search_job_type, search_work_model,
+                    description_pending
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 job_data.get('title'),
                 job_data.get('company'),
                 job_data.get('location'),
-                job_data.get('description'),
-                job_data.get('url'),
+                resolve_id(self.cursor, 'company', job_data.get('company')),
+                resolve_id(self.cursor, 'location', job_data.get('location')),
+                canonical_job_url(job_data.get('url')),
+                job_fingerprint(job_data.get('title'), job_data.get('company'),
+                                job_data.get('location'), job_data.get('url')),
                 job_data.get('search_keywords'),
                 job_data.get('search_location'),
                 job_data.get('search_date_posted'),
                 job_data.get('search_experience_level'),
                 job_data.get('search_job_type'),
-                job_data.get('search_work_model')
+                job_data.get('search_work_model'),
+                job_data.get('description_pending', 0)
             ))
+            job_id = self.cursor.lastrowid
+            if job_data.get('description'):
+                self.cursor.execute(UPSERT_DESCRIPTION_SQL, (job_id, job_data['description']))
+            sync_search_index(self.conn)
+            index_jobs(self.conn, [job_id])
             
             self.conn.commit()
             print(f"[DB] Saved job: {job_data.get('title')} at {job_data.get('company')}")
@@ -173,48 +240,248 @@ class LinkedInJobsDB:
             print(f"[DB ERROR] Failed to save job: {e}")
             return False
     
-    def get_jobs(self, limit: Optional[int] = None, status: Optional[str] = None, liked: Optional[bool] = None) -> List[Dict]:
+    def save_jobs(self, jobs: Iterable[Dict[str, Any]], chunk_size: int = 400,
+                  index_duplicates: bool = True) -> List[Tuple[str, Optional[int]]]:
+        """
+        Bulk upsert jobs in a single transaction, keyed on the job fingerprint.
+
+        A job whose fingerprint is already stored has its title, company, location and
+        description refreshed (a missing description never overwrites a fetched one).
+        LinkedIn URLs are stored in their canonical /jobs/view/<id>/ form.
+
+        Args:
+            jobs: Job dicts as produced by the scraper or read back from its JSON/CSV exports
+            chunk_size: Rows looked up and written per batch
+            index_duplicates: Add new and changed descriptions to the near-duplicate index now;
+                bulk loads pass False and leave them for near_duplicates.index_pending
+
+        Returns:
+            One (outcome, job_id) per input row, outcome being 'inserted', 'updated',
+            'duplicate' or 'invalid' (missing title or company)
+        """
+        if self.cursor is None or self.conn is None:
+            raise RuntimeError("Database connection not established. Call connect() first.")
+        outcomes: List[Tuple[str, Optional[int]]] = []
+        counts = {'inserted': 0, 'updated': 0, 'duplicate': 0, 'invalid': 0}
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for chunk in _chunked(jobs, chunk_size):
+                chunk_outcomes = self._upsert_chunk(chunk)
+                sync_search_index(self.conn)
+                for outcome in chunk_outcomes:
+                    counts[outcome[0]] += 1
+                    outcomes.append(outcome)
+                # Near-duplicate signatures for new rows and rows whose description changed
+                if index_duplicates:
+                    index_jobs(self.conn, [job_id for outcome, job_id in chunk_outcomes
+                                           if outcome in ('inserted', 'updated')])
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            print(f"[DB ERROR] Bulk save failed, rolled back: {e}")
+            raise
+        print(f"[DB] Bulk save: {counts['inserted']} inserted, {counts['updated']} updated, "
+              f"{counts['duplicate']} duplicate, {counts['invalid']} invalid")
+        return outcomes
+    
+    def _upsert_chunk(self, chunk: List[Dict[str, Any]]) -> List[Tuple[str, Optional[int]]]:
+        """Upsert one chunk inside the caller's transaction"""
+        rows = []
+        for job in chunk:
+            if not job.get('title') or not job.get('company'):
+                rows.append(None)
+                continue
+            fingerprint = job_fingerprint(job['title'], job['company'], job.get('location'), job.get('url'))
+            rows.append((fingerprint, canonical_job_url(job.get('url')), job))
+        
+        fingerprints = list({row[0] for row in rows if row})
+        by_fingerprint: Dict[str, int] = {}
+        if fingerprints:
+            self.cursor.execute(
+                f"SELECT fingerprint, id FROM jobs WHERE fingerprint IN ({','.join('?' * len(fingerprints))})",
+                fingerprints
+            )
+            by_fingerprint = dict(self.cursor.fetchall())
+        
+        # A URL stored under another fingerprint (e.g. a legacy duplicate) is still a duplicate
+        urls = list({row[1] for row in rows if row and row[1] and row[0] not in by_fingerprint})
+        by_url: Dict[str, int] = {}
+        if urls:
+            self.cursor.execute(f"SELECT url, id FROM jobs WHERE url IN ({','.join('?' * len(urls))})", urls)
+            by_url = dict(self.cursor.fetchall())
+        
+        outcomes = []
+        dimension_ids: Dict = {}
+        for row in rows:
+            if row is None:
+                outcomes.append(('invalid', None))
+                continue
+            fingerprint, url, job = row
+            if fingerprint not in by_fingerprint and url in by_url:
+                outcomes.append(('duplicate', by_url[url]))
+                continue
+            
+            self.cursor.execute(UPSERT_JOB_SQL, (
+                job['title'],
+                job['company'],
+                job.get('location'),
+                resolve_id(self.cursor, 'company', job['company'], dimension_ids),
+                resolve_id(self.cursor, 'location', job.get('location'), dimension_ids),
+                url,
+                fingerprint,
+                job.get('search_keywords'),
+                job.get('search_location'),
+                job.get('search_date_posted'),
+                # The scraper's own records name the search filters without the search_ prefix
+                job.get('search_experience_level', job.get('experience_level')),
+                job.get('search_job_type', job.get('job_type')),
+                job.get('search_work_model', job.get('work_model')),
+                0 if job.get('description') else 1 if job.get('description_pending') in (1, True, '1') else 0
+            ))
+            if fingerprint in by_fingerprint:
+                job_id, changed = by_fingerprint[fingerprint], self.cursor.rowcount > 0
+            else:
+                job_id, changed = self.cursor.lastrowid, None
+                by_fingerprint[fingerprint] = job_id
+                if url:
+                    by_url[url] = job_id
+            # A missing description never overwrites a fetched one
+            if job.get('description'):
+                self.cursor.execute(UPSERT_DESCRIPTION_SQL, (job_id, job['description']))
+                if changed is not None:
+                    changed = changed or self.cursor.rowcount > 0
+            if changed is None:
+                outcomes.append(('inserted', job_id))
+            else:
+                outcomes.append(('updated' if changed else 'duplicate', job_id))
+        return outcomes
+    
+    def get_jobs(self, limit: Optional[int] = None, status: Optional[str] = None, liked: Optional[bool] = None) -> List[Job]:
         """Get jobs from the database with optional filters"""
         if self.cursor is None:
             raise RuntimeError("Database connection not established. Call connect() first.")
         try:
-            query = "SELECT * FROM jobs"
-            params = []
-            
-            # Build WHERE clause
-            conditions = []
-            if status is not None:
-                conditions.append("status = ?")
-                params.append(status)
-            if liked is not None:
-                conditions.append("liked = ?")
-                params.append(1 if liked else 0)
-            
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-            
-            query += " ORDER BY scraped_at DESC"
-            
-            if limit is not None:
-                query += " LIMIT ?"
-                params.append(limit)
-            
-            self.cursor.execute(query, params)
-            rows = self.cursor.fetchall()
-            
-            # Convert to list of dictionaries
-            columns = [description[0] for description in self.cursor.description]
-            jobs = []
-            for row in rows:
-                job = dict(zip(columns, row))
-                jobs.append(job)
-            
-            return jobs
-            
+            return fetch_jobs(self.conn, *self._jobs_query(limit, status, liked))
         except Exception as e:
             print(f"[DB ERROR] Failed to get jobs: {e}")
             return []
     
+    def iter_jobs(self, limit: Optional[int] = None, status: Optional[str] = None,
+                  liked: Optional[bool] = None) -> Iterator[Job]:
+        """get_jobs as a generator; rows are read from SQLite as they are consumed"""
+        if self.cursor is None:
+            raise RuntimeError("Database connection not established. Call connect() first.")
+        return stream_jobs(self.conn, *self._jobs_query(limit, status, liked))
+    
+    @staticmethod
+    def _jobs_query(limit: Optional[int], status: Optional[str], liked: Optional[bool]) -> Tuple[str, List[Any]]:
+        query = "SELECT * FROM jobs"
+        params = []
+        
+        # Build WHERE clause
+        conditions = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if liked is not None:
+            conditions.append("liked = ?")
+            params.append(1 if liked else 0)
+        
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        
+        query += " ORDER BY scraped_at DESC"
+        
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return query, params
+    
+    def get_jobs_page(self, limit: int = 50, cursor: Optional[str] = None, status: Optional[str] = None,
+                      liked: Optional[bool] = None) -> Tuple[List[Job], Optional[str]]:
+        """
+        One page of jobs, newest first. Pass the returned cursor back in to get the next page;
+        it is None after the last page. Every page costs one index seek, however deep.
+        """
+        if self.cursor is None:
+            raise RuntimeError("Database connection not established. Call connect() first.")
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if liked is not None:
+            conditions.append("liked = ?")
+            params.append(1 if liked else 0)
+        try:
+            query, query_params = keyset_query("*", "jobs", conditions, params, decode_cursor(cursor), limit)
+            return split_page(fetch_jobs(self.conn, query, query_params), limit)
+        except Exception as e:
+            print(f"[DB ERROR] Failed to get jobs page: {e}")
+            return [], None
+    
+    def find_jobs_page(self, limit: int = 50, cursor: Optional[str] = None, query: Optional[str] = None,
+                       filters: Optional[Dict[str, Any]] = None, offset: int = 0) -> Tuple[List[Job], Optional[str]]:
+        """
+        One page of the API's job list (JOB_LIST_COLUMNS, with description previews), plus the
+        next page's cursor. filters takes the LIST_FILTERS keys.
+
+        Without a text query the list is newest first and pages with a keyset cursor. Relevance-
+        ranked matches have no stable key to continue from, so their cursor carries an offset
+        into the ranking, and each match gets a snippet. offset pages without a cursor the
+        legacy way. Raises ValueError for a malformed cursor or an unknown filter.
+        """
+        if self.cursor is None:
+            raise RuntimeError("Database connection not established. Call connect() first.")
+        conditions, params = self._list_filters(filters or {})
+        page_cursor = decode_cursor(cursor)
+        match = build_match_query(query)
+        if match:
+            offset = page_cursor.get('offset', 0) if page_cursor else offset
+            sql = f"""
+                SELECT {JOB_LIST_COLUMNS}, NULL AS snippet
+                FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+                WHERE {" AND ".join(["jobs_fts MATCH ?"] + conditions)}
+                ORDER BY {FTS_RANK} LIMIT ? OFFSET ?
+            """
+            rows = fetch_jobs(self.conn, sql, [match] + params + [limit + 1, offset])
+            next_cursor = encode_cursor({'offset': offset + limit}) if len(rows) > limit else None
+            return add_snippets(self.conn, rows[:limit], match), next_cursor
+        if offset and not page_cursor:
+            sql = f"""
+                SELECT {JOB_LIST_COLUMNS} FROM jobs WHERE {" AND ".join(conditions) or "1=1"}
+                ORDER BY jobs.scraped_at DESC, jobs.id DESC LIMIT ? OFFSET ?
+            """
+            return split_page(fetch_jobs(self.conn, sql, params + [limit + 1, offset]), limit)
+        sql, sql_params = keyset_query(JOB_LIST_COLUMNS, "jobs", conditions, params, page_cursor, limit)
+        return split_page(fetch_jobs(self.conn, sql, sql_params), limit)
+    
+    def _list_filters(self, filters: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """
+        WHERE conditions for find_jobs_page. A company or location name that resolves to a
+        canonical row (any alias) filters on the indexed key; any other name falls back to a
+        substring match on the scraped text.
+        """
+        unknown = sorted(set(filters) - set(LIST_FILTERS))
+        if unknown:
+            raise ValueError(f"Unknown filter(s): {', '.join(unknown)}")
+        conditions, params = [], []
+        for dimension in ('location', 'company'):
+            dimension_id = filters.get(f'{dimension}_id')
+            name = filters.get(dimension)
+            if dimension_id is None and name:
+                dimension_id = find_id(self.cursor, dimension, name)
+            if dimension_id is not None:
+                conditions.append(f"jobs.{dimension}_id = ?")
+                params.append(dimension_id)
+            elif name:
+                conditions.append(f"jobs.{dimension} LIKE ?")
+                params.append(f"%{name}%")
+        for column in EXACT_FILTERS:
+            if filters.get(column):
+                conditions.append(f"jobs.{column} = ?")
+                params.append(filters[column])
+        return conditions, params
+    
     def update_job_status(self, job_id: int, status: str, notes: str = None) -> bool:
         """Update job status and add to history"""
         if self.cursor is None or self.conn is None:
@@ -267,6 +534,27 @@ class LinkedInJobsDB:
             print(f"[DB ERROR] Failed to toggle job like: {e}")
             return False
     
+    def toggle_job_flag(self, job_id: int, flag: str) -> Optional[bool]:
+        """Flip liked, applied or disliked; the new value, or None when there is no such job"""
+        if self.cursor is None or self.conn is None:
+            raise RuntimeError("Database connection not established. Call connect() first.")
+        if flag not in JOB_FLAGS:
+            raise ValueError(f"Unknown flag '{flag}'")
+        try:
+            # The new value is read in the write's own transaction, so concurrent toggles cannot interleave
+            self.cursor.execute(f"UPDATE jobs SET {flag} = CASE WHEN {flag} = 1 THEN 0 ELSE 1 END WHERE id = ?", (job_id,))
+            if self.cursor.rowcount == 0:
+                self.conn.rollback()
+                return None
+            self.cursor.execute(f"SELECT {flag} FROM jobs WHERE id = ?", (job_id,))
+            value = bool(self.cursor.fetchone()[0])
+            self.conn.commit()
+            print(f"[DB] Job {job_id} {flag} set to {int(value)}")
+            return value
+        except Exception:
+            self.conn.rollback()
+            raise
+    
     def mark_resume_created(self, job_id: int) -> bool:
         """Mark that a resume has been created for a job"""
         if self.cursor is None or self.conn is None:
@@ -305,8 +593,8 @@ class LinkedInJobsDB:
             raise RuntimeError("Database connection not established. Call connect() first.")
         try:
             self.cursor.execute(
-                "UPDATE jobs SET resume_json = ? WHERE id = ?",
-                (resume_json, job_id)
+                UPSERT_DOCUMENT_SQL.format(column='resume_json'),
+                (job_id, resume_json)
             )
             self.conn.commit()
             print(f"[DB] Updated resume JSON for job {job_id}")
@@ -337,8 +625,8 @@ class LinkedInJobsDB:
             raise RuntimeError("Database connection not established. Call connect() first.")
         try:
             self.cursor.execute(
-                "UPDATE jobs SET cover_letter_json = ? WHERE id = ?",
-                (cover_letter_json, job_id)
+                UPSERT_DOCUMENT_SQL.format(column='cover_letter_json'),
+                (job_id, cover_letter_json)
             )
             self.conn.commit()
             print(f"[DB] Updated cover letter JSON for job {job_id}")
@@ -395,86 +683,128 @@ class LinkedInJobsDB:
             print(f"[DB ERROR] Failed to add job notes: {e}")
             return False
     
-    def get_job_by_id(self, job_id: int) -> Optional[Dict]:
+    def update_job_location(self, job_id: int, location: Optional[str]) -> bool:
+        """Move a job to another location (its location_id and search entry with it). False when there is no such job."""
+        if self.cursor is None or self.conn is None:
+            raise RuntimeError("Database connection not established. Call connect() first.")
+        try:
+            # The location filter, facets and stats read location_id, so it moves with the text
+            location_id = resolve_id(self.cursor, 'location', location) if location else None
+            self.cursor.execute("UPDATE jobs SET location = ?, location_id = ? WHERE id = ?",
+                                (location, location_id, job_id))
+            if self.cursor.rowcount == 0:
+                self.conn.rollback()
+                return False
+            sync_search_index(self.conn)
+            self.conn.commit()
+            print(f"[DB] Moved job {job_id} to location: {location}")
+            return True
+        except Exception:
+            self.conn.rollback()
+            raise
+    
+    def update_job_description(self, job_id: int, description: Optional[str]) -> bool:
+        """Store a lazily fetched description and clear the description_pending flag"""
+        if self.cursor is None or self.conn is None:
+            raise RuntimeError("Database connection not established. Call connect() first.")
+        try:
+            self.cursor.execute(UPSERT_DESCRIPTION_SQL, (job_id, description))
+            self.cursor.execute("UPDATE jobs SET description_pending = 0 WHERE id = ?", (job_id,))
+            sync_search_index(self.conn)
+            index_jobs(self.conn, [job_id])
+            self.conn.commit()
+            print(f"[DB] Updated description for job {job_id}")
+            return True
+        except Exception as e:
+            print(f"[DB ERROR] Failed to update job description: {e}")
+            return False
+    
+    def get_jobs_pending_description(self, limit: Optional[int] = None) -> List[Job]:
+        """Get list-only stubs that are still waiting for their description"""
+        if self.cursor is None:
+            raise RuntimeError("Database connection not established. Call connect() first.")
+        try:
+            return fetch_jobs(self.conn, *self._pending_query(limit))
+        except Exception as e:
+            print(f"[DB ERROR] Failed to get jobs pending description: {e}")
+            return []
+    
+    def iter_jobs_pending_description(self, limit: Optional[int] = None) -> Iterator[Job]:
+        """get_jobs_pending_description as a generator"""
+        if self.cursor is None:
+            raise RuntimeError("Database connection not established. Call connect() first.")
+        return stream_jobs(self.conn, *self._pending_query(limit))
+    
+    @staticmethod
+    def _pending_query(limit: Optional[int]) -> Tuple[str, List[Any]]:
+        query = "SELECT id, title, company, url FROM jobs WHERE description_pending = 1 ORDER BY scraped_at DESC"
+        params = []
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return query, params
+    
+    def get_job_by_id(self, job_id: int) -> Optional[Job]:
         """Get a specific job by ID"""
         if self.cursor is None:
             raise RuntimeError("Database connection not established. Call connect() first.")
         try:
-            self.cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-            row = self.cursor.fetchone()
-            
-            if row:
-                columns = [description[0] for description in self.cursor.description]
-                return dict(zip(columns, row))
-            
-            return None
+            jobs = fetch_jobs(self.conn, JOB_DETAIL_QUERY, (job_id,))
+            return jobs[0] if jobs else None
             
         except Exception as e:
             print(f"[DB ERROR] Failed to get job by ID: {e}")
             return None
     
-    def search_jobs(self, query: str) -> List[Dict]:
-        """Search jobs by title, company, or description"""
+    def search_jobs(self, query: str, limit: Optional[int] = None, field: Optional[str] = None) -> List[Job]:
+        """
+        Full-text search over title, company, location and description, best matches first.
+        field limits the match to one of those columns; other columns (search_keywords,
+        search_location) are matched as substrings.
+        """
         if self.cursor is None:
             raise RuntimeError("Database connection not established. Call connect() first.")
         try:
-            search_term = f"%{query}%"
-            self.cursor.execute('''
-                SELECT * FROM jobs 
-                WHERE title LIKE ? OR company LIKE ? OR description LIKE ?
-                ORDER BY scraped_at DESC
-            ''', (search_term, search_term, search_term))
-            
-            rows = self.cursor.fetchall()
-            columns = [description[0] for description in self.cursor.description]
-            jobs = []
-            for row in rows:
-                job = dict(zip(columns, row))
-                jobs.append(job)
-            
-            return jobs
+            if field is not None and field not in FTS_COLUMNS:
+                if field not in ('search_keywords', 'search_location'):
+                    raise ValueError(f"Column '{field}' is not searchable")
+                sql = f"SELECT *, NULL AS snippet FROM jobs WHERE {field} LIKE ? ORDER BY id DESC LIMIT ?"
+                return fetch_jobs(self.conn, sql, (f'%{query}%', -1 if limit is None else limit))
+            match = build_match_query(query, column=field)
+            if match is None:
+                return []
+            sql = f'''
+                SELECT jobs.*, NULL AS snippet
+                FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+                WHERE jobs_fts MATCH ?
+                ORDER BY {FTS_RANK}
+            '''
+            params = [match]
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
+            return add_snippets(self.conn, fetch_jobs(self.conn, sql, params), match)
             
         except Exception as e:
             print(f"[DB ERROR] Failed to search jobs: {e}")
             return []
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Get database statistics"""
+        """Get database statistics from the trigger-maintained counter tables"""
         try:
-            stats = {}
-            
-            # Total jobs
-            self.cursor.execute("SELECT COUNT(*) FROM jobs")
-            stats['total_jobs'] = self.cursor.fetchone()[0]
-            
-            # Jobs by status
-            self.cursor.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
-            stats['by_status'] = dict(self.cursor.fetchall())
-            
-            # Liked jobs
-            self.cursor.execute("SELECT COUNT(*) FROM jobs WHERE liked = 1")
-            stats['liked_jobs'] = self.cursor.fetchone()[0]
-            
-            # Jobs with resume created
-            self.cursor.execute("SELECT COUNT(*) FROM jobs WHERE resume_created = 1")
-            stats['resume_created'] = self.cursor.fetchone()[0]
-            
-            # Jobs with cover letter created
-            self.cursor.execute("SELECT COUNT(*) FROM jobs WHERE cover_letter_created = 1")
-            stats['cover_letter_created'] = self.cursor.fetchone()[0]
-            
-            # Applied jobs
-            self.cursor.execute("SELECT COUNT(*) FROM jobs WHERE applied = 1")
-            stats['applied_jobs'] = self.cursor.fetchone()[0]
-            
-            # Recent jobs (last 7 days)
-            self.cursor.execute('''
-                SELECT COUNT(*) FROM jobs 
-                WHERE scraped_at >= datetime('now', '-7 days')
-            ''')
-            stats['recent_jobs'] = self.cursor.fetchone()[0]
-            
-            return stats
+            counters = get_stats(self.conn)
+            flags = counters['flag_counts']
+            return {
+                'total_jobs': counters['total_jobs'],
+                'by_status': counters['status_counts'],
+                'liked_jobs': flags['liked'],
+                'resume_created': flags['resume_created'],
+                'cover_letter_created': flags['cover_letter_created'],
+                'applied_jobs': flags['applied'],
+                'recent_jobs': counters['recent_jobs'],
+                'search_counts': counters['search_counts'],
+                'latest_scrape': counters['latest_scrape'],
+            }
             
         except Exception as e:
             print(f"[DB ERROR] Failed to get statistics: {e}")
@@ -505,6 +835,80 @@ class LinkedInJobsDB:
         except Exception as e:
             print(f"[DB ERROR] Failed to save search history: {e}")
             return False
+    
+    def start_search(self, search_data: Dict[str, Any]) -> Optional[int]:
+        """
+        Open a search_history row for a scraper run; its sightings are recorded against the
+        returned id and finish_search() fills in the totals.
+        """
+        try:
+            self.cursor.execute('''
+                INSERT INTO search_history (
+                    keywords, location, date_posted, experience_level,
+                    job_type, work_model, jobs_found, jobs_scraped
+                ) VALUES (?, ?, ?, ?, ?, ?, 0, 0)
+            ''', [search_data.get(column) for column in SEARCH_COLUMNS])
+            self.conn.commit()
+            return self.cursor.lastrowid
+        except Exception as e:
+            self.conn.rollback()
+            print(f"[DB ERROR] Failed to start search history: {e}")
+            return None
+    
+    def known_job_ids(self, fingerprints: Iterable[str]) -> Dict[str, int]:
+        """{fingerprint: job id} for the fingerprints already stored ({} when the lookup fails)"""
+        known: Dict[str, int] = {}
+        try:
+            for chunk in _chunked(set(fingerprints), 500):
+                self.cursor.execute(
+                    f"SELECT fingerprint, id FROM jobs WHERE fingerprint IN ({','.join('?' * len(chunk))})", chunk
+                )
+                known.update(self.cursor.fetchall())
+            return known
+        except Exception as e:
+            print(f"[DB ERROR] Failed to look up stored jobs: {e}")
+            return {}
+    
+    def record_search_hits(self, search_id: int, hits: Iterable[Tuple[int, Optional[int], Optional[int]]]) -> int:
+        """Record that a search saw stored jobs, as (job_id, page, position). Returns the hits added."""
+        try:
+            before = self.conn.total_changes
+            self.cursor.executemany(RECORD_HIT_SQL, [(page, position, search_id, job_id)
+                                                     for job_id, page, position in hits if job_id is not None])
+            self.conn.commit()
+            return self.conn.total_changes - before
+        except Exception as e:
+            self.conn.rollback()
+            print(f"[DB ERROR] Failed to record search hits: {e}")
+            return 0
+    
+    def finish_search(self, search_id: int, jobs_found: int) -> Dict[str, int]:
+        """
+        Close a scraper run: jobs_found is the number of distinct job cards it saw and
+        jobs_scraped the number of jobs it added. Returns both.
+        """
+        try:
+            self.cursor.execute(FINISH_SEARCH_SQL, (jobs_found, search_id))
+            self.conn.commit()
+            self.cursor.execute("SELECT jobs_found, jobs_scraped FROM search_history WHERE id = ?", (search_id,))
+            row = self.cursor.fetchone()
+            return {'jobs_found': row[0], 'jobs_scraped': row[1]} if row else {}
+        except Exception as e:
+            self.conn.rollback()
+            print(f"[DB ERROR] Failed to finish search history: {e}")
+            return {}
+    
+    def get_search_yield(self, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Finished runs grouped by search criteria, lowest share of new jobs first"""
+        since, params = "", []
+        if days is not None:
+            since, params = "AND search_date >= datetime('now', ?)", [f"-{days} days"]
+        try:
+            self.cursor.execute(SEARCH_YIELD_SQL.format(since=since), params)
+            return _search_yield_rows(self.cursor)
+        except Exception as e:
+            print(f"[DB ERROR] Failed to get search yield: {e}")
+            return []
 
 # Convenience functions for backward compatibility
 def init_database(db_path: Optional[str] = None) -> LinkedInJobsDB:
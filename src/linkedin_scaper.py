@@ -4,10 +4,23 @@ import random
 import json
 import csv
 import sqlite3
+import argparse
 from datetime import datetime
 import os
 import codecs
 import urllib.parse
+from typing import Optional
+from job_triage import load_triage_rules, read_cards
+from session_manager import SessionManager
+from browser_service import lease_context, get_metrics
+from schema import migrate
+from db_pool import get_pool
+from linkedin_db import LinkedInJobsDB
+from storage import JobStore, database_url, is_postgres, redact
+from job_fingerprint import job_fingerprint, canonical_job_url
+from near_duplicates import index_jobs
+from search_index import sync_search_index
+from dimensions import resolve_id
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
@@ -17,6 +30,144 @@ def human_wait(min_time=1, max_time=2):
     print(f"[WAIT] Sleeping for {wait_time:.2f} seconds...")
     time.sleep(wait_time)
 
+# LinkedIn shows 25 results per search page
+RESULTS_PER_PAGE = 25
+
+# Results list items carry this attribute even while LinkedIn keeps them occluded (empty)
+RESULTS_CARD_SELECTOR = "[data-occludable-job-id]"
+
+# Finds the scrollable container that owns the result cards, scrolls it by one viewport
+# (when asked) and reports how many cards have actually rendered their contents.
+RESULTS_LIST_STATE_JS = """
+({cardSelector, scroll}) => {
+    const cards = Array.from(document.querySelectorAll(cardSelector));
+    const isScrollable = (el) => {
+        const style = window.getComputedStyle(el);
+        return /(auto|scroll)/.test(style.overflowY) && el.scrollHeight > el.clientHeight;
+    };
+    let container = null;
+    let el = cards.length ? cards[0].parentElement : null;
+    while (el && el !== document.body) {
+        if (isScrollable(el)) { container = el; break; }
+        el = el.parentElement;
+    }
+    if (!container) {
+        container = document.querySelector('.jobs-search-results-list, .scaffold-layout__list')
+            || document.scrollingElement;
+    }
+    if (scroll) {
+        container.scrollTop = container.scrollTop + Math.max(container.clientHeight * 0.8, 200);
+    }
+    const rendered = cards.filter((card) => card.querySelector("a[href*='/jobs/view/']")
+        || card.innerText.trim().length > 0).length;
+    const atBottom = container.scrollTop + container.clientHeight >= container.scrollHeight - 2;
+    return {
+        total: cards.length,
+        rendered: rendered,
+        scrollHeight: container.scrollHeight,
+        atEnd: atBottom && rendered >= cards.length,
+    };
+}
+"""
+
+# Resolves once the list has grown (more cards rendered or a taller container) since `prev`
+RESULTS_LIST_GREW_JS = """
+({cardSelector, prev}) => {
+    const cards = Array.from(document.querySelectorAll(cardSelector));
+    const rendered = cards.filter((card) => card.querySelector("a[href*='/jobs/view/']")
+        || card.innerText.trim().length > 0).length;
+    return rendered > prev.rendered || cards.length > prev.total;
+}
+"""
+
+def scroll_results_list(page, target_count, step_timeout=3000, max_steps=60):
+    """Scroll the results list container until target_count cards have rendered or the list ends"""
+    args = {"cardSelector": RESULTS_CARD_SELECTOR, "scroll": False}
+    state = page.evaluate(RESULTS_LIST_STATE_JS, args)
+    print(f"[SCROLL] {state['rendered']}/{state['total']} cards rendered, need {target_count}")
+
+    steps = 0
+    while state['rendered'] < target_count and not state['atEnd'] and steps < max_steps:
+        steps += 1
+        args["scroll"] = True
+        state = page.evaluate(RESULTS_LIST_STATE_JS, args)
+        if state['rendered'] >= target_count or state['atEnd']:
+            break
+
+        # Wait for lazy-loaded cards instead of sleeping a fixed amount
+        try:
+            page.wait_for_function(
+                RESULTS_LIST_GREW_JS,
+                arg={"cardSelector": RESULTS_CARD_SELECTOR, "prev": state},
+                timeout=step_timeout
+            )
+        except Exception:
+            args["scroll"] = False
+            settled = page.evaluate(RESULTS_LIST_STATE_JS, args)
+            if settled['rendered'] == state['rendered'] and settled['scrollHeight'] == state['scrollHeight']:
+                # Nothing new arrived; only stop if the container cannot scroll any further
+                if settled['atEnd'] or settled['rendered'] >= settled['total']:
+                    state = settled
+                    break
+            state = settled
+
+    args["scroll"] = False
+    state = page.evaluate(RESULTS_LIST_STATE_JS, args)
+    end_note = " (end of list)" if state['atEnd'] else ""
+    print(f"[SCROLL] {state['rendered']}/{state['total']} cards rendered after {steps} step(s){end_note}")
+    return state['rendered']
+
+DESCRIPTION_SELECTORS = [
+    "div.jobs-description-content__text",
+    "div.jobs-box__html-content",
+    "main#main > div:nth-child(1) > div:nth-child(2) > div:nth-child(2) > div:nth-child(1) > div:nth-child(2) > div:nth-child(1) > div:nth-child(2) > div:nth-child(1) > div:nth-child(1)",  # Your collected selector
+    ".jobs-description__content"
+]
+
+def extract_description(page):
+    """Extract the job description from the currently loaded job details pane or page"""
+    for selector in DESCRIPTION_SELECTORS:
+        desc_elem = page.query_selector(selector)
+        if desc_elem:
+            print(f"[DESCRIPTION] Found with selector: {selector}")
+            return desc_elem.inner_text().strip()
+    return None
+
+def build_card_stub(card_info, search_config):
+    """Build a job record from card-level data only; the description is fetched later"""
+    job_id = card_info.get('job_id')
+    return {
+        "title": card_info.get('title'),
+        "company": card_info.get('company'),
+        "location": card_info.get('location') or "Location not specified",
+        "description": None,
+        "url": f"https://www.linkedin.com/jobs/view/{job_id}/" if job_id else None,
+        "search_keywords": search_config["keywords"],
+        "search_location": search_config["location"],
+        "search_date_posted": search_config["date_posted"],
+        "experience_level": search_config["experience_level"],
+        "job_type": search_config["job_type"],
+        "work_model": search_config["work_model"],
+        "description_pending": 1
+    }
+
+def card_fingerprint(card_info):
+    """The fingerprint a card's job is stored under, or None for a card without a job id"""
+    job_id = card_info.get('job_id')
+    if not job_id:
+        return None
+    return job_fingerprint(card_info.get('title'), card_info.get('company'), card_info.get('location'),
+                           f"https://www.linkedin.com/jobs/view/{job_id}/")
+
+def card_positions(card_infos):
+    """{fingerprint: 1-based position on the results page} for the cards with a job id"""
+    positions = {}
+    for position, card_info in enumerate(card_infos, 1):
+        fingerprint = card_fingerprint(card_info)
+        if fingerprint and fingerprint not in positions:
+            positions[fingerprint] = position
+    return positions
+
 def load_cookies(context, cookie_file=None):
     if cookie_file is None:
         cookie_file = os.path.join(DATA_DIR, "cookies.json")
@@ -234,73 +385,27 @@ def build_linkedin_url(config):
     return url
 
 def setup_database():
-    """Setup SQLite database"""
+    """
+    Setup the jobs database. Returns (connection, cursor) for the local SQLite file, or
+    (store, None) when JOBS_DATABASE_URL points at a shared PostgreSQL store.
+    """
     try:
+        url = database_url()
+        if is_postgres(url):
+            store = LinkedInJobsDB(url)
+            if not store.connect() or not store.create_tables():
+                store.disconnect()
+                return None, None
+            print(f"[DB] Using shared store {redact(url)}")
+            return store, None
         db_path = os.path.join(DATA_DIR, 'linkedin_jobs.db')
-        conn = sqlite3.connect(db_path)
+        # WAL-mode pooled connection, so the API can keep reading while we write
+        conn = get_pool(db_path).acquire()
         cursor = conn.cursor()
         
-        # Create jobs table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                company TEXT NOT NULL,
-                location TEXT,
-                description TEXT,
-                url TEXT UNIQUE,
-                search_keywords TEXT,
-                search_location TEXT,
-                search_date_posted TEXT,
-                search_experience_level TEXT,
-                search_job_type TEXT,
-                search_work_model TEXT,
-                scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status TEXT DEFAULT 'new',
-                liked BOOLEAN DEFAULT 0,
-                resume_created BOOLEAN DEFAULT 0,
-                cover_letter_created BOOLEAN DEFAULT 0,
-                applied BOOLEAN DEFAULT 0,
-                notes TEXT,
-                salary_min REAL,
-                salary_max REAL,
-                salary_currency TEXT,
-                job_type TEXT,
-                experience_level TEXT,
-                work_model TEXT
-            )
-        ''')
-        
-        # Create job status history table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS job_status_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_id INTEGER,
-                status TEXT,
-                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                notes TEXT,
-                FOREIGN KEY (job_id) REFERENCES jobs (id)
-            )
-        ''')
-        
-        # Create search history table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS search_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                keywords TEXT,
-                location TEXT,
-                date_posted TEXT,
-                experience_level TEXT,
-                job_type TEXT,
-                work_model TEXT,
-                jobs_found INTEGER,
-                jobs_scraped INTEGER,
-                search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        print("[DB] Database setup complete")
+        # Create or upgrade the schema
+        version = migrate(conn)
+        print(f"[DB] Database setup complete (schema version {version})")
         return conn, cursor
     except Exception as e:
         print(f"[DB ERROR] Failed to setup database: {e}")
@@ -309,45 +414,48 @@ def setup_database():
 def save_to_database(cursor, conn, job_data):
     """Save job data to SQLite database with duplicate checking"""
     try:
-        # Check if job already exists by title and company (more reliable than URL)
-        check_query = "SELECT id FROM jobs WHERE title = ? AND company = ?"
-        cursor.execute(check_query, (job_data.get('title'), job_data.get('company')))
+        # The fingerprint is the LinkedIn job id when the URL has one (search page URLs carry
+        # tracking parameters), otherwise a hash of title, company and location
+        fingerprint = job_fingerprint(job_data.get('title'), job_data.get('company'),
+                                      job_data.get('location'), job_data.get('url'))
+        cursor.execute("SELECT id FROM jobs WHERE fingerprint = ?", (fingerprint,))
         existing_job = cursor.fetchone()
         
         if existing_job:
             print(f"[DB] Job already exists in database (ID: {existing_job[0]}) - skipping")
             return existing_job[0]
         
-        # Also check by URL as backup
-        check_url_query = "SELECT id FROM jobs WHERE url = ?"
-        cursor.execute(check_url_query, (job_data.get('url'),))
-        existing_job_by_url = cursor.fetchone()
-        
-        if existing_job_by_url:
-            print(f"[DB] Job with this URL already exists (ID: {existing_job_by_url[0]}) - skipping")
-            return existing_job_by_url[0]
-        
         # Insert new job with search fields
         insert_query = """
-        INSERT INTO jobs (title, company, location, description, url, search_keywords, search_location, search_date_posted, search_experience_level, search_job_type, search_work_model)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO jobs (title, company, location, company_id, location_id, url, fingerprint, search_keywords, search_location, search_date_posted, search_experience_level, search_job_type, search_work_model, description_pending)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         
         cursor.execute(insert_query, (
             job_data.get('title'),
             job_data.get('company'),
             job_data.get('location'),
-            job_data.get('description'),
-            job_data.get('url'),
+            resolve_id(cursor, 'company', job_data.get('company')),
+            resolve_id(cursor, 'location', job_data.get('location')),
+            canonical_job_url(job_data.get('url')),
+            fingerprint,
             job_data.get('search_keywords'),
             job_data.get('search_location'),
             job_data.get('search_date_posted'),
             job_data.get('experience_level'),
             job_data.get('job_type'),
-            job_data.get('work_model')
+            job_data.get('work_model'),
+            job_data.get('description_pending', 0)
         ))
         
         job_id = cursor.lastrowid
+        # The description is stored apart from the jobs row (see schema migration 7)
+        if job_data.get('description'):
+            cursor.execute("INSERT INTO job_details (job_id, description) VALUES (?, compress_description(?))",
+                           (job_id, job_data['description']))
+        # Search index and preview, then cluster it with near-duplicate postings already stored
+        sync_search_index(conn)
+        index_jobs(conn, [job_id])
         conn.commit()
         print(f"[DB] Saved new job to database with ID: {job_id}")
         return job_id
@@ -365,13 +473,39 @@ def save_to_database(cursor, conn, job_data):
         conn.rollback()
         return None
 
-def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
+def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None, triage_rules=None, list_only=False,
+                         headless=False, slow_mo: Optional[int] = None):
+    """
+    Scrape LinkedIn jobs for a search.
+
+    slow_mo is the delay in milliseconds added to every browser operation; by default 50 for a
+    visible browser, so its actions can be followed, and 0 for headless batch runs.
+
+    In list_only mode no cards are clicked: card-level stubs (title, company, location, URL) are
+    stored with description_pending set, and description_fetcher fills descriptions in later.
+
+    The browser context is leased from the shared browser service when it is running
+    (see browser_service.py).
+    """
     if cookie_file is None:
         cookie_file = os.path.join(DATA_DIR, "cookies.json")
+    if slow_mo is None:
+        slow_mo = 0 if headless else 50
+    # Card triage is on by default; pass triage_rules=False to click cards in page order
+    if triage_rules is None:
+        triage_rules = load_triage_rules()
     # Setup database
     db_conn, db_cursor = setup_database()
     if not db_conn:
         print("[WARNING] Database connection failed. Jobs will only be saved to files.")
+    # Bulk saves, the search run and its sightings go through the store API on either backend
+    jobs_db = None
+    if isinstance(db_conn, JobStore):
+        jobs_db = db_conn
+    elif db_conn:
+        jobs_db = LinkedInJobsDB()
+        if not jobs_db.connect():
+            jobs_db = None
     
     # Get search configuration if not provided
     if not search_config:
@@ -381,27 +515,37 @@ def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
     search_url = build_linkedin_url(search_config)
     print(f"[SEARCH] Using URL: {search_url}")
     
-    with sync_playwright() as p:
-        print("[BROWSER] Launching browser in headful mode...")
-        browser = p.chromium.launch(headless=False, slow_mo=50)
-        context = browser.new_context()
+    session = SessionManager(cookie_file)
+    print(f"[BROWSER] Leasing {'headless' if headless else 'headful'} browser context (slow_mo={slow_mo})...")
+    with sync_playwright() as p, lease_context(p, headless=headless, slow_mo=slow_mo,
+                                               new_context=session.new_context) as context:
         page = context.new_page()
 
-        # Try to load cookies and check login
-        load_cookies(context, cookie_file)
-        page = context.new_page()
-        if not is_logged_in(page):
+        # Check cookie expiry offline; the first search page confirms the session for free
+        logged_in = session.is_locally_valid()
+        if logged_in:
+            print(f"[NAVIGATE] Going to LinkedIn jobs page with custom search...")
+            page.goto(search_url)
+            logged_in = session.verify_page(page)
+        if not logged_in:
             page.goto("https://www.linkedin.com/login")
             if not manual_login(page, context, cookie_file):
                 print("[EXIT] Could not log in. Exiting.")
-                browser.close()
                 return
+            session.save(context)
+            print(f"[NAVIGATE] Going to LinkedIn jobs page with custom search...")
+            page.goto(search_url)
         else:
             print("[LOGIN] Using existing session.")
 
-        print(f"[NAVIGATE] Going to LinkedIn jobs page with custom search...")
-        page.goto(search_url)
-        human_wait(1, 2 )
+        try:
+            page.wait_for_selector(RESULTS_CARD_SELECTOR, timeout=10000)
+        except Exception:
+            print("[NAVIGATE] Results list did not appear within 10 seconds")
+
+        # Every stored job this run's result pages show is linked to its search_history row
+        search_id = jobs_db.start_search(search_config) if jobs_db else None
+        seen_fingerprints = set()
 
         job_data = []
         jobs_scraped = 0
@@ -412,16 +556,20 @@ def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
         while jobs_scraped < num_jobs and current_page <= max_pages:
             print(f"\n[PAGE] Processing page {current_page}...")
             
-            # Scroll to load more jobs if needed
-            if current_page == 1:
-                print(f"[SCROLL] Scrolling to load more jobs...")
-                for scroll_attempt in range(3):
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    human_wait(1, 2 )
-                    print(f"[SCROLL] Scroll attempt {scroll_attempt + 1}/3")
-            
+            # Scroll the results list until enough cards for the remaining quota have rendered.
+            # Triage ranks the whole page, so it needs every card on the page rendered first.
+            cards_wanted = num_jobs - jobs_scraped
+            if triage_rules or list_only:
+                cards_wanted = max(cards_wanted, RESULTS_PER_PAGE)
+            print(f"[SCROLL] Loading job cards for the remaining {num_jobs - jobs_scraped} job(s)...")
+            try:
+                scroll_results_list(page, cards_wanted)
+            except Exception as e:
+                print(f"[SCROLL] Error while scrolling results list: {e}")
+
             # Try multiple selectors for job cards
             job_cards = []
+            card_infos = []
             selectors_to_try = [
                 # Modern LinkedIn selectors
                 "ul.jobs-search__results-list li",
@@ -449,6 +597,22 @@ def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
                 job_cards = page.query_selector_all(selector)
                 if job_cards:
                     print(f"[SUCCESS] Found {len(job_cards)} job cards with selector: {selector}")
+                    # Card text and job ids in one round-trip, for triage and sighting records
+                    card_infos = read_cards(page, selector)
+                    
+                    # Drop cards LinkedIn has not rendered yet (occluded placeholders) in one round-trip
+                    try:
+                        rendered_flags = page.eval_on_selector_all(
+                            selector,
+                            "els => els.map(e => !!(e.querySelector(\"a[href*='/jobs/view/']\") || e.innerText.trim()))"
+                        )
+                        if len(rendered_flags) == len(job_cards):
+                            if len(card_infos) == len(job_cards):
+                                card_infos = [info for info, rendered in zip(card_infos, rendered_flags) if rendered]
+                            job_cards = [card for card, rendered in zip(job_cards, rendered_flags) if rendered]
+                            print(f"[SUCCESS] {len(job_cards)} of those cards are rendered")
+                    except Exception as e:
+                        print(f"[SELECTOR] Could not check rendered cards: {e}")
                     
                     # Debug: Show first few job cards
                     for i, card in enumerate(job_cards[:3]):
@@ -489,6 +653,32 @@ def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
 
             print(f"[SCRAPE] Found {len(job_cards)} job cards on page {current_page}")
             
+            # Sightings from card data alone: jobs already stored are recorded for this search
+            # without opening them, and a full scrape skips them instead of clicking through again
+            page_positions = card_positions(card_infos)
+            seen_fingerprints.update(page_positions)
+            if search_id and page_positions:
+                known = jobs_db.known_job_ids(page_positions)
+                jobs_db.record_search_hits(search_id, [(job_id, current_page, page_positions[fingerprint])
+                                                       for fingerprint, job_id in known.items()])
+                print(f"[HITS] {len(known)} of {len(page_positions)} job(s) on page {current_page} already stored")
+                if known and not list_only and len(card_infos) == len(job_cards):
+                    unseen = [index for index, info in enumerate(card_infos) if card_fingerprint(info) not in known]
+                    job_cards = [job_cards[index] for index in unseen]
+                    card_infos = [card_infos[index] for index in unseen]
+                    print(f"[HITS] Skipping {len(known)} known job(s), {len(job_cards)} card(s) left")
+            
+            # Triage cards before spending any clicks on them
+            if triage_rules and card_infos and len(card_infos) == len(job_cards):
+                accepted, rejected = triage_rules.rank_cards(card_infos)
+                for index, reason in rejected:
+                    print(f"[TRIAGE] Skipping '{card_infos[index]['title']}' at {card_infos[index]['company']}: {reason}")
+                for index, score in accepted[:num_jobs - jobs_scraped]:
+                    print(f"[TRIAGE] Score {score:.1f}: '{card_infos[index]['title']}' at {card_infos[index]['company']}")
+                job_cards = [job_cards[index] for index, score in accepted]
+                card_infos = [card_infos[index] for index, score in accepted]
+                print(f"[TRIAGE] {len(accepted)} card(s) accepted, {len(rejected)} rejected on page {current_page}")
+            
             # Calculate how many jobs to scrape from this page
             jobs_needed = num_jobs - jobs_scraped
             jobs_on_this_page = min(jobs_needed, len(job_cards))
@@ -496,8 +686,32 @@ def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
             print(f"[SCRAPE] Will scrape {jobs_on_this_page} jobs from page {current_page}")
             print(f"[SCRAPE] Total jobs needed: {num_jobs}, already scraped: {jobs_scraped}")
             
-            # Scrape jobs from current page
-            for i, job in enumerate(job_cards[:jobs_on_this_page]):
+            if list_only:
+                # Store card-level stubs without opening any job details
+                page_stubs = []
+                stub_positions = []
+                for card_info in card_infos[:jobs_on_this_page]:
+                    job_info = build_card_stub(card_info, search_config)
+                    if not job_info["url"] or not job_info["title"]:
+                        print(f"[LIST-ONLY] Skipping card without a job id or title: {card_info}")
+                        continue
+                    job_data.append(job_info)
+                    page_stubs.append(job_info)
+                    stub_positions.append(page_positions.get(card_fingerprint(card_info)))
+                    print(f"[LIST-ONLY] Stub: {job_info['title']} at {job_info['company']}")
+                # One bulk upsert per results page instead of a round of queries per card
+                if jobs_db and page_stubs:
+                    try:
+                        outcomes = jobs_db.save_jobs(page_stubs)
+                        if search_id:
+                            jobs_db.record_search_hits(search_id, [
+                                (job_id, current_page, position)
+                                for (outcome, job_id), position in zip(outcomes, stub_positions)
+                            ])
+                    except Exception as e:
+                        print(f"[DB] Failed to store stubs for page {current_page}: {e}")
+            # Scrape jobs from current page (list-only pages were stored from their cards above)
+            for i, job in enumerate([] if list_only else job_cards[:jobs_on_this_page]):
                 print(f"\n[SCRAPE] Processing job {jobs_scraped + i + 1}/{num_jobs} (page {current_page})...")
                 
                 try:
@@ -687,19 +901,7 @@ def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
                     print(f"[LOCATION] Final location: '{location}'")
                     
                     # Description - try multiple selectors
-                    description = None
-                    description_selectors = [
-                        "div.jobs-description-content__text",
-                        "div.jobs-box__html-content",
-                        "main#main > div:nth-child(1) > div:nth-child(2) > div:nth-child(2) > div:nth-child(1) > div:nth-child(2) > div:nth-child(1) > div:nth-child(2) > div:nth-child(1) > div:nth-child(1)",  # Your collected selector
-                        ".jobs-description__content"
-                    ]
-                    for selector in description_selectors:
-                        desc_elem = page.query_selector(selector)
-                        if desc_elem:
-                            description = desc_elem.inner_text().strip()
-                            print(f"[DESCRIPTION] Found with selector: {selector}")
-                            break
+                    description = extract_description(page)
 
                     # Get current URL (job link)
                     job_url = page.url
@@ -722,8 +924,20 @@ def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
                     job_data.append(job_info)
                     
                     # Save to database if connection is available
-                    if db_conn and db_cursor:
-                        save_to_database(db_cursor, db_conn, job_info)
+                    saved_id = None
+                    if isinstance(db_conn, JobStore):
+                        # The shared store takes the same bulk upsert as list-only pages
+                        try:
+                            saved_id = db_conn.save_jobs([job_info])[0][1]
+                        except Exception as e:
+                            print(f"[DB] Error saving to database: {e}")
+                    elif db_conn and db_cursor:
+                        saved_id = save_to_database(db_cursor, db_conn, job_info)
+                    if search_id and saved_id:
+                        position = None
+                        if len(card_infos) == len(job_cards):
+                            position = page_positions.get(card_fingerprint(card_infos[i]))
+                        jobs_db.record_search_hits(search_id, [(saved_id, current_page, position)])
                     
                     print(f"\n[SUCCESS] Scraped job data:")
                     print(f"  Title: {title}")
@@ -895,7 +1109,7 @@ def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
         
         # Save to CSV
         with open(os.path.join(DATA_DIR, "linkedin_jobs.csv"), "w", newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['title', 'company', 'location', 'description', 'url', 'search_keywords', 'search_location', 'search_date_posted', 'experience_level', 'job_type', 'work_model'])
+            writer = csv.DictWriter(f, fieldnames=['title', 'company', 'location', 'description', 'url', 'search_keywords', 'search_location', 'search_date_posted', 'experience_level', 'job_type', 'work_model', 'description_pending'])
             writer.writeheader()
             for job in job_data:
                 writer.writerow(job)
@@ -904,17 +1118,38 @@ def scrape_linkedin_jobs(cookie_file=None, num_jobs=5, search_config=None):
         print(f"\n[COMPLETE] Scraped {len(job_data)} jobs from {current_page} page(s)!")
         print(f"[SEARCH] Search criteria: {search_config['keywords']} in {search_config['location']}")
         
+        if search_id:
+            totals = jobs_db.finish_search(search_id, len(seen_fingerprints))
+            if totals.get('jobs_found'):
+                found, added = totals['jobs_found'], totals['jobs_scraped']
+                print(f"[HITS] This search showed {found} job(s), {added} of them new ({added / found:.0%} yield)")
+        
         # Close database connection
-        if db_conn:
+        if jobs_db is not None and jobs_db is not db_conn:
+            jobs_db.disconnect()
+        if isinstance(db_conn, JobStore):
+            db_conn.disconnect()
+            print("[DB] Shared store connection closed")
+        elif db_conn:
             db_conn.close()
             print("[DB] SQLite database connection closed")
         
-        print("[BROWSER] Browser will remain open for manual inspection. Close it when done.")
-        print("[BROWSER] Press Enter to close the browser...")
-        input()  # Wait for user input before closing
-        browser.close()
+        metrics = get_metrics()
+        if metrics['service_leases']:
+            print(f"[BROWSER] Shared browser saved {metrics['launch_seconds_saved']:.2f}s of launch time")
+        
+        if not headless:
+            print("[BROWSER] Browser will remain open for manual inspection. Close it when done.")
+            print("[BROWSER] Press Enter to close the browser...")
+            input()  # Wait for user input before closing
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape LinkedIn jobs into the jobs database")
+    parser.add_argument("--headless", action="store_true", help="run the browser without a window")
+    parser.add_argument("--slow-mo", type=int, default=None,
+                        help="milliseconds added to every browser operation (default: 0 headless, 50 otherwise)")
+    args = parser.parse_args()
+
     # Choose which account to use
     print("Choose LinkedIn account:")
     print("1. Main account (data/cookies.json)")
@@ -932,5 +1167,11 @@ if __name__ == "__main__":
     except ValueError:
         num_jobs = 5
     
-    print(f"[SCRAPE] Will scrape {num_jobs} jobs")
-    scrape_linkedin_jobs(cookie_file, num_jobs)
+    # Full scrape clicks every card; list-only stores card stubs and fetches descriptions later
+    print("Scrape mode:")
+    print("1. Full (open every job for its description)")
+    print("2. List-only (fast, descriptions fetched on demand)")
+    list_only = input("Choose mode (1 or 2, default: 1): ").strip() == "2"
+
+    print(f"[SCRAPE] Will scrape {num_jobs} jobs{' (list-only)' if list_only else ''}")
+    scrape_linkedin_jobs(cookie_file, num_jobs, list_only=list_only, headless=args.headless, slow_mo=args.slow_mo)
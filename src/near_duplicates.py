@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection Module
+MinHash signatures of description shingles, bucketed into an LSH index stored in the database
+(job_minhash and job_lsh_bands, see schema migration 5). Reposts of the same role under a
+slightly different title or location land in the same cluster, so tailored documents can be
+reused instead of generated again.
+
+Usage:
+    python near_duplicates.py index [db_path]                  # index jobs not indexed yet
+    python near_duplicates.py rebuild [--threshold 0.8] [db_path]
+    python near_duplicates.py clusters [db_path]
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import sys
+import time
+from typing import Dict, List, Optional, Set
+
+from job_triage import normalize_text
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+SHINGLE_SIZE = 5          # words per shingle
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 8             # 8 bands of 8 rows: pairs above ~0.77 similarity usually share a bucket
+ROWS_PER_BAND = NUM_PERMUTATIONS // LSH_BANDS
+DEFAULT_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def _permutations(count: int):
+    """Deterministic (a, b) pairs for the hash family (a * x + b) mod p; must never change"""
+    params = []
+    for i in range(count):
+        digest = hashlib.sha1(f"minhash-{i}".encode()).digest()
+        a = int.from_bytes(digest[:8], 'little') % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:16], 'little') % _MERSENNE_PRIME
+        params.append((a, b))
+    return params
+
+PERMUTATIONS = _permutations(NUM_PERMUTATIONS)
+
+def shingles(text: Optional[str]) -> Set[int]:
+    """32-bit hashes of the overlapping word shingles in a description"""
+    words = re.findall(r"\w+", normalize_text(text))
+    if len(words) < SHINGLE_SIZE:
+        return {_hash32(" ".join(words))} if words else set()
+    return {_hash32(" ".join(words[i:i + SHINGLE_SIZE])) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def _hash32(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=4).digest(), 'little')
+
+def minhash(text: Optional[str]) -> Optional[List[int]]:
+    """MinHash signature of a description, or None when there is nothing to hash"""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH for a, b in PERMUTATIONS]
+
+def similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / NUM_PERMUTATIONS
+
+def band_buckets(signature: List[int]) -> List[int]:
+    """One bucket key per LSH band (signed 64-bit so it fits an SQLite INTEGER)"""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f"<{ROWS_PER_BAND}I", *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+def _pack(signature: List[int]) -> bytes:
+    return struct.pack(f"<{NUM_PERMUTATIONS}I", *signature)
+
+def _unpack(blob: bytes) -> List[int]:
+    return list(struct.unpack(f"<{NUM_PERMUTATIONS}I", blob))
+
+def index_job(conn: sqlite3.Connection, job_id: int, description: Optional[str],
+              threshold: float = DEFAULT_THRESHOLD) -> Optional[int]:
+    """
+    Store a job's signature and LSH buckets and assign it to a cluster: the cluster of its most
+    similar indexed candidate at or above threshold, otherwise a new cluster named after itself.
+    Runs inside the caller's transaction. Returns the cluster id, or None without a description.
+    """
+    signature = minhash(description)
+    if signature is None:
+        return None
+    buckets = band_buckets(signature)
+    cursor = conn.cursor()
+
+    # Joining the probe rows seeks the (band, bucket) key once per band; a row-value IN list
+    # would be checked against every row of job_lsh_bands
+    cursor.execute(f'''
+        SELECT m.job_id, m.signature, m.cluster_id
+        FROM job_minhash m
+        WHERE m.job_id IN (
+            SELECT job_lsh_bands.job_id
+            FROM (VALUES {",".join(["(?, ?)"] * LSH_BANDS)}) AS probe
+            JOIN job_lsh_bands ON job_lsh_bands.band = probe.column1 AND job_lsh_bands.bucket = probe.column2
+        ) AND m.job_id != ?
+    ''', [value for band, bucket in enumerate(buckets) for value in (band, bucket)] + [job_id])
+
+    cluster_id, best = job_id, 0.0
+    for candidate_id, blob, candidate_cluster in cursor.fetchall():
+        score = similarity(signature, _unpack(blob))
+        if score >= threshold and score > best:
+            cluster_id, best = candidate_cluster, score
+
+    if cluster_id != job_id:
+        print(f"[DEDUP] Job {job_id} looks like a repost in cluster {cluster_id} (similarity {best:.2f})")
+    cursor.execute(
+        "INSERT OR REPLACE INTO job_minhash (job_id, signature, cluster_id, similarity) VALUES (?, ?, ?, ?)",
+        (job_id, _pack(signature), cluster_id, round(best, 3) if cluster_id != job_id else None)
+    )
+    cursor.execute("DELETE FROM job_lsh_bands WHERE job_id = ?", (job_id,))
+    cursor.executemany(
+        "INSERT OR IGNORE INTO job_lsh_bands (band, bucket, job_id) VALUES (?, ?, ?)",
+        [(band, bucket, job_id) for band, bucket in enumerate(buckets)]
+    )
+    return cluster_id
+
+def index_pending(conn: sqlite3.Connection, threshold: float = DEFAULT_THRESHOLD) -> int:
+    """Index every job with a description but no signature yet (new rows, changed descriptions)"""
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT job_details.job_id, description_text(job_details.description) FROM job_details
+        LEFT JOIN job_minhash ON job_minhash.job_id = job_details.job_id
+        WHERE job_minhash.job_id IS NULL AND job_details.description IS NOT NULL AND job_details.description != ''
+        ORDER BY job_details.job_id
+    ''')
+    pending = cursor.fetchall()
+    for job_id, description in pending:
+        index_job(conn, job_id, description, threshold)
+    return len(pending)
+
+def index_jobs(conn: sqlite3.Connection, job_ids: List[int], threshold: float = DEFAULT_THRESHOLD) -> int:
+    """Index the given jobs if they have a description and no signature yet (insert-time hook)"""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return 0
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT job_id, description_text(description) FROM job_details
+        WHERE job_id IN ({",".join("?" * len(job_ids))})
+          AND description IS NOT NULL AND description != ''
+          AND job_id NOT IN (SELECT job_id FROM job_minhash)
+        ORDER BY job_id
+    ''', job_ids)
+    pending = cursor.fetchall()
+    for job_id, description in pending:
+        index_job(conn, job_id, description, threshold)
+    return len(pending)
+
+def rebuild(conn: sqlite3.Connection, threshold: float = DEFAULT_THRESHOLD) -> int:
+    """Drop the index and re-cluster the whole table, oldest job first. Returns jobs indexed."""
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM job_lsh_bands")
+    cursor.execute("DELETE FROM job_minhash")
+    indexed = index_pending(conn, threshold)
+    conn.commit()
+    return indexed
+
+def get_cluster(conn: sqlite3.Connection, job_id: int) -> List[Dict]:
+    """Every other job in the same cluster as job_id, most similar first"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT cluster_id, signature FROM job_minhash WHERE job_id = ?", (job_id,))
+    row = cursor.fetchone()
+    if not row:
+        return []
+    signature = _unpack(row[1])
+    cursor.execute('''
+        SELECT jobs.id, jobs.title, jobs.company, jobs.location, jobs.scraped_at,
+               job_documents.resume_json IS NOT NULL AS has_resume,
+               job_documents.cover_letter_json IS NOT NULL AS has_cover_letter,
+               job_minhash.signature
+        FROM job_minhash JOIN jobs ON jobs.id = job_minhash.job_id
+        LEFT JOIN job_documents ON job_documents.job_id = jobs.id
+        WHERE job_minhash.cluster_id = ? AND job_minhash.job_id != ?
+    ''', (row[0], job_id))
+    columns = [description[0] for description in cursor.description][:-1]
+    members = []
+    for member in cursor.fetchall():
+        info = dict(zip(columns, member[:-1]))
+        info['similarity'] = round(similarity(signature, _unpack(member[-1])), 3)
+        members.append(info)
+    members.sort(key=lambda member: member['similarity'], reverse=True)
+    return members
+
+def find_document_donor(conn: sqlite3.Connection, job_id: int, document_column: str,
+                        donor_id: Optional[int] = None) -> Optional[Dict]:
+    """
+    The most similar cluster member that already has resume_json or cover_letter_json
+    (only donor_id is considered when given), with that document attached.
+    """
+    if document_column not in ('resume_json', 'cover_letter_json'):
+        raise ValueError(f"Unknown document column '{document_column}'")
+    flag = 'has_resume' if document_column == 'resume_json' else 'has_cover_letter'
+    for member in get_cluster(conn, job_id):
+        if member[flag] and donor_id in (None, member['id']):
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {document_column} FROM job_documents WHERE job_id = ?", (member['id'],))
+            member[document_column] = cursor.fetchone()[0]
+            return member
+    return None
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from description_codec import register_functions
+    from schema import migrate
+
+    parser = argparse.ArgumentParser(description="MinHash/LSH near-duplicate index over job descriptions")
+    parser.add_argument("command", choices=["index", "rebuild", "clusters"])
+    parser.add_argument("db_path", nargs="?", default=os.path.join(DATA_DIR, 'linkedin_jobs.db'))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    conn = register_functions(sqlite3.connect(args.db_path))
+    migrate(conn)
+
+    if args.command == "clusters":
+        rows = conn.execute('''
+            SELECT job_minhash.cluster_id, jobs.id, jobs.title, jobs.company, jobs.location
+            FROM job_minhash JOIN jobs ON jobs.id = job_minhash.job_id
+            WHERE job_minhash.cluster_id IN (
+                SELECT cluster_id FROM job_minhash GROUP BY cluster_id HAVING COUNT(*) > 1
+            )
+            ORDER BY job_minhash.cluster_id, jobs.id
+        ''').fetchall()
+        current = None
+        for cluster_id, job_id, title, company, location in rows:
+            if cluster_id != current:
+                print(f"\n[CLUSTER {cluster_id}]")
+                current = cluster_id
+            print(f"  {job_id}: {title} at {company} ({location})")
+        print(f"\n[DEDUP] {len({row[0] for row in rows})} cluster(s) with near-duplicate postings")
+    else:
+        started = time.perf_counter()
+        if args.command == "rebuild":
+            indexed = rebuild(conn, args.threshold)
+        else:
+            indexed = index_pending(conn, args.threshold)
+            conn.commit()
+        print(f"[DEDUP] Indexed {indexed} job(s) in {time.perf_counter() - started:.2f}s")
+
+    conn.close()
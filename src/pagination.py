@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Keyset Pagination Module
+Opaque cursors for paging job listings newest first. A page continues from the
+(scraped_at, id) of the last row shown, so it costs the same index seek at any depth,
+unlike LIMIT/OFFSET which walks past every earlier row.
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Opaque, URL-safe cursor token"""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Decode a token from encode_cursor. Raises ValueError for a malformed token."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
+
+def keyset_query(columns: str, from_clause: str, conditions: Sequence[str], params: Sequence[Any],
+                 cursor: Optional[Dict[str, Any]], limit: int, table: str = 'jobs') -> Tuple[str, List[Any]]:
+    """
+    SQL for one page ordered by scraped_at DESC, id DESC, fetching limit + 1 rows so the caller
+    can tell whether another page follows.
+
+    After a cursor the page is the union of two index seeks: the rest of the cursor's
+    scraped_at value (rows scraped in one batch share it) and everything older. A single
+    (scraped_at, id) < (?, ?) comparison would walk through the whole tied batch instead.
+    """
+    where = " AND ".join(conditions) if conditions else "1=1"
+    order = f"ORDER BY {table}.scraped_at DESC, {table}.id DESC"
+    fetch = limit + 1
+    if not cursor:
+        return f"SELECT {columns} FROM {from_clause} WHERE {where} {order} LIMIT ?", list(params) + [fetch]
+    try:
+        scraped_at, last_id = cursor['scraped_at'], int(cursor['id'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    sql = f'''
+        SELECT * FROM (
+            SELECT {columns} FROM {from_clause}
+            WHERE {where} AND {table}.scraped_at = ? AND {table}.id < ?
+            ORDER BY {table}.id DESC LIMIT ?
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT {columns} FROM {from_clause}
+            WHERE {where} AND {table}.scraped_at < ?
+            {order} LIMIT ?
+        )
+        ORDER BY scraped_at DESC, id DESC LIMIT ?
+    '''
+    return sql, list(params) + [scraped_at, last_id, fetch] + list(params) + [scraped_at, fetch, fetch]
+
+def split_page(rows: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched by keyset_query and build the cursor for the next page"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor({'scraped_at': last['scraped_at'], 'id': last['id']})
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL Schema Module
+The jobs schema for the shared PostgreSQL store (pg_store.py) as an ordered list of
+migrations, the counterpart of schema.py. The tables mirror the SQLite layout after its
+migrations: a narrow jobs row with description_preview, descriptions in job_details (large
+values are compressed by PostgreSQL's TOAST storage) and the generated documents in
+job_documents, plus canonical companies and locations with alias maps.
+
+Full-text search uses a weighted tsvector on jobs (title A, company B, location C,
+description D) with a GIN index, kept current by triggers. Near-duplicate clustering, the
+statistics counter tables and the change feed are SQLite features; PostgreSQL answers
+statistics with aggregate queries.
+
+Several hosts may call migrate() at once: each migration runs under a transaction-level
+advisory lock, and a host that waited finds the version applied and skips it.
+"""
+
+from typing import Callable, List, Tuple
+
+# pg_advisory_xact_lock key serializing migrations across hosts
+MIGRATION_LOCK = 0x6A6F6273
+
+# Timestamps are stored in UTC without fractional seconds, formatted like SQLite's CURRENT_TIMESTAMP
+UTC_NOW = "(now() AT TIME ZONE 'utc')"
+
+def _migration_1_base_tables(cursor):
+    """Jobs, their cold columns, status and search history, and the company/location dimensions"""
+    for dimension, table in (('company', 'companies'), ('location', 'locations')):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                id BIGSERIAL PRIMARY KEY,
+                name TEXT NOT NULL,
+                key TEXT NOT NULL UNIQUE
+            )
+        ''')
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {dimension}_aliases (
+                alias TEXT PRIMARY KEY,
+                {dimension}_id BIGINT NOT NULL REFERENCES {table} (id)
+            )
+        ''')
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{dimension}_aliases_{dimension} ON {dimension}_aliases ({dimension}_id)")
+
+    # Flags stay 0/1 integers as in SQLite, so the same filters and JSON work on both backends
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id BIGSERIAL PRIMARY KEY,
+            title TEXT NOT NULL,
+            company TEXT NOT NULL,
+            location TEXT,
+            url TEXT UNIQUE,
+            search_keywords TEXT,
+            search_location TEXT,
+            search_date_posted TEXT,
+            search_experience_level TEXT,
+            search_job_type TEXT,
+            search_work_model TEXT,
+            scraped_at TIMESTAMP(0) DEFAULT {UTC_NOW},
+            status TEXT DEFAULT 'new',
+            liked SMALLINT DEFAULT 0,
+            resume_created SMALLINT DEFAULT 0,
+            cover_letter_created SMALLINT DEFAULT 0,
+            applied SMALLINT DEFAULT 0,
+            notes TEXT,
+            salary_min DOUBLE PRECISION,
+            salary_max DOUBLE PRECISION,
+            salary_currency TEXT,
+            job_type TEXT,
+            experience_level TEXT,
+            work_model TEXT,
+            disliked SMALLINT DEFAULT 0,
+            description_pending SMALLINT DEFAULT 0,
+            resume_file_path TEXT,
+            cover_letter_file_path TEXT,
+            fingerprint TEXT UNIQUE,
+            description_preview TEXT,
+            company_id BIGINT REFERENCES companies (id),
+            location_id BIGINT REFERENCES locations (id),
+            search_vector TSVECTOR
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_details (
+            job_id BIGINT PRIMARY KEY REFERENCES jobs (id) ON DELETE CASCADE,
+            description TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_documents (
+            job_id BIGINT PRIMARY KEY REFERENCES jobs (id) ON DELETE CASCADE,
+            resume_json TEXT,
+            cover_letter_json TEXT
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS job_status_history (
+            id BIGSERIAL PRIMARY KEY,
+            job_id BIGINT REFERENCES jobs (id) ON DELETE CASCADE,
+            status TEXT,
+            changed_at TIMESTAMP(0) DEFAULT {UTC_NOW},
+            notes TEXT
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS search_history (
+            id BIGSERIAL PRIMARY KEY,
+            keywords TEXT,
+            location TEXT,
+            date_posted TEXT,
+            experience_level TEXT,
+            job_type TEXT,
+            work_model TEXT,
+            jobs_found INTEGER,
+            jobs_scraped INTEGER,
+            search_date TIMESTAMP(0) DEFAULT {UTC_NOW}
+        )
+    ''')
+
+def _migration_2_indexes(cursor):
+    """Indexes for the list, keyset page, flag-filter and facet access paths"""
+    # (scraped_at, id) serves keyset pages with a single row-comparison range scan
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs (scraped_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, scraped_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_liked ON jobs (scraped_at) WHERE liked = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_applied ON jobs (scraped_at) WHERE applied = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_disliked ON jobs (scraped_at) WHERE disliked = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_description_pending ON jobs (scraped_at) WHERE description_pending = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_company_id ON jobs (company_id, scraped_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_location_id ON jobs (location_id, scraped_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_status_history_job ON job_status_history (job_id)")
+
+def _migration_3_full_text_search(cursor):
+    """Weighted tsvector over title, company, location and description, with a GIN index"""
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION jobs_search_vector(title TEXT, company TEXT, location TEXT, description TEXT)
+        RETURNS TSVECTOR LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(company, '')), 'B')
+                || setweight(to_tsvector('english', coalesce(location, '')), 'C')
+                || setweight(to_tsvector('english', coalesce(description, '')), 'D')
+        $$
+    ''')
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION description_preview(body TEXT)
+        RETURNS TEXT LANGUAGE sql IMMUTABLE AS $$
+            SELECT CASE WHEN length(body) > 200 THEN substr(body, 1, 200) || '...' ELSE body END
+        $$
+    ''')
+    # Both triggers stand aside while pg_store.save_jobs sets jobs.bulk_load, which writes the
+    # preview and vector itself, once per job, instead of row by row
+
+    # A job's own columns changed: recompute with its stored description
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION jobs_search_before_write() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+        BEGIN
+            IF current_setting('jobs.bulk_load', true) = 'on' THEN
+                RETURN NEW;
+            END IF;
+            NEW.search_vector := jobs_search_vector(NEW.title, NEW.company, NEW.location,
+                (SELECT description FROM job_details WHERE job_id = NEW.id));
+            RETURN NEW;
+        END
+        $$
+    ''')
+    # A description was stored, changed or removed: refresh the preview and the vector
+    cursor.execute('''
+        CREATE OR REPLACE FUNCTION job_details_after_write() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+        DECLARE
+            job BIGINT := CASE WHEN TG_OP = 'DELETE' THEN OLD.job_id ELSE NEW.job_id END;
+            body TEXT := CASE WHEN TG_OP = 'DELETE' THEN NULL ELSE NEW.description END;
+        BEGIN
+            IF current_setting('jobs.bulk_load', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            UPDATE jobs SET
+                description_preview = description_preview(body),
+                search_vector = jobs_search_vector(title, company, location, body)
+            WHERE id = job;
+            RETURN NULL;
+        END
+        $$
+    ''')
+    cursor.execute("DROP TRIGGER IF EXISTS jobs_search_before_write ON jobs")
+    cursor.execute('''
+        CREATE TRIGGER jobs_search_before_write BEFORE INSERT OR UPDATE OF title, company, location ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_search_before_write()
+    ''')
+    cursor.execute("DROP TRIGGER IF EXISTS job_details_after_write ON job_details")
+    cursor.execute('''
+        CREATE TRIGGER job_details_after_write AFTER INSERT OR UPDATE OF description OR DELETE ON job_details
+        FOR EACH ROW EXECUTE FUNCTION job_details_after_write()
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_search_vector ON jobs USING GIN (search_vector)")
+    cursor.execute('''
+        UPDATE jobs SET search_vector = jobs_search_vector(jobs.title, jobs.company, jobs.location,
+            (SELECT description FROM job_details WHERE job_id = jobs.id))
+    ''')
+
+def _migration_4_search_hits(cursor):
+    """job_search_hits: which stored jobs each scraper run saw, for per-search yield"""
+    cursor.execute("ALTER TABLE search_history ADD COLUMN IF NOT EXISTS finished_at TIMESTAMP(0)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_search_history_date ON search_history (search_date)")
+    # No foreign keys: hits outlive the jobs they point at, as in the SQLite schema
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS job_search_hits (
+            search_id BIGINT NOT NULL,
+            job_id BIGINT NOT NULL,
+            page INTEGER,
+            position INTEGER,
+            is_new SMALLINT NOT NULL DEFAULT 0,
+            seen_at TIMESTAMP(0) DEFAULT {UTC_NOW},
+            PRIMARY KEY (search_id, job_id)
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_search_hits_job ON job_search_hits (job_id)")
+
+# Ordered list of (version, description, migration). Never edit or reorder an applied entry;
+# append a new one instead.
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "base tables and company/location dimensions", _migration_1_base_tables),
+    (2, "indexes for lists, keyset pages, flag filters and facets", _migration_2_indexes),
+    (3, "tsvector full-text search with a GIN index", _migration_3_full_text_search),
+    (4, "job_search_hits per-search sightings", _migration_4_search_hits),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def _lock(cursor):
+    """Serialize migrations across hosts until the current transaction ends"""
+    cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK,))
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP(0) DEFAULT {UTC_NOW}
+        )
+    ''')
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    return cursor.fetchone()[0] or 0
+
+def get_schema_version(conn) -> int:
+    """Current schema version of the database (0 for a new database)"""
+    with conn.cursor() as cursor:
+        version = _lock(cursor)
+    conn.commit()
+    return version
+
+def migrate(conn, target_version: int = LATEST_VERSION) -> int:
+    """
+    Apply every pending migration up to target_version, each in its own transaction.
+
+    Returns:
+        The schema version after migrating
+    """
+    conn.commit()
+    current = get_schema_version(conn)
+    if current >= target_version:
+        return current
+
+    with conn.cursor() as cursor:
+        for version, description, migration in MIGRATIONS:
+            if version <= current or version > target_version:
+                continue
+            try:
+                # Another host may have applied it while we waited for the lock
+                if _lock(cursor) >= version:
+                    conn.commit()
+                    current = version
+                    continue
+                migration(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                    (version, description)
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            print(f"[SCHEMA] Applied PostgreSQL migration {version}: {description}")
+            current = version
+    return current
@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+Database Schema Module
+Single definition of the LinkedIn jobs database schema as an ordered list of migrations.
+Every entry point (scraper, LinkedInJobsDB, API server, migrations/migrate.py) calls migrate()
+so databases of any age are brought up to the current version.
+"""
+
+import sqlite3
+from typing import Callable, Dict, List, Tuple
+
+def _columns(cursor, table: str) -> List[str]:
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [column[1] for column in cursor.fetchall()]
+
+def _add_missing_columns(cursor, table: str, columns: List[Tuple[str, str]]):
+    existing = _columns(cursor, table)
+    for name, definition in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+def _migration_1_base_tables(cursor):
+    """Base tables, including the columns older databases got from ad-hoc scripts"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            company TEXT NOT NULL,
+            location TEXT,
+            description TEXT,
+            url TEXT UNIQUE,
+            search_keywords TEXT,
+            search_location TEXT,
+            search_date_posted TEXT,
+            search_experience_level TEXT,
+            search_job_type TEXT,
+            search_work_model TEXT,
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'new',
+            liked BOOLEAN DEFAULT 0,
+            resume_created BOOLEAN DEFAULT 0,
+            cover_letter_created BOOLEAN DEFAULT 0,
+            applied BOOLEAN DEFAULT 0,
+            notes TEXT,
+            salary_min REAL,
+            salary_max REAL,
+            salary_currency TEXT,
+            job_type TEXT,
+            experience_level TEXT,
+            work_model TEXT
+        )
+    ''')
+    # Columns that used to be added by migrations/add_document_columns.py and friends
+    _add_missing_columns(cursor, 'jobs', [
+        ('disliked', 'BOOLEAN DEFAULT 0'),
+        ('description_pending', 'BOOLEAN DEFAULT 0'),
+        ('resume_json', 'TEXT'),
+        ('resume_file_path', 'TEXT'),
+        ('cover_letter_json', 'TEXT'),
+        ('cover_letter_file_path', 'TEXT'),
+    ])
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER,
+            status TEXT,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            notes TEXT,
+            FOREIGN KEY (job_id) REFERENCES jobs (id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS search_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            keywords TEXT,
+            location TEXT,
+            date_posted TEXT,
+            experience_level TEXT,
+            job_type TEXT,
+            work_model TEXT,
+            jobs_found INTEGER,
+            jobs_scraped INTEGER,
+            search_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _migration_2_indexes(cursor):
+    """Indexes for the dedup, list, stats and flag-filter access paths"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_title_company ON jobs (title, company)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON jobs (scraped_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_liked ON jobs (scraped_at) WHERE liked = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_applied ON jobs (scraped_at) WHERE applied = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_disliked ON jobs (scraped_at) WHERE disliked = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_description_pending ON jobs (scraped_at) WHERE description_pending = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_status_history_job ON job_status_history (job_id)")
+    cursor.execute("ANALYZE")
+
+def _migration_3_full_text_search(cursor):
+    """FTS5 index over title, company, location and description, kept in sync by triggers"""
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, company, location, description,
+            content='jobs', content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_after_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, company, location, description)
+            VALUES (new.id, new.title, new.company, new.location, new.description);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_after_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+            VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_after_update
+        AFTER UPDATE OF title, company, location, description ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+            VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+            INSERT INTO jobs_fts (rowid, title, company, location, description)
+            VALUES (new.id, new.title, new.company, new.location, new.description);
+        END
+    ''')
+    # Index the rows that existed before the triggers
+    cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+def _migration_4_fingerprint(cursor):
+    """Canonical fingerprint column, backfilled for existing rows and uniquely indexed"""
+    from job_fingerprint import job_fingerprint
+
+    _add_missing_columns(cursor, 'jobs', [('fingerprint', 'TEXT')])
+    cursor.execute("SELECT id, title, company, location, url FROM jobs WHERE fingerprint IS NULL ORDER BY id")
+    seen = set()
+    updates = []
+    duplicates = 0
+    for job_id, title, company, location, url in cursor.fetchall():
+        fingerprint = job_fingerprint(title, company, location, url)
+        # Older duplicates of the same posting keep a NULL fingerprint; the oldest row owns it
+        if fingerprint in seen:
+            duplicates += 1
+            continue
+        seen.add(fingerprint)
+        updates.append((fingerprint, job_id))
+    cursor.executemany("UPDATE jobs SET fingerprint = ? WHERE id = ?", updates)
+    if duplicates:
+        print(f"[SCHEMA] {duplicates} existing job(s) duplicate an older posting and were left without a fingerprint")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_fingerprint ON jobs (fingerprint)")
+
+def _migration_5_near_duplicates(cursor):
+    """MinHash signatures and LSH band buckets for near-duplicate clustering (near_duplicates.py)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_minhash (
+            job_id INTEGER PRIMARY KEY REFERENCES jobs (id),
+            signature BLOB NOT NULL,
+            cluster_id INTEGER NOT NULL,
+            similarity REAL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_minhash_cluster ON job_minhash (cluster_id)")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_lsh_bands (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, job_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_lsh_bands_job ON job_lsh_bands (job_id)")
+    # A changed or deleted description drops the signature; near_duplicates.index_pending re-adds it
+    for name, event in (('jobs_minhash_after_update', 'UPDATE OF description'), ('jobs_minhash_after_delete', 'DELETE')):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON jobs BEGIN
+                DELETE FROM job_lsh_bands WHERE job_id = old.id;
+                DELETE FROM job_minhash WHERE job_id = old.id;
+            END
+        ''')
+
+def _migration_6_stats_counters(cursor):
+    """Counter tables for job statistics, maintained by triggers (job_stats.py reads them)"""
+    from job_stats import FLAG_COLUMNS, VALUE_DIMENSIONS, rebuild_stats
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_stats (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_stats_top ON job_stats (dimension, count)")
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_daily_counts (
+            day TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    # The dimensions as of this version; migration 9 adds the company and location keys
+    _create_stats_triggers(cursor, VALUE_DIMENSIONS, VALUE_DIMENSIONS + FLAG_COLUMNS + ['scraped_at'])
+    rebuild_stats(cursor.connection, VALUE_DIMENSIONS)
+
+def _create_stats_triggers(cursor, dimensions: List[str], tracked_columns: List[str]):
+    """(Re)create the triggers that keep job_stats and job_daily_counts current"""
+    from job_stats import trigger_statements
+
+    triggers = [
+        ('jobs_stats_after_insert', 'INSERT', trigger_statements('new', 1, dimensions=dimensions)),
+        ('jobs_stats_after_delete', 'DELETE', trigger_statements('old', -1, dimensions=dimensions)),
+        ('jobs_stats_after_update', f"UPDATE OF {', '.join(tracked_columns)}",
+         trigger_statements('old', -1, changed_only=True, dimensions=dimensions)
+         + trigger_statements('new', 1, changed_only=True, dimensions=dimensions)),
+    ]
+    for name, event, statements in triggers:
+        body = "\n".join(statements)
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} AFTER {event} ON jobs BEGIN\n{body}\nEND")
+
+def _search_content_view(text: Callable[[str], str] = lambda value: value) -> str:
+    """The FTS external-content view; text() turns a stored description into plain text"""
+    return f'''
+        CREATE VIEW IF NOT EXISTS jobs_search_content AS
+        SELECT jobs.id AS id, jobs.title AS title, jobs.company AS company, jobs.location AS location,
+               {text("job_details.description")} AS description
+        FROM jobs LEFT JOIN job_details ON job_details.job_id = jobs.id
+    '''
+
+def _job_details_triggers(text: Callable[[str], str] = lambda value: value) -> Dict[str, Tuple[str, List[str]]]:
+    """
+    Triggers keeping jobs_fts, description_preview and the near-duplicate index in step with
+    jobs and job_details, as {name: (event, statements)}
+    """
+    # FTS 'delete' must be given exactly the indexed values, so each trigger reads the other
+    # table's half of the row as it is at that moment
+    columns = "title, company, location, description"
+
+    def fts_from_jobs(job_id, description, delete=False):
+        if delete:
+            return (f"INSERT INTO jobs_fts (jobs_fts, rowid, {columns}) SELECT 'delete', id, title, company, "
+                    f"location, {description} FROM jobs WHERE id = {job_id};")
+        return (f"INSERT INTO jobs_fts (rowid, {columns}) SELECT id, title, company, location, {description} "
+                f"FROM jobs WHERE id = {job_id};")
+
+    def fts_row(row, delete=False):
+        description = f"(SELECT {text('description')} FROM job_details WHERE job_id = {row}.id)"
+        if delete:
+            return (f"INSERT INTO jobs_fts (jobs_fts, rowid, {columns}) VALUES ('delete', {row}.id, {row}.title, "
+                    f"{row}.company, {row}.location, {description});")
+        return (f"INSERT INTO jobs_fts (rowid, {columns}) VALUES ({row}.id, {row}.title, {row}.company, "
+                f"{row}.location, {description});")
+
+    def set_preview(description, job_id):
+        return (f"UPDATE jobs SET description_preview = CASE WHEN length({description}) > 200 "
+                f"THEN substr({description}, 1, 200) || '...' ELSE {description} END WHERE id = {job_id};")
+
+    drop_signature = ["DELETE FROM job_lsh_bands WHERE job_id = old.job_id;",
+                      "DELETE FROM job_minhash WHERE job_id = old.job_id;"]
+    return {
+        'jobs_fts_after_insert': ("AFTER INSERT ON jobs", [fts_row("new")]),
+        'jobs_fts_after_update': ("AFTER UPDATE OF title, company, location ON jobs", [
+            fts_row("old", delete=True),
+            fts_row("new"),
+        ]),
+        # Also removes the cold rows, after the index entry that needs them
+        'jobs_after_delete': ("AFTER DELETE ON jobs", [
+            fts_row("old", delete=True),
+            "DELETE FROM job_lsh_bands WHERE job_id = old.id;",
+            "DELETE FROM job_minhash WHERE job_id = old.id;",
+            "DELETE FROM job_details WHERE job_id = old.id;",
+            "DELETE FROM job_documents WHERE job_id = old.id;",
+        ]),
+        'job_details_after_insert': ("AFTER INSERT ON job_details", [
+            fts_from_jobs("new.job_id", "NULL", delete=True),
+            fts_from_jobs("new.job_id", text("new.description")),
+            set_preview(text("new.description"), "new.job_id"),
+        ]),
+        # A changed description also needs a new near-duplicate signature. Rewriting the same
+        # text in another encoding (recompression) is not a change.
+        'job_details_after_update': (
+            f"AFTER UPDATE OF description ON job_details "
+            f"WHEN {text('old.description')} IS NOT {text('new.description')}", [
+                fts_from_jobs("old.job_id", text("old.description"), delete=True),
+                fts_from_jobs("new.job_id", text("new.description")),
+                set_preview(text("new.description"), "new.job_id"),
+            ] + drop_signature),
+        'job_details_after_delete': ("AFTER DELETE ON job_details", [
+            fts_from_jobs("old.job_id", text("old.description"), delete=True),
+            fts_from_jobs("old.job_id", "NULL"),
+            "UPDATE jobs SET description_preview = NULL WHERE id = old.job_id;",
+        ] + drop_signature),
+    }
+
+def _migration_7_hot_cold_split(cursor):
+    """
+    Move description into job_details and the document JSON into job_documents, leaving a
+    narrow jobs row (plus a short description_preview) for list and filter queries
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_details (
+            job_id INTEGER PRIMARY KEY REFERENCES jobs (id),
+            description TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_documents (
+            job_id INTEGER PRIMARY KEY REFERENCES jobs (id),
+            resume_json TEXT,
+            cover_letter_json TEXT
+        )
+    ''')
+    _add_missing_columns(cursor, 'jobs', [('description_preview', 'TEXT')])
+
+    # Copy the cold columns out while they still exist
+    jobs_columns = _columns(cursor, 'jobs')
+    if 'description' in jobs_columns:
+        cursor.execute('''
+            INSERT OR IGNORE INTO job_details (job_id, description)
+            SELECT id, description FROM jobs WHERE description IS NOT NULL
+        ''')
+    if 'resume_json' in jobs_columns:
+        cursor.execute('''
+            INSERT OR IGNORE INTO job_documents (job_id, resume_json, cover_letter_json)
+            SELECT id, resume_json, cover_letter_json FROM jobs
+            WHERE resume_json IS NOT NULL OR cover_letter_json IS NOT NULL
+        ''')
+    cursor.execute('''
+        UPDATE jobs SET description_preview = (
+            SELECT CASE WHEN length(description) > 200 THEN substr(description, 1, 200) || '...' ELSE description END
+            FROM job_details WHERE job_details.job_id = jobs.id
+        )
+        WHERE id IN (SELECT job_id FROM job_details)
+    ''')
+
+    # The old triggers read jobs.description; the FTS index moves to a view over both tables
+    for trigger in ('jobs_fts_after_insert', 'jobs_fts_after_delete', 'jobs_fts_after_update',
+                    'jobs_minhash_after_update', 'jobs_minhash_after_delete'):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute("DROP TABLE IF EXISTS jobs_fts")
+
+    for column in ('description', 'resume_json', 'cover_letter_json'):
+        if column in jobs_columns:
+            if sqlite3.sqlite_version_info >= (3, 35, 0):
+                cursor.execute(f"ALTER TABLE jobs DROP COLUMN {column}")
+            else:
+                # No DROP COLUMN before SQLite 3.35: leave the column empty instead
+                cursor.execute(f"UPDATE jobs SET {column} = NULL")
+
+    cursor.execute(_search_content_view())
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, company, location, description,
+            content='jobs_search_content', content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
+        )
+    ''')
+    for name, (event, statements) in _job_details_triggers().items():
+        body = "\n".join(statements)
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN\n{body}\nEND")
+    cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+
+def _migration_8_description_compression(cursor):
+    """
+    Dictionaries for zstd-compressed descriptions (see description_codec). Compressed rows are
+    BLOBs in job_details.description, so every reader of the column goes through the
+    description_text() SQL function, which passes plain text through unchanged.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS description_dictionaries (
+            id INTEGER PRIMARY KEY,
+            dictionary BLOB NOT NULL,
+            sample_count INTEGER,
+            trained_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("DROP VIEW IF EXISTS jobs_search_content")
+    cursor.execute(_search_content_view(lambda value: f"description_text({value})"))
+    triggers = _job_details_triggers(lambda value: f"description_text({value})")
+    for name, (event, statements) in triggers.items():
+        body = "\n".join(statements)
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {event} BEGIN\n{body}\nEND")
+
+def _migration_9_dimensions(cursor):
+    """
+    Canonical companies and locations with alias maps, referenced by integer keys on jobs
+    (dimensions.py resolves names); the statistics counters also count per key
+    """
+    from dimensions import backfill
+    from job_stats import KEY_DIMENSIONS, TRACKED_COLUMNS, VALUE_DIMENSIONS, rebuild_stats
+
+    for table in ('companies', 'locations'):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                key TEXT NOT NULL UNIQUE
+            )
+        ''')
+    for dimension, table in (('company', 'companies'), ('location', 'locations')):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {dimension}_aliases (
+                alias TEXT PRIMARY KEY,
+                {dimension}_id INTEGER NOT NULL REFERENCES {table} (id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{dimension}_aliases_{dimension} ON {dimension}_aliases ({dimension}_id)")
+    _add_missing_columns(cursor, 'jobs', [
+        ('company_id', 'INTEGER REFERENCES companies (id)'),
+        ('location_id', 'INTEGER REFERENCES locations (id)'),
+    ])
+    # Equality facets, newest first (the rowid breaks scraped_at ties)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_company_id ON jobs (company_id, scraped_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_location_id ON jobs (location_id, scraped_at)")
+
+    backfilled = backfill(cursor)
+    if backfilled:
+        print(f"[SCHEMA] Linked {backfilled} job(s) to canonical companies and locations")
+    _create_stats_triggers(cursor, VALUE_DIMENSIONS + KEY_DIMENSIONS, TRACKED_COLUMNS)
+    rebuild_stats(cursor.connection)
+
+def _migration_10_change_feed(cursor):
+    """Append-only job_changes log filled by triggers on jobs (change_feed.py reads it)"""
+    from change_feed import trigger_definitions
+
+    # AUTOINCREMENT so a seq is never reused, even after the newest entries are pruned
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_changes_changed_at ON job_changes (changed_at)")
+    for name, (event, when, statement) in trigger_definitions().items():
+        condition = f" WHEN {when}" if when else ""
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event}{condition} BEGIN\n{statement}\nEND")
+
+def _migration_11_search_hits(cursor):
+    """job_search_hits: which stored jobs each scraper run saw, for per-search yield"""
+    # A search_history row is opened when a run starts and closed (finished_at) when it ends
+    _add_missing_columns(cursor, 'search_history', [('finished_at', 'TIMESTAMP')])
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_search_history_date ON search_history (search_date)")
+    # No trigger clears hits of deleted or archived jobs: a search's past yield does not change
+    # when its jobs leave the live table, and job ids are never reused (AUTOINCREMENT)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS job_search_hits (
+            search_id INTEGER NOT NULL,
+            job_id INTEGER NOT NULL,
+            page INTEGER,
+            position INTEGER,
+            is_new INTEGER NOT NULL DEFAULT 0,
+            seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (search_id, job_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_search_hits_job ON job_search_hits (job_id)")
+
+def _migration_12_status_list_index(cursor):
+    """idx_jobs_status on (status, scraped_at): a status-filtered list page reads in order instead of sorting"""
+    # The status-only index made the first page of a status filter sort every job with that status
+    # (flagged by utils/check_query_plans.py); still serves status counts and GROUP BY status
+    cursor.execute("DROP INDEX IF EXISTS idx_jobs_status")
+    cursor.execute("CREATE INDEX idx_jobs_status ON jobs (status, scraped_at)")
+
+def _migration_13_app_maintained_search_index(cursor):
+    """
+    jobs_fts becomes a contentless index that the application fills (see
+    search_index.sync_search_index). The triggers only queue changed jobs in jobs_fts_pending,
+    so no trigger or view calls the app-defined description_text() and any SQLite client can
+    write to jobs.
+    """
+    for name in _job_details_triggers():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    cursor.execute("DROP TABLE IF EXISTS jobs_fts")
+    cursor.execute("DROP VIEW IF EXISTS jobs_search_content")
+    cursor.execute('''
+        CREATE VIRTUAL TABLE jobs_fts USING fts5(
+            title, company, location, description,
+            content='', tokenize='porter unicode61 remove_diacritics 2'
+        )
+    ''')
+    # A contentless index is only told what to remove, so each entry keeps the values the index
+    # holds for the job (indexed = 0: none yet). The description is stored as in job_details.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs_fts_pending (
+            seq INTEGER PRIMARY KEY,
+            job_id INTEGER NOT NULL,
+            indexed INTEGER NOT NULL DEFAULT 1,
+            title TEXT,
+            company TEXT,
+            location TEXT,
+            description
+        )
+    ''')
+    # sync reads the oldest entry of each job
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_fts_pending_job ON jobs_fts_pending (job_id, seq)")
+
+    def queue_from_jobs(row):
+        return (f"INSERT INTO jobs_fts_pending (job_id, title, company, location, description) "
+                f"SELECT {row}.id, {row}.title, {row}.company, {row}.location, "
+                f"(SELECT description FROM job_details WHERE job_id = {row}.id);")
+
+    def queue_from_details(row, description):
+        return (f"INSERT INTO jobs_fts_pending (job_id, title, company, location, description) "
+                f"SELECT id, title, company, location, {description} FROM jobs WHERE id = {row}.job_id;")
+
+    triggers = {
+        'jobs_fts_after_insert': ("AFTER INSERT ON jobs", [
+            "INSERT INTO jobs_fts_pending (job_id, indexed) VALUES (new.id, 0);",
+        ]),
+        'jobs_fts_after_update': ("AFTER UPDATE OF title, company, location ON jobs", [queue_from_jobs("old")]),
+        # Also removes the cold rows, after queueing the description the index holds
+        'jobs_after_delete': ("AFTER DELETE ON jobs", [
+            queue_from_jobs("old"),
+            "DELETE FROM job_lsh_bands WHERE job_id = old.id;",
+            "DELETE FROM job_minhash WHERE job_id = old.id;",
+            "DELETE FROM job_details WHERE job_id = old.id;",
+            "DELETE FROM job_documents WHERE job_id = old.id;",
+        ]),
+        'job_details_after_insert': ("AFTER INSERT ON job_details", [queue_from_details("new", "NULL")]),
+        # Recompression rewrites the stored value too; sync_search_index() sees the text is unchanged
+        'job_details_after_update': ("AFTER UPDATE OF description ON job_details "
+                                     "WHEN old.description IS NOT new.description", [
+            queue_from_details("old", "old.description"),
+        ]),
+        'job_details_after_delete': ("AFTER DELETE ON job_details", [
+            queue_from_details("old", "old.description"),
+            "DELETE FROM job_lsh_bands WHERE job_id = old.job_id;",
+            "DELETE FROM job_minhash WHERE job_id = old.job_id;",
+        ]),
+    }
+    for name, (event, statements) in triggers.items():
+        body = "\n".join(statements)
+        cursor.execute(f"CREATE TRIGGER {name} {event} BEGIN\n{body}\nEND")
+    # The first sync indexes every existing job
+    cursor.execute("INSERT INTO jobs_fts_pending (job_id, indexed) SELECT id, 0 FROM jobs")
+
+# Ordered list of (version, description, migration). Never edit or reorder an applied entry;
+# append a new one instead.
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "base tables", _migration_1_base_tables),
+    (2, "indexes for dedup, list, stats and flag filters", _migration_2_indexes),
+    (3, "FTS5 full-text search index", _migration_3_full_text_search),
+    (4, "canonical job fingerprint for deduplication", _migration_4_fingerprint),
+    (5, "MinHash/LSH tables for near-duplicate postings", _migration_5_near_duplicates),
+    (6, "trigger-maintained statistics counters", _migration_6_stats_counters),
+    (7, "hot/cold split: job_details and job_documents", _migration_7_hot_cold_split),
+    (8, "dictionary-compressed job descriptions", _migration_8_description_compression),
+    (9, "companies and locations dimension tables", _migration_9_dimensions),
+    (10, "job_changes change-data feed", _migration_10_change_feed),
+    (11, "job_search_hits per-search sightings", _migration_11_search_hits),
+    (12, "status index ordered by scraped_at", _migration_12_status_list_index),
+    (13, "app-maintained contentless search index", _migration_13_app_maintained_search_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Current schema version of the database (0 for a new or pre-versioning database)"""
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    version = cursor.fetchone()[0]
+    return version or 0
+
+def migrate(conn: sqlite3.Connection, target_version: int = LATEST_VERSION) -> int:
+    """
+    Apply every pending migration up to target_version, each in its own transaction.
+
+    Returns:
+        The schema version after migrating
+    """
+    conn.commit()
+    current = get_schema_version(conn)
+    conn.commit()
+    if current >= target_version:
+        return current
+
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # Manage transactions explicitly so DDL is covered too
+    cursor = conn.cursor()
+    try:
+        for version, description, migration in MIGRATIONS:
+            if version <= current or version > target_version:
+                continue
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # Another connection may have applied it while we waited for the lock
+                cursor.execute("SELECT MAX(version) FROM schema_version")
+                if (cursor.fetchone()[0] or 0) >= version:
+                    cursor.execute("COMMIT")
+                    current = version
+                    continue
+                migration(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            print(f"[SCHEMA] Applied migration {version}: {description}")
+            current = version
+    finally:
+        conn.isolation_level = isolation_level
+    return current
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Full-Text Search Module
+Query building and maintenance for the jobs_fts FTS5 index (see schema migrations 3 and 13).
+
+jobs_fts is contentless and filled by the application, because descriptions are stored
+compressed and only the app can read them. The schema's triggers only queue each changed job in
+jobs_fts_pending with the values it had when it was last indexed. sync_search_index() re-indexes
+the queued jobs, refreshes their description_preview and drops near-duplicate signatures of
+descriptions that changed. Writers call it before they commit; edits made outside the app (the
+sqlite3 shell) are picked up by the next sync.
+
+Usage:
+    python search_index.py rebuild [db_path]
+    python search_index.py sync [db_path]
+    python search_index.py search "python developer" [db_path]
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import time
+from typing import Any, Optional, Sequence
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+# Columns indexed by jobs_fts, in index order
+FTS_COLUMNS = ('title', 'company', 'location', 'description')
+
+# bm25 weights per column: a hit in the title matters more than one deep in the description
+FTS_RANK = "bm25(jobs_fts, 10.0, 5.0, 2.0, 1.0)"
+
+def build_match_query(text: Optional[str], column: Optional[str] = None) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression: every word must appear, each as a prefix
+    (so "dev" matches "developer"). Returns None when the text has no searchable words.
+    """
+    terms = re.findall(r"\w+", text or "")
+    if not terms:
+        return None
+    query = " ".join(f'"{term}"*' for term in terms)
+    if column is not None:
+        if column not in FTS_COLUMNS:
+            raise ValueError(f"Column '{column}' is not in the full-text index")
+        query = f"{column} : ({query})"
+    return query
+
+def make_snippet(text: Optional[str], match: str, open_marker: str = "<mark>", close_marker: str = "</mark>",
+                 tokens: int = 16) -> Optional[str]:
+    """
+    The window of `tokens` words of text holding the most of the match's terms, with the
+    matching words marked and '…' where the text was cut (what FTS5's snippet() returns; the
+    index is contentless, so it cannot build one itself)
+    """
+    if not text:
+        return text
+    prefixes = [term.lower() for term in re.findall(r'"(\w+)"', match)]
+    words = list(re.finditer(r"\w+", text))
+    if not words:
+        return text
+    hits = [[prefix for prefix in prefixes if word.group().lower().startswith(prefix)] for word in words]
+    # Start a couple of words before a hit, as snippet() does; the first best window wins
+    best_start, best_score = 0, 0
+    for start in sorted({max(0, index - 2) for index, terms in enumerate(hits) if terms}):
+        score = len({term for terms in hits[start:start + tokens] for term in terms})
+        if score > best_score:
+            best_start, best_score = start, score
+    # A window near the end is moved back to show the full number of words
+    best_start = min(best_start, max(0, len(words) - tokens))
+    end = min(len(words), best_start + tokens)
+    parts, position = [], words[best_start].start() if best_start else 0
+    for word, terms in zip(words[best_start:end], hits[best_start:end]):
+        if terms:
+            parts += [text[position:word.start()], open_marker, word.group(), close_marker]
+            position = word.end()
+    parts.append(text[position:words[end - 1].end()])
+    return ("…" if best_start else "") + "".join(parts) + ("…" if end < len(words) else "")
+
+def add_snippets(conn: sqlite3.Connection, jobs: Sequence[Any], match: str,
+                 open_marker: str = "<mark>", close_marker: str = "</mark>") -> Sequence[Any]:
+    """Fill the snippet column of search results (selected as NULL AS snippet) from their descriptions"""
+    if not jobs:
+        return jobs
+    ids = [job['id'] for job in jobs]
+    descriptions = dict(conn.execute(
+        f"SELECT job_id, description_text(description) FROM job_details WHERE job_id IN ({','.join('?' * len(ids))})",
+        ids
+    ).fetchall())
+    for job in jobs:
+        job['snippet'] = make_snippet(descriptions.get(job['id']), match, open_marker, close_marker)
+    return jobs
+
+def _preview(description: Optional[str]) -> Optional[str]:
+    return description[:200] + '...' if description and len(description) > 200 else description
+
+def sync_search_index(conn: sqlite3.Connection, batch_size: int = 500) -> int:
+    """
+    Apply the changes queued in jobs_fts_pending, inside the caller's transaction. Returns the
+    number of jobs re-indexed.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute("SELECT MAX(seq) FROM jobs_fts_pending")
+    last = cursor.fetchone()[0]
+    if last is None:
+        return 0
+    # The oldest entry of a job holds what the index has for it
+    cursor.execute("SELECT MIN(seq) FROM jobs_fts_pending WHERE seq <= ? GROUP BY job_id", (last,))
+    oldest = [row[0] for row in cursor.fetchall()]
+    columns = ", ".join(FTS_COLUMNS)
+    reindexed = 0
+    for start in range(0, len(oldest), batch_size):
+        batch = oldest[start:start + batch_size]
+        cursor.execute(f'''
+            SELECT pending.job_id, pending.indexed,
+                   pending.title, pending.company, pending.location, description_text(pending.description),
+                   jobs.id IS NOT NULL,
+                   jobs.title, jobs.company, jobs.location, description_text(job_details.description)
+            FROM jobs_fts_pending pending
+            LEFT JOIN jobs ON jobs.id = pending.job_id
+            LEFT JOIN job_details ON job_details.job_id = pending.job_id
+            WHERE pending.seq IN ({','.join('?' * len(batch))})
+        ''', batch)
+        for row in cursor.fetchall():
+            job_id = row[0]
+            old = row[2:6] if row[1] else None
+            new = row[7:11] if row[6] else None
+            # A row with no text was never indexed
+            old = old if old and any(value is not None for value in old) else None
+            new = new if new and any(value is not None for value in new) else None
+            if old == new:
+                continue
+            if old:
+                conn.execute(f"INSERT INTO jobs_fts (jobs_fts, rowid, {columns}) VALUES ('delete', ?, ?, ?, ?, ?)",
+                             (job_id,) + tuple(old))
+            if new:
+                conn.execute(f"INSERT INTO jobs_fts (rowid, {columns}) VALUES (?, ?, ?, ?, ?)",
+                             (job_id,) + tuple(new))
+            old_description, new_description = old[3] if old else None, new[3] if new else None
+            if row[6] and (old is None or old_description != new_description):
+                conn.execute("UPDATE jobs SET description_preview = ? WHERE id = ?", (_preview(new_description), job_id))
+            # A changed description needs a new near-duplicate signature (near_duplicates.index_jobs)
+            if old is not None and old_description != new_description:
+                conn.execute("DELETE FROM job_lsh_bands WHERE job_id = ?", (job_id,))
+                conn.execute("DELETE FROM job_minhash WHERE job_id = ?", (job_id,))
+            reindexed += 1
+    cursor.execute("DELETE FROM jobs_fts_pending WHERE seq <= ?", (last,))
+    return reindexed
+
+def rebuild(conn: sqlite3.Connection) -> float:
+    """Re-index every job from scratch and merge the index b-trees. Returns seconds taken."""
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('delete-all')")
+    cursor.execute("DELETE FROM jobs_fts_pending")
+    cursor.execute("INSERT INTO jobs_fts_pending (job_id, indexed) SELECT id, 0 FROM jobs")
+    sync_search_index(conn)
+    cursor.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('optimize')")
+    conn.commit()
+    return time.perf_counter() - started
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from description_codec import register_functions
+    from schema import migrate
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ('rebuild', 'sync', 'search'):
+        print(__doc__)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == 'search':
+        db_path = sys.argv[3] if len(sys.argv) > 3 else os.path.join(DATA_DIR, 'linkedin_jobs.db')
+    else:
+        db_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(DATA_DIR, 'linkedin_jobs.db')
+
+    conn = register_functions(sqlite3.connect(db_path))
+    migrate(conn)
+
+    if command == 'rebuild':
+        seconds = rebuild(conn)
+        count = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        print(f"[SEARCH] Rebuilt full-text index for {count} jobs in {seconds:.2f}s")
+    elif command == 'sync':
+        reindexed = sync_search_index(conn)
+        conn.commit()
+        print(f"[SEARCH] Re-indexed {reindexed} changed job(s)")
+    else:
+        match = build_match_query(sys.argv[2])
+        started = time.perf_counter()
+        rows = conn.execute(f'''
+            SELECT jobs.id, jobs.title, jobs.company, description_text(job_details.description)
+            FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+            LEFT JOIN job_details ON job_details.job_id = jobs.id
+            WHERE jobs_fts MATCH ?
+            ORDER BY {FTS_RANK}
+            LIMIT 20
+        ''', (match,)).fetchall() if match else []
+        print(f"[SEARCH] {len(rows)} result(s) in {(time.perf_counter() - started) * 1000:.1f}ms")
+        for job_id, title, company, description in rows:
+            print(f"  {job_id}: {title} at {company}\n      {make_snippet(description, match, '[', ']')}")
+
+    conn.close()
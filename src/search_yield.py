@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Search Yield Report
+How many new jobs each saved search still brings in. Every scraper run opens a search_history
+row and links each stored job its result pages show in job_search_hits (schema migration 11),
+read from the job cards without opening the job. Runs with the same criteria are grouped; a
+search whose runs mostly show jobs that are already stored costs scraping time for little and
+is a candidate to drop or narrow.
+
+Usage:
+    python search_yield.py [--days 30] [--below 0.1] [db_path or URL]
+"""
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+
+DEFAULT_DAYS = 30
+LOW_YIELD = 0.1               # share of new jobs below which a search is flagged
+
+def describe_search(row: Dict[str, Any]) -> str:
+    """'python developer in Berlin (remote, past week)' from a yield row's criteria"""
+    filters = [row[column] for column in ('work_model', 'job_type', 'experience_level', 'date_posted')
+               if row.get(column)]
+    text = f"{row.get('keywords') or '(any)'} in {row.get('location') or '(anywhere)'}"
+    return f"{text} ({', '.join(filters)})" if filters else text
+
+def print_report(rows: List[Dict[str, Any]], below: float = LOW_YIELD):
+    if not rows:
+        print("[YIELD] No finished scraper runs recorded yet")
+        return
+    print(f"{'yield':>6} {'new':>6} {'found':>6} {'runs':>5}  {'last run':<19}  search")
+    for row in rows:
+        flag = "  <- low yield" if row['yield'] < below else ""
+        print(f"{row['yield']:>6.0%} {row['new_jobs']:>6} {row['jobs_found']:>6} {row['runs']:>5}  "
+              f"{row['last_run'] or '':<19}  {describe_search(row)}{flag}")
+    low = sum(1 for row in rows if row['yield'] < below)
+    print(f"[YIELD] {len(rows)} search(es), {low} below {below:.0%} new jobs")
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from linkedin_db import LinkedInJobsDB
+
+    parser = argparse.ArgumentParser(description="New-job yield of each saved search")
+    parser.add_argument("db_path", nargs="?", default=None, help="SQLite file or PostgreSQL URL")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="only runs from the last N days (0 for all)")
+    parser.add_argument("--below", type=float, default=LOW_YIELD, help="flag searches under this share of new jobs")
+    args = parser.parse_args()
+
+    db = LinkedInJobsDB(args.db_path)
+    if not db.connect():
+        sys.exit(1)
+    try:
+        db.create_tables()
+        print_report(db.get_search_yield(args.days or None), args.below)
+    finally:
+        db.disconnect()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+LinkedIn Session Manager
+Decides whether saved cookies are still usable without loading the LinkedIn feed, confirms the
+session lazily from the first search page and keeps a persistent Playwright storage_state.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+SESSION_CACHE_PATH = os.path.join(DATA_DIR, 'session_cache.json')
+
+# li_at is LinkedIn's auth token; JSESSIONID carries the CSRF token every request needs
+AUTH_COOKIE_NAMES = ("li_at", "JSESSIONID")
+
+# Treat cookies that expire within this window as already expired
+EXPIRY_MARGIN_SECONDS = 60 * 60
+
+# URL fragments LinkedIn redirects to when the session is not valid
+LOGGED_OUT_URL_MARKERS = ("/login", "/authwall", "/checkpoint", "/uas/login", "/signup")
+
+class SessionManager:
+    """Offline validity checks and persistence for one LinkedIn cookie file"""
+
+    def __init__(self, cookie_file: Optional[str] = None, cache_path: str = SESSION_CACHE_PATH):
+        if cookie_file is None:
+            cookie_file = os.path.join(DATA_DIR, "cookies.json")
+        self.cookie_file = os.path.abspath(cookie_file)
+        self.cache_path = cache_path
+        self.storage_state_path = os.path.splitext(self.cookie_file)[0] + ".state.json"
+
+    def _load_cache(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, "r", encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _update_cache(self, **fields):
+        cache = self._load_cache()
+        entry = cache.get(self.cookie_file, {})
+        entry.update(fields)
+        cache[self.cookie_file] = entry
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, "w", encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+        except Exception as e:
+            print(f"[SESSION] Could not write session cache: {e}")
+
+    def _load_cookies(self) -> List[Dict[str, Any]]:
+        """Cookies from the storage_state if present, otherwise from the cookie file"""
+        for path, key in ((self.storage_state_path, "cookies"), (self.cookie_file, None)):
+            try:
+                with open(path, "r", encoding='utf-8') as f:
+                    data = json.load(f)
+                return data[key] if key else data
+            except Exception:
+                continue
+        return []
+
+    def check_cookies(self) -> Tuple[bool, str]:
+        """Check the auth cookies' presence and expiry locally. Returns (valid, reason)."""
+        cookies = {cookie.get("name"): cookie for cookie in self._load_cookies()}
+        if not cookies:
+            return False, "no saved cookies"
+
+        now = time.time()
+        for name in AUTH_COOKIE_NAMES:
+            cookie = cookies.get(name)
+            if cookie is None:
+                return False, f"cookie '{name}' missing"
+            expires = cookie.get("expires", -1)
+            # -1 marks a session cookie, which Playwright restores without an expiry
+            if expires is not None and expires != -1 and expires < now + EXPIRY_MARGIN_SECONDS:
+                return False, f"cookie '{name}' expired"
+
+        entry = self._load_cache().get(self.cookie_file, {})
+        if entry.get("invalid_at", 0) > entry.get("confirmed_at", 0):
+            return False, "session was rejected by LinkedIn on the last run"
+
+        confirmed_at = entry.get("confirmed_at")
+        if confirmed_at:
+            hours = (now - confirmed_at) / 3600
+            return True, f"cookies unexpired, last confirmed {hours:.1f}h ago"
+        return True, "cookies unexpired, never confirmed"
+
+    def is_locally_valid(self) -> bool:
+        """True when the saved session looks usable without asking LinkedIn"""
+        valid, reason = self.check_cookies()
+        print(f"[SESSION] {'Valid' if valid else 'Invalid'} session for {self.cookie_file}: {reason}")
+        return valid
+
+    def new_context(self, browser, **kwargs):
+        """Create a browser context restored from the storage_state, or from the cookie file"""
+        if os.path.exists(self.storage_state_path):
+            try:
+                context = browser.new_context(storage_state=self.storage_state_path, **kwargs)
+                print(f"[SESSION] Restored storage state from {self.storage_state_path}")
+                return context
+            except Exception as e:
+                print(f"[SESSION] Failed to restore storage state: {e}")
+
+        context = browser.new_context(**kwargs)
+        cookies = self._load_cookies()
+        if cookies:
+            context.add_cookies(cookies)
+            print(f"[COOKIES] Loaded cookies from {self.cookie_file}")
+        return context
+
+    def verify_page(self, page) -> bool:
+        """
+        Confirm the session from a page that was loaded anyway (e.g. the first search page).
+        LinkedIn redirects logged-out visitors to a login or authwall URL.
+        """
+        url = page.url or ""
+        if any(marker in url for marker in LOGGED_OUT_URL_MARKERS) or page.query_selector("input[name='session_key']"):
+            print(f"[SESSION] Redirected to {url}; session is not logged in")
+            self._update_cache(invalid_at=time.time())
+            return False
+        self._update_cache(confirmed_at=time.time())
+        print("[SESSION] Session confirmed from search page")
+        return True
+
+    def save(self, context):
+        """Persist cookies and storage_state after a successful login"""
+        try:
+            cookies = context.cookies()
+            with open(self.cookie_file, "w", encoding='utf-8') as f:
+                json.dump(cookies, f, ensure_ascii=False, indent=2)
+            context.storage_state(path=self.storage_state_path)
+            self._update_cache(confirmed_at=time.time())
+            print(f"[SESSION] Saved cookies to {self.cookie_file} and storage state to {self.storage_state_path}")
+        except Exception as e:
+            print(f"[SESSION] Failed to save session: {e}")
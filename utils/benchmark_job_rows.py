@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Job Row Benchmark
+Compares the memory and time of reading 50k job rows as Job objects (src/job_rows.py) with the
+per-row dicts the DB layer and API used to build. Runs against a throwaway database.
+
+Usage:
+    python utils/benchmark_job_rows.py [rows]
+"""
+
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from db_pool import configure_connection
+from job_rows import fetch_jobs
+from schema import migrate
+
+QUERY = "SELECT * FROM jobs ORDER BY scraped_at DESC"
+
+def build_database(path, rows):
+    conn = configure_connection(sqlite3.connect(path))
+    migrate(conn)
+    conn.executemany(
+        "INSERT INTO jobs (title, company, location, url, fingerprint, search_keywords, description_preview) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((f"Software Engineer {i}", f"Company {i % 500}", "Remote", f"https://www.linkedin.com/jobs/view/{10**9 + i}/",
+          f"li:{10**9 + i}", "python", "We are looking for an engineer to join our platform team. " * 3)
+         for i in range(rows))
+    )
+    conn.commit()
+    return conn
+
+def zip_dicts(conn):
+    """LinkedInJobsDB before: dict(zip(columns, row)) per row"""
+    cursor = conn.cursor()
+    cursor.execute(QUERY)
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def row_dicts(conn):
+    """API before: dict(sqlite3.Row) per row plus a description_preview copy"""
+    conn.row_factory = sqlite3.Row
+    try:
+        jobs = []
+        for row in conn.execute(QUERY).fetchall():
+            job = dict(row)
+            job['description_preview'] = job['description_preview'][:200] + "..."
+            jobs.append(job)
+        return jobs
+    finally:
+        conn.row_factory = None
+
+def job_rows(conn):
+    """Now: one Job per row sharing a column index"""
+    return fetch_jobs(conn, QUERY)
+
+def measure(name, reader, conn, repeats=3):
+    best = None
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        result = reader(conn)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    result = reader(conn)  # held while measuring, so 'retained' counts the rows the reader returned
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{name:<28} {best * 1000:9.1f} ms {retained / 1024 / 1024:10.1f} MB {peak / 1024 / 1024:10.1f} MB")
+    return best, retained
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'benchmark.db')
+        print(f"Building a {rows}-row database...")
+        conn = build_database(path, rows)
+        conn.row_factory = None
+        print(f"\n{'reader':<28} {'time':>12} {'retained':>13} {'peak':>13}")
+        baseline = measure("dict(zip(columns, row))", zip_dicts, conn)
+        measure("dict(sqlite3.Row) + preview", row_dicts, conn)
+        best, retained = measure("Job (job_rows.fetch_jobs)", job_rows, conn)
+        print(f"\nJob rows vs dict(zip): {baseline[0] / best:.1f}x faster, "
+              f"{baseline[1] / retained:.1f}x less memory retained "
+              f"({(baseline[1] - retained) / rows:.0f} bytes less per row)")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
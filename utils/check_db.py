@@ -5,12 +5,18 @@ Simple script to view the scraped jobs in the SQLite database.
 """
 
 import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from description_codec import register_functions
 
 def check_database():
     """Check the contents of the SQLite database"""
     try:
         # Connect to the database
-        conn = sqlite3.connect('data/linkedin_jobs.db')
+        conn = register_functions(sqlite3.connect('data/linkedin_jobs.db'))
         cursor = conn.cursor()
         
         # Get table info
@@ -41,7 +47,11 @@ def check_database():
             print("-" * 80)
         
         # Get full details of the most recent job
-        cursor.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT 1")
+        cursor.execute("""
+            SELECT jobs.id, title, company, location, description_text(job_details.description), url, scraped_at
+            FROM jobs LEFT JOIN job_details ON job_details.job_id = jobs.id
+            ORDER BY jobs.id DESC LIMIT 1
+        """)
         latest_job = cursor.fetchone()
         if latest_job:
             print(f"\nFull details of most recent job (ID: {latest_job[0]}):")
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Query Plan Regression Check
+Runs EXPLAIN QUERY PLAN on the SQL of the API server, the jobs database layer, the job browser
+and the scraper against a synthetic database of --rows jobs, and fails when a statement scans a
+table, in rowid or in index order, or sorts through a temporary B-tree. The synthetic database
+is built through LinkedInJobsDB and ANALYZEd, so the planner sees the production schema with
+realistic statistics.
+
+Statements are collected two ways:
+- statically, every SQL string and f-string in TARGET_FILES, with interpolated names filled in
+  from module constants and SAMPLE_VALUES;
+- at runtime, the statements LinkedInJobsDB and JobBrowser assemble from parts (filters, keyset
+  cursors, search fields, the API's list pages) are captured with a trace callback while the
+  scenarios run.
+
+A scan is reported as scan:<table>, or scan:<table>:<index> when it walks an index, so dropping
+an index a filter relies on fails the check even when the planner falls back to walking another.
+A temporary B-tree that sorts one LIMITed arm of a keyset cursor's UNION ALL is reported as
+merge-sort, apart from a temp-btree that sorts a whole result. A finding that no index can
+remove (ranking by bm25, a substring LIKE, a newest-first page that stops after its LIMIT) is
+accepted in ALLOWED, keyed by where the statement comes from and the filter it applies, with the
+reason. A scan of a table in SMALL_TABLES is not reported.
+
+Usage:
+    python utils/check_query_plans.py [--rows 20000] [--verbose]
+"""
+
+import argparse
+import ast
+import builtins
+import contextlib
+import importlib
+import io
+import os
+import random
+import re
+import sqlite3
+import string
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT / 'src'))
+
+from db_pool import get_pool
+from job_browser import JobBrowser
+from linkedin_db import LinkedInJobsDB
+from pagination import encode_cursor
+
+TARGET_FILES = ['api_server.py', 'src/linkedin_db.py', 'src/job_browser.py', 'src/linkedin_scaper.py']
+
+SQL_START = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|WITH)\s")
+
+# Values for the names SQL f-strings and str.format templates interpolate that are not module
+# constants. A statement interpolating a name missing here fails the check until it is added.
+SAMPLE_VALUES: Dict[str, Any] = {
+    'conditions': [],
+    'fingerprints': ['li:1', 'li:2'],
+    'urls': ['https://www.linkedin.com/jobs/view/1/', 'https://www.linkedin.com/jobs/view/2/'],
+    'chunk': ['li:1', 'li:2'],
+    'field': 'search_keywords',
+    'column': 'resume_json',
+    'flag': 'liked',
+    'since': "AND search_date >= datetime('now', ?)",
+}
+
+# Findings a statement cannot avoid, by origin ('file:function' or 'Class.method'). A filtered
+# scenario carries its filter in parentheses, so an unfiltered page's allowance never covers it.
+BM25_ORDER = "full-text matches are ordered by bm25 rank, which no index provides"
+KEYSET_MERGE = ("keyset pages after a cursor sort the union of two LIMITed index seeks, "
+                "at most 2 x (limit + 1) rows")
+NEWEST_FIRST = "an unfiltered page walks the newest jobs in index order and stops after the LIMIT"
+LIKED_FIRST = ("the liked filter walks the partial index of liked jobs, newest first, "
+               "and stops after the LIMIT")
+SEARCH_YIELD_GROUPS = "groups search_history runs by their criteria; one row per scraper run"
+
+ALLOWED: Dict[str, Dict[str, str]] = {
+    'src/linkedin_db.py:find_jobs_page': {
+        'scan:jobs:idx_jobs_scraped_at': NEWEST_FIRST,
+        'temp-btree': BM25_ORDER,
+    },
+    'LinkedInJobsDB.find_jobs_page': {
+        'scan:jobs:idx_jobs_scraped_at': NEWEST_FIRST,
+        'merge-sort': KEYSET_MERGE,
+    },
+    'LinkedInJobsDB.find_jobs_page(offset)': {'scan:jobs:idx_jobs_scraped_at': NEWEST_FIRST},
+    'LinkedInJobsDB.find_jobs_page(query)': {'temp-btree': BM25_ORDER},
+    'LinkedInJobsDB.find_jobs_page(query, company_id)': {'temp-btree': BM25_ORDER},
+    'LinkedInJobsDB.find_jobs_page(company_id)': {'merge-sort': KEYSET_MERGE},
+    'LinkedInJobsDB.find_jobs_page(location_id)': {'merge-sort': KEYSET_MERGE},
+    'LinkedInJobsDB.find_jobs_page(company_id, location_id)': {'merge-sort': KEYSET_MERGE},
+    'LinkedInJobsDB.find_jobs_page(company LIKE)': {
+        'scan:jobs:idx_jobs_scraped_at': "a company name that resolves to no canonical company is a "
+                                          "substring (LIKE '%...%') match; the page walks newest first "
+                                          "until LIMIT rows match",
+        'merge-sort': KEYSET_MERGE,
+    },
+    'LinkedInJobsDB.get_jobs': {
+        'scan:jobs:idx_jobs_scraped_at': "get_jobs() without a limit returns every job by design; "
+                                          "with one it walks the newest jobs in index order",
+    },
+    'LinkedInJobsDB.get_jobs(liked)': {'scan:jobs:idx_jobs_liked': LIKED_FIRST},
+    'LinkedInJobsDB.get_jobs_page': {
+        'scan:jobs:idx_jobs_scraped_at': NEWEST_FIRST,
+        'merge-sort': KEYSET_MERGE,
+    },
+    'LinkedInJobsDB.get_jobs_page(status)': {'merge-sort': KEYSET_MERGE},
+    'LinkedInJobsDB.get_jobs_page(liked)': {
+        'scan:jobs:idx_jobs_liked': LIKED_FIRST,
+        'merge-sort': KEYSET_MERGE,
+    },
+    'LinkedInJobsDB.get_jobs_pending_description': {
+        'scan:jobs:idx_jobs_description_pending': "walks the partial index of list-only stubs, which "
+                                                  "holds only jobs still waiting for a description",
+    },
+    'LinkedInJobsDB.search_jobs': {
+        'temp-btree': BM25_ORDER,
+        'scan:jobs': "search_keywords/search_location are substring (LIKE '%...%') matches",
+    },
+    'JobBrowser.get_all_jobs': {
+        'scan:jobs:idx_jobs_scraped_at': "walks the newest jobs in index order and stops after the LIMIT",
+    },
+    'JobBrowser.get_jobs_page': {
+        'scan:jobs:idx_jobs_scraped_at': NEWEST_FIRST,
+        'merge-sort': KEYSET_MERGE,
+    },
+    'JobBrowser.search_jobs': {
+        'temp-btree': BM25_ORDER,
+    },
+    'src/linkedin_db.py:SEARCH_YIELD_SQL': {
+        'temp-btree': SEARCH_YIELD_GROUPS,
+    },
+    'LinkedInJobsDB.get_search_yield': {
+        'temp-btree': SEARCH_YIELD_GROUPS,
+    },
+}
+
+# Tables that stay small however many jobs are stored
+SMALL_TABLES = {
+    'schema_version': "one row per migration",
+    'search_history': "one row per scraper run",
+    'description_dictionaries': "one row per trained dictionary",
+    'jobs_fts_pending': "search index queue, drained by the write that fills it",
+}
+
+Statement = Tuple[str, str]   # (origin, sql)
+
+# ---------------------------------------------------------------------------------------------
+# Static collection
+# ---------------------------------------------------------------------------------------------
+
+class _Namespace(dict):
+    """Module constants, imported lazily from the names a module imports, then SAMPLE_VALUES"""
+
+    def __init__(self, imports: Dict[str, Tuple[str, str]]):
+        super().__init__()
+        self.imports = imports
+
+    def __missing__(self, name):
+        if name in self.imports:
+            module, attribute = self.imports[name]
+            value = getattr(importlib.import_module(module), attribute)
+            self[name] = value
+            return value
+        if name in SAMPLE_VALUES:
+            return SAMPLE_VALUES[name]
+        if hasattr(builtins, name):
+            return getattr(builtins, name)
+        raise NameError(f"no sample value for '{name}' (add it to SAMPLE_VALUES)")
+
+def _evaluate(node: ast.expr, namespace: _Namespace, path: str) -> Any:
+    return eval(compile(ast.Expression(node), path, 'eval'), {}, namespace)
+
+def _render(node: ast.expr, namespace: _Namespace, path: str) -> str:
+    """The text of a string literal or f-string, with str.format fields filled from SAMPLE_VALUES"""
+    if isinstance(node, ast.JoinedStr):
+        text = ''.join(part.value if isinstance(part, ast.Constant) else str(_evaluate(part.value, namespace, path))
+                       for part in node.values)
+    else:
+        text = node.value
+    fields = {field for _, field, _, _ in string.Formatter().parse(text) if field}
+    if fields:
+        missing = fields - SAMPLE_VALUES.keys()
+        if missing:
+            raise NameError(f"no sample value for '{sorted(missing)[0]}' (add it to SAMPLE_VALUES)")
+        text = text.format(**SAMPLE_VALUES)
+    return text
+
+def _is_sql(node: ast.AST) -> bool:
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, str) and bool(SQL_START.match(node.value))
+    if isinstance(node, ast.JoinedStr) and node.values:
+        first = node.values[0]
+        return isinstance(first, ast.Constant) and bool(SQL_START.match(first.value))
+    return False
+
+def collect_static(relative_path: str) -> Tuple[List[Statement], List[Statement], List[str]]:
+    """
+    SQL statements written out in one file.
+
+    Returns:
+        (statements, assembled, errors): statements with their origin; the starts of queries a
+        function extends with += (their final form is checked through the runtime scenarios);
+        and statements that could not be rendered
+    """
+    path = str(PROJECT_ROOT / relative_path)
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+
+    imports = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            for alias in node.names:
+                imports[alias.asname or alias.name] = (node.module, alias.name)
+    namespace = _Namespace(imports)
+    # Module-level string constants (SQL templates, column lists) in definition order
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, (ast.Constant, ast.JoinedStr, ast.Tuple))):
+            try:
+                namespace[node.targets[0].id] = _evaluate(node.value, namespace, path)
+            except Exception:
+                pass
+
+    parents = {child: parent for parent in ast.walk(tree) for child in ast.iter_child_nodes(parent)}
+
+    def origin_of(node):
+        while node in parents:
+            node = parents[node]
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                return node.name, node
+            if isinstance(node, ast.Assign) and parents.get(node) is tree and isinstance(node.targets[0], ast.Name):
+                return node.targets[0].id, None
+        return '<module>', None
+
+    statements, assembled, errors = [], [], []
+    for node in ast.walk(tree):
+        if not _is_sql(node) or isinstance(parents.get(node), ast.JoinedStr):
+            continue
+        name, function = origin_of(node)
+        origin = f"{relative_path}:{name}"
+        # query = "SELECT ..." followed by query += "..." in the same function
+        target = parents.get(node)
+        if function is not None and isinstance(target, ast.Assign) and isinstance(target.targets[0], ast.Name):
+            variable = target.targets[0].id
+            if any(isinstance(other, ast.AugAssign) and isinstance(other.target, ast.Name)
+                   and other.target.id == variable for other in ast.walk(function)):
+                assembled.append((origin, ' '.join(_render(node, namespace, path).split())))
+                continue
+        try:
+            statements.append((origin, _render(node, namespace, path)))
+        except Exception as e:
+            errors.append(f"{origin} (line {node.lineno}): {e}")
+    return statements, assembled, errors
+
+# ---------------------------------------------------------------------------------------------
+# Synthetic database and runtime scenarios
+# ---------------------------------------------------------------------------------------------
+
+WORDS = ("python engineer backend platform data senior staff developer cloud distributed systems "
+         "machine learning analytics product frontend react kubernetes security mobile api").split()
+STATUSES = ['new'] * 14 + ['interested', 'applied', 'interviewing', 'rejected', 'offer', 'archived']
+
+def build_database(db_path: str, rows: int, seed: int = 7):
+    """Fill a new database with rows jobs through LinkedInJobsDB, spread over half a year, and ANALYZE it"""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(rows):
+        title = ' '.join(rng.sample(WORDS, 3)).title()
+        jobs.append({
+            'title': title,
+            'company': f"Company {rng.randrange(rows // 40 + 1)}",
+            'location': f"City {rng.randrange(100)}",
+            'url': f"https://www.linkedin.com/jobs/view/{10**9 + i}/",
+            'description': None if i % 5 == 0 else ' '.join(rng.choices(WORDS, k=80)),
+            'description_pending': 1 if i % 5 == 0 else 0,
+            'search_keywords': rng.choice(WORDS),
+            'search_location': f"City {rng.randrange(20)}",
+        })
+    db = LinkedInJobsDB(db_path)
+    db.connect()
+    try:
+        db.save_jobs(jobs, index_duplicates=False)
+        conn = db.conn
+        # Scraped in batches of ~20 sharing a timestamp, newest ids most recent
+        conn.execute(f'''
+            UPDATE jobs SET
+                scraped_at = datetime('now', '-' || ((({rows} - id) / 20) * 600) || ' seconds'),
+                status = CASE abs(random()) % {len(STATUSES)} {' '.join(f"WHEN {n} THEN '{s}'" for n, s in enumerate(STATUSES))} END,
+                liked = abs(random()) % 20 = 0,
+                applied = abs(random()) % 25 = 0,
+                disliked = abs(random()) % 30 = 0
+        ''')
+        conn.execute('''
+            INSERT INTO job_status_history (job_id, status, notes)
+            SELECT id, status, NULL FROM jobs WHERE status != 'new'
+        ''')
+        for run in range(200):
+            db.start_search({'keywords': WORDS[run % len(WORDS)], 'location': f"City {run % 20}"})
+        conn.execute('''
+            INSERT OR IGNORE INTO job_search_hits (search_id, job_id, page, position, is_new)
+            SELECT abs(random()) % 200 + 1, id, 1, id % 25 + 1, id % 3 = 0 FROM jobs
+        ''')
+        conn.execute("UPDATE search_history SET finished_at = CURRENT_TIMESTAMP")
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        db.disconnect()
+
+def scenarios(db: LinkedInJobsDB, browser: JobBrowser, job_id: int) -> List[Tuple[str, Callable[[], Any]]]:
+    """(origin, call) for every LinkedInJobsDB and JobBrowser read and write"""
+    def next_cursor(**filters):
+        return db.get_jobs_page(25, **filters)[1]
+
+    def list_cursor(**options):
+        return db.find_jobs_page(25, **options)[1]
+
+    def list_page(**filters):
+        # A fixed cursor, so a filter with a single page still runs the keyset query after one
+        def call():
+            db.find_jobs_page(25, filters=filters)
+            db.find_jobs_page(25, encode_cursor({'scraped_at': '2024-01-01 00:00:00', 'id': 1000}), filters=filters)
+        return call
+
+    def search_run():
+        search_id = db.start_search({'keywords': 'python', 'location': 'City 1'})
+        known = db.known_job_ids(['li:1000000001', 'li:1000000002'])
+        db.record_search_hits(search_id, [(found, 1, position) for position, found in enumerate(known.values(), 1)])
+        db.finish_search(search_id, len(known))
+
+    new_job = {'title': 'Plan Check Engineer', 'company': 'Company 1', 'location': 'City 1',
+               'url': 'https://www.linkedin.com/jobs/view/42/', 'description': 'python platform'}
+    return [
+        ('LinkedInJobsDB.get_jobs', lambda: db.get_jobs()),
+        ('LinkedInJobsDB.get_jobs', lambda: db.get_jobs(limit=50)),
+        ('LinkedInJobsDB.get_jobs(status)', lambda: db.get_jobs(limit=50, status='applied')),
+        ('LinkedInJobsDB.get_jobs(liked)', lambda: db.get_jobs(limit=50, liked=True)),
+        ('LinkedInJobsDB.get_jobs_page', lambda: db.get_jobs_page(25, next_cursor())),
+        ('LinkedInJobsDB.get_jobs_page(status)', lambda: db.get_jobs_page(25, next_cursor(status='new'), status='new')),
+        ('LinkedInJobsDB.get_jobs_page(liked)', lambda: db.get_jobs_page(25, next_cursor(liked=True), liked=True)),
+        ('LinkedInJobsDB.find_jobs_page', lambda: db.find_jobs_page(25, list_cursor())),
+        ('LinkedInJobsDB.find_jobs_page(offset)', lambda: db.find_jobs_page(25, offset=50)),
+        ('LinkedInJobsDB.find_jobs_page(query)', lambda: db.find_jobs_page(25, list_cursor(query='python'), 'python')),
+        ('LinkedInJobsDB.find_jobs_page(query, company_id)',
+         lambda: db.find_jobs_page(25, query='python engineer', filters={'company_id': 3})),
+        ('LinkedInJobsDB.find_jobs_page(company_id)', list_page(company='Company 3')),
+        ('LinkedInJobsDB.find_jobs_page(location_id)', list_page(location_id=5)),
+        ('LinkedInJobsDB.find_jobs_page(company_id, location_id)', list_page(company_id=3, location='City 5')),
+        ('LinkedInJobsDB.find_jobs_page(company LIKE)', list_page(company='ompany 3')),
+        ('LinkedInJobsDB.job_exists', lambda: db.job_exists('https://www.linkedin.com/jobs/view/1000000005/')),
+        ('LinkedInJobsDB.job_exists', lambda: db.job_exists(None, 'Data Engineer', 'Company 3', 'City 3')),
+        ('LinkedInJobsDB.save_job', lambda: db.save_job(new_job)),
+        ('LinkedInJobsDB.save_jobs', lambda: db.save_jobs([new_job, dict(new_job, url=None), {'title': 'x'}])),
+        ('LinkedInJobsDB.update_job_status', lambda: db.update_job_status(job_id, 'applied', 'plan check')),
+        ('LinkedInJobsDB.toggle_job_like', lambda: db.toggle_job_like(job_id)),
+        ('LinkedInJobsDB.toggle_job_flag', lambda: db.toggle_job_flag(job_id, 'disliked')),
+        ('LinkedInJobsDB.mark_resume_created', lambda: db.mark_resume_created(job_id)),
+        ('LinkedInJobsDB.mark_cover_letter_created', lambda: db.mark_cover_letter_created(job_id)),
+        ('LinkedInJobsDB.update_job_resume', lambda: db.update_job_resume(job_id, '{}')),
+        ('LinkedInJobsDB.update_job_resume_file_path', lambda: db.update_job_resume_file_path(job_id, 'r.pdf')),
+        ('LinkedInJobsDB.update_job_cover_letter', lambda: db.update_job_cover_letter(job_id, '{}')),
+        ('LinkedInJobsDB.update_job_cover_letter_file_path',
+         lambda: db.update_job_cover_letter_file_path(job_id, 'c.pdf')),
+        ('LinkedInJobsDB.mark_applied', lambda: db.mark_applied(job_id)),
+        ('LinkedInJobsDB.add_job_notes', lambda: db.add_job_notes(job_id, 'notes')),
+        ('LinkedInJobsDB.update_job_location', lambda: db.update_job_location(job_id, 'City 7')),
+        ('LinkedInJobsDB.update_job_description', lambda: db.update_job_description(job_id, 'python backend')),
+        ('LinkedInJobsDB.get_jobs_pending_description', lambda: db.get_jobs_pending_description(20)),
+        ('LinkedInJobsDB.get_job_by_id', lambda: db.get_job_by_id(job_id)),
+        ('LinkedInJobsDB.search_jobs', lambda: db.search_jobs('python engineer', 20)),
+        ('LinkedInJobsDB.search_jobs', lambda: db.search_jobs('python', 20, field='title')),
+        ('LinkedInJobsDB.search_jobs', lambda: db.search_jobs('python', 20, field='search_keywords')),
+        ('LinkedInJobsDB.get_statistics', lambda: db.get_statistics()),
+        ('LinkedInJobsDB.save_search_history', lambda: db.save_search_history({'keywords': 'python'}, 10, 2)),
+        ('LinkedInJobsDB.start_search', search_run),
+        ('LinkedInJobsDB.get_search_yield', lambda: db.get_search_yield(30)),
+        ('LinkedInJobsDB.get_search_yield', lambda: db.get_search_yield()),
+        ('JobBrowser.get_total_jobs', lambda: browser.get_total_jobs()),
+        ('JobBrowser.get_job', lambda: browser.get_job(job_id)),
+        ('JobBrowser.get_all_jobs', lambda: browser.get_all_jobs(50)),
+        ('JobBrowser.get_jobs_page', lambda: browser.get_jobs_page(25, browser.get_jobs_page(25)[1])),
+        ('JobBrowser.search_jobs', lambda: browser.search_jobs('engineer')),
+    ]
+
+def collect_runtime(db_path: str, verbose: bool = False) -> List[Statement]:
+    """Statements the scenarios send to SQLite, captured with a trace callback on every pooled connection"""
+    captured: List[Statement] = []
+    current = ['']
+    pool = get_pool(db_path)
+    held = [pool.acquire() for _ in range(pool.max_idle)]
+    for conn in held:
+        conn.set_trace_callback(lambda sql: captured.append((current[0], sql)))
+    for conn in held:
+        conn.close()
+
+    db = LinkedInJobsDB(db_path)
+    db.connect()
+    try:
+        current[0] = 'LinkedInJobsDB.get_jobs'
+        job_id = db.get_jobs(limit=1)[0]['id']
+        for origin, call in scenarios(db, JobBrowser(db_path), job_id):
+            current[0] = origin
+            with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()):
+                call()
+    finally:
+        db.disconnect()
+    # Triggers are reported as '-- TRIGGER name'; transaction control has no plan
+    return [(origin, sql) for origin, sql in captured if SQL_START.match(sql)]
+
+# ---------------------------------------------------------------------------------------------
+# Plans
+# ---------------------------------------------------------------------------------------------
+
+def _parameter_count(sql: str) -> int:
+    """Number of ? placeholders outside string literals, quoted identifiers and comments"""
+    return re.sub(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*", '', sql).count('?')
+
+def explain(conn: sqlite3.Connection, sql: str) -> List[Tuple[int, int, str]]:
+    """(id, parent id, detail) plan rows"""
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, [None] * _parameter_count(sql)).fetchall()
+    return [(row[0], row[1], row[3]) for row in rows]
+
+def plan_findings(plan: List[Tuple[int, int, str]], tables: set) -> List[Tuple[str, str]]:
+    """
+    (kind, plan line) for every full table scan and temporary B-tree in a plan. A temporary
+    B-tree under a compound MERGE sorts one LIMITed arm of the union (a keyset cursor page) and
+    is reported as 'merge-sort' rather than 'temp-btree'.
+    """
+    details = {node_id: detail for node_id, _, detail in plan}
+    parents = {node_id: parent for node_id, parent, _ in plan}
+    findings = []
+    for node_id, parent, detail in plan:
+        match = re.match(r"SCAN (?:TABLE )?(\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+))?", detail)
+        if match and match.group(1) in tables and match.group(1) not in SMALL_TABLES:
+            table, index = match.groups()
+            findings.append((f"scan:{table}:{index}" if index else f"scan:{table}", detail))
+        if 'USE TEMP B-TREE' in detail:
+            ancestors = []
+            while parent in details:
+                ancestors.append(details[parent])
+                parent = parents[parent]
+            merged = any(ancestor.startswith('MERGE ') for ancestor in ancestors)
+            findings.append(('merge-sort' if merged else 'temp-btree', detail))
+    return findings
+
+def check(rows: int, verbose: bool = False) -> int:
+    """Build the synthetic database, collect and explain every statement. Returns the number of failures."""
+    statements, assembled, errors = [], [], []
+    for relative_path in TARGET_FILES:
+        found, extended, failed = collect_static(relative_path)
+        statements += found
+        assembled += extended
+        errors += failed
+
+    failures = 0
+    for error in errors:
+        print(f"[PLAN FAIL] Could not render {error}")
+        failures += 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'plans.db')
+        print(f"[PLAN] Building a synthetic database of {rows} jobs...")
+        with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()):
+            build_database(db_path, rows)
+        runtime = collect_runtime(db_path, verbose)
+        print(f"[PLAN] {len(statements)} statement(s) from {len(TARGET_FILES)} files "
+              f"({len(assembled)} assembled at runtime), {len(runtime)} captured from the scenarios")
+
+        seen = set()
+        allowed_used = set()
+        with get_pool(db_path).connection() as conn:
+            # Virtual tables (the FTS index) answer MATCH from their own index
+            tables = {row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND sql NOT LIKE 'CREATE VIRTUAL TABLE%'"
+            )}
+            for origin, sql in statements + runtime:
+                key = (origin, ' '.join(sql.split()))
+                if key in seen:
+                    continue
+                seen.add(key)
+                try:
+                    plan = explain(conn, sql)
+                except sqlite3.Error as e:
+                    print(f"[PLAN FAIL] {origin}: cannot explain ({e})\n    {key[1][:200]}")
+                    failures += 1
+                    continue
+                problems = []
+                for kind, detail in plan_findings(plan, tables):
+                    if kind in ALLOWED.get(origin, {}):
+                        allowed_used.add((origin, kind))
+                    else:
+                        problems.append(f"{kind} ({detail})")
+                if problems:
+                    failures += 1
+                    print(f"[PLAN FAIL] {origin}: {'; '.join(problems)}\n    {key[1][:200]}")
+                elif verbose:
+                    print(f"[PLAN OK] {origin}: {' | '.join(detail for _, _, detail in plan) or 'no table access'}\n    {key[1][:200]}")
+        get_pool(db_path).close_all()
+
+    for origin, kinds in ALLOWED.items():
+        for kind, reason in kinds.items():
+            if (origin, kind) in allowed_used:
+                print(f"[PLAN] Allowed {kind} in {origin}: {reason}")
+            elif verbose:
+                print(f"[PLAN] Unused allowance {kind} in {origin}")
+    print(f"[PLAN] {len(seen)} distinct statement(s) explained, {failures} failure(s)")
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN QUERY PLAN regression check for the application's SQL")
+    parser.add_argument("--rows", type=int, default=20000, help="jobs in the synthetic database")
+    parser.add_argument("--verbose", action="store_true", help="print every plan and scenario output")
+    args = parser.parse_args()
+    sys.exit(1 if check(args.rows, args.verbose) else 0)